@@ -55,6 +55,15 @@ class CloudWordsControl(object):
         """
         self.model.add_words(words)
 
+    def add_counts(self, counts):
+        """
+        Adds the words of a mapping of word counts to the list of words to display in bulk.  If a word is
+        already added, its count is increased by the count in the mapping.
+        :param counts: A mapping in the form {word: count}.
+        :return:
+        """
+        self.model.add_counts(counts)
+
     def remove_word(self, word):
         """
         Removes the specified word from the list of cloud words.
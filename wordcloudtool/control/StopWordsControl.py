@@ -8,6 +8,7 @@ Class for controlling the words to be eliminated from the word cloud.
 This control is used by the view objects of the Model-View-Controller (MVC) architecture.
 """
 from wordcloudtool.model.StopWords import StopWords
+import os
 
 
 class StopWordsControl(object):
@@ -70,12 +71,44 @@ class StopWordsControl(object):
         """
         self.model.del_stopwords(words)
 
+    def update_stopwords(self, words):
+        """
+        Adds all of the words to the list of words to remove, ignoring the words already in it.
+        :param words: A list of words to be added to the stop words.
+        :return:
+        """
+        self.model.update(words)
+
+    def difference_update_stopwords(self, words):
+        """
+        Removes all of the words from the list of words to remove, ignoring the words not in it.
+        :param words: A list of words to be removed from the stop words.
+        :return:
+        """
+        self.model.difference_update(words)
+
     def set_stopfile(self, filename):
         self.model.set_stopfile(filename)
 
     def get_stopfile(self):
         return self.model.get_stopfile()
 
+    def add_stopfile(self, filename):
+        """
+        Adds the words of a stop file as a layer of the stop words.
+        :param filename: Name of the stop file.
+        :return:
+        """
+        self.model.add_stopfile(filename)
+
+    def remove_stopfile(self, filename):
+        """
+        Removes the layer of the stop words added with add_stopfile( ).
+        :param filename: Name of the stop file.
+        :return:
+        """
+        self.model.remove_layer(os.path.abspath(filename))
+
     def get_alphabetic_stopwords(self):
         return sorted(self.model.get_stopwords())
 
@@ -0,0 +1,271 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Fixed memory, approximate storage engine for the word counts of the word cloud.
+"""
+from collections import Counter
+from collections.abc import MutableMapping
+from operator import itemgetter
+import hashlib
+import heapq
+import itertools
+import math
+import numpy as np
+
+EPSILON = 1e-4
+DELTA = 0.01
+CAPACITY = 1024
+# Number of words or (word, count) pairs of an increment merged into the sketch at a time.
+CHUNK_SIZE = 64 * 1024
+
+
+class ApproximateWordCounts(MutableMapping):
+    """
+    Mapping of word to estimated count for unbounded streams of words, using a fixed amount of memory.
+    A Count-Min Sketch estimates the frequency of any word and a Space-Saving tracker keeps the capacity
+    most frequent words, which are the words of the mapping and the words drawn in the cloud.
+    With N the total of the counts added:
+    - estimate(word) is never below the true count and exceeds it by at most epsilon * N with probability 1 - delta.
+    - Every word whose true count is above N / capacity is tracked, and the count of a tracked word exceeds
+      its true count by at most min(error(word), epsilon * N).
+    Decreasing or removing counts keeps the totals consistent, but a decrease may then hide part of the
+    over-estimate of other words sharing its cells, so the bounds only hold for streams of increments.
+    Memory: depth * width counters of the sketch plus up to 5 * capacity entries of the tracker, where
+    width = e / epsilon rounded up to a power of 2 and depth = ln(1 / delta) rounded up.
+    """
+    def __init__(self, epsilon=EPSILON, delta=DELTA, capacity=CAPACITY, dtype=np.int64):
+        """
+        Constructor
+        :param epsilon: Error of the frequency estimates as a fraction of the total of the counts.
+        :param delta: Probability of an estimate exceeding the epsilon error.
+        :param capacity: Number of most frequent words tracked.
+        :param dtype: NumPy type of the counts.  Use a floating point type for weighted sources.
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError('epsilon must be between 0 and 1.')
+        if not 0 < delta < 1:
+            raise ValueError('delta must be between 0 and 1.')
+        if capacity <= 0:
+            raise ValueError('capacity must be positive.')
+        self.epsilon = epsilon
+        self.delta = delta
+        self.capacity = capacity
+        width = 1 << max(int(math.ceil(math.log2(math.e / epsilon))), 1)
+        depth = int(math.ceil(math.log(1.0 / delta)))
+        self.table = np.zeros((depth, width), dtype=dtype)
+        self.total = 0
+        self.tracked = {}
+        self.__heap = []
+
+    def promote(self):
+        """
+        Switch integer counters to floating point counters, e.g. before fractional weights are applied.
+        :return:
+        """
+        if self.table.dtype.kind != 'f':
+            self.table = self.table.astype(np.float64)
+
+    def __getitem__(self, word):
+        return self.tracked[word][0]
+
+    def __setitem__(self, word, count):
+        current = self.tracked[word][0] if word in self.tracked else 0
+        self.increment_counts([(word, count - current)])
+
+    def __delitem__(self, word):
+        count, _ = self.tracked.pop(word)
+        self.__update_table([word], np.array([-count], dtype=self.table.dtype))
+
+    def __contains__(self, word):
+        return word in self.tracked
+
+    def __iter__(self):
+        return iter(self.tracked)
+
+    def __len__(self):
+        return len(self.tracked)
+
+    def items(self):
+        """
+        Returns the (word, count) pairs of the tracked words.
+        :return: A list of (word, count) tuples.
+        """
+        return [(word, entry[0]) for word, entry in self.tracked.items()]
+
+    def estimate(self, word):
+        """
+        Returns the Count-Min Sketch estimate of the count of any word, tracked or not.
+        :param word: A lowercased word.
+        :return: The estimated count, never below the true count.
+        """
+        return self.__estimates(self.__columns([word]))[0].item()
+
+    def error(self, word):
+        """
+        Returns the maximum over-estimate of the count of a tracked word.
+        :param word: A lowercased word that is tracked.
+        :return: The maximum difference between the count of the word and its true count.
+        """
+        count, error = self.tracked[word]
+        return min(error, self.epsilon * self.total)
+
+    def increment(self, words):
+        """
+        Count one more use of each word.  The words are merged CHUNK_SIZE at a time, each chunk counted in a
+        Counter first, so the memory used does not grow with the number of words.
+        :param words: An iterable of words.
+        :return: A tuple of the lists of the tracked words that were updated, added and evicted.
+        """
+        return self.__merge(Counter(chunk) for chunk in self.__chunks(words))
+
+    def increment_counts(self, pairs):
+        """
+        Add the counts of (word, count) pairs to the sketch and the tracker, CHUNK_SIZE pairs at a time.
+        The sketch is updated with one vectorized update per row and chunk; the tracker with one step per distinct
+        word of a chunk.
+        :param pairs: An iterable of (word, count) tuples, e.g. the items( ) of a mapping of word counts.
+        :return: A tuple of the lists of the tracked words that were updated, added and evicted.
+        """
+        return self.__merge(self.__totals(chunk) for chunk in self.__chunks(pairs))
+
+    @staticmethod
+    def __chunks(iterable):
+        """
+        Utility method splitting an iterable into lists of at most CHUNK_SIZE items.
+        :param iterable: An iterable.
+        :return: An iterator over lists of items.
+        """
+        iterator = iter(iterable)
+        chunk = list(itertools.islice(iterator, CHUNK_SIZE))
+        while chunk:
+            yield chunk
+            chunk = list(itertools.islice(iterator, CHUNK_SIZE))
+
+    @staticmethod
+    def __totals(pairs):
+        """
+        Utility method adding up the counts of the pairs of a chunk by word.
+        :param pairs: A list of (word, count) tuples.
+        :return: A Counter in the form {word: count}.
+        """
+        merged = Counter()
+        for word, count in pairs:
+            merged[word] += count
+        return merged
+
+    def __merge(self, chunks):
+        """
+        Utility method adding the counts of chunks of distinct words to the sketch and the tracker.
+        The changes are folded across the chunks into sets of tracked words, which never hold more than
+        capacity words each: a word added then evicted is neither, and a word evicted then added back is updated.
+        :param chunks: An iterable of mappings in the form {word: count}.
+        :return: A tuple of the lists of the tracked words that were updated, added and evicted.
+        """
+        updated = set()
+        added = set()
+        evicted = set()
+        tracked = self.tracked
+        for merged in chunks:
+            words = list(merged.keys())
+            counts = np.fromiter(merged.values(), dtype=self.table.dtype, count=len(words))
+            columns = self.__columns(words)
+            self.__update_table(columns, counts)
+            estimates = self.__estimates(columns).tolist()
+            heap = self.__heap
+            for word, count, estimate in zip(words, counts.tolist(), estimates):
+                entry = tracked.get(word)
+                if entry is not None:
+                    entry[0] = min(entry[0] + count, estimate)
+                    heapq.heappush(heap, (entry[0], word))
+                    if word not in added:
+                        updated.add(word)
+                    continue
+                if len(tracked) < self.capacity:
+                    tracked[word] = [estimate, estimate - count]
+                else:
+                    floor, victim = self.__pop_min()
+                    if estimate <= floor:
+                        continue
+                    del tracked[victim]
+                    if victim in added:
+                        added.discard(victim)
+                    else:
+                        updated.discard(victim)
+                        evicted.add(victim)
+                    # Space-Saving gives the new word the count of the evicted word, capped by the sketch estimate.
+                    count = min(floor + count, estimate)
+                    tracked[word] = [count, min(floor, estimate)]
+                heapq.heappush(heap, (tracked[word][0], word))
+                if word in evicted:
+                    evicted.discard(word)
+                    updated.add(word)
+                else:
+                    added.add(word)
+            if len(heap) > 4 * self.capacity:
+                self.__heap = [(entry[0], word) for word, entry in tracked.items()]
+                heapq.heapify(self.__heap)
+        return list(updated), list(added), list(evicted)
+
+    def nlargest(self, k):
+        """
+        Returns the k most frequent tracked words.
+        :param k: Number of words to return.
+        :return: A list of (word, count) tuples, most frequent first.
+        """
+        return heapq.nlargest(k, self.items(), key=itemgetter(1))
+
+    def __pop_min(self):
+        """
+        Utility method returning the tracked word with the lowest count.
+        Entries of the heap whose count is out of date are discarded on the way.
+        :return: A tuple of the count and the word.
+        """
+        heap = self.__heap
+        tracked = self.tracked
+        while True:
+            count, word = heap[0]
+            entry = tracked.get(word)
+            if entry is not None and entry[0] == count:
+                return count, word
+            heapq.heappop(heap)
+
+    def __columns(self, words):
+        """
+        Utility method hashing words to their column in each row of the sketch.
+        The rows use the double hashing h1 + i * h2 of a 64 bit BLAKE2 digest, so the columns are the same in
+        every process and sketches built by different workers can be merged.
+        :param words: A list of words.
+        :return: A NumPy array of shape (depth, len(words)) of column indexes.
+        """
+        digests = np.fromiter((int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(),
+                                              'little') for word in words), dtype=np.uint64, count=len(words))
+        h1 = digests & np.uint64(0xffffffff)
+        h2 = (digests >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.table.shape[0], dtype=np.uint64)[:, None]
+        return ((h1 + rows * h2) & np.uint64(self.table.shape[1] - 1)).astype(np.int64)
+
+    def __estimates(self, columns):
+        """
+        Utility method returning the minimum of the counters of each column over the rows.
+        :param columns: A NumPy array of column indexes returned by __columns( ).
+        :return: A NumPy array of estimated counts.
+        """
+        rows = np.arange(self.table.shape[0])[:, None]
+        return self.table[rows, columns].min(axis=0)
+
+    def __update_table(self, columns, counts):
+        """
+        Utility method adding counts to the counters of the sketch.
+        :param columns: A list of words or a NumPy array of column indexes returned by __columns( ).
+        :param counts: A NumPy array of the counts to add.
+        :return:
+        """
+        if not isinstance(columns, np.ndarray):
+            columns = self.__columns(columns)
+        depth, width = self.table.shape
+        flat = (columns + np.arange(depth)[:, None] * width).ravel()
+        np.add.at(self.table.reshape(-1), flat, np.tile(counts, depth))
+        self.total += counts.sum().item()
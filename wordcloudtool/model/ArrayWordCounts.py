@@ -0,0 +1,440 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Array backed storage engine for the word counts of the word cloud.
+"""
+from collections import Counter
+from collections.abc import MutableMapping
+import itertools
+import numpy as np
+
+CAPACITY = 1024
+# Markers of the slots of the hash table that hold no id.
+EMPTY = -1
+DELETED = -2
+# Below this number of words, probing the hash table one word at a time beats the overhead of vectorized probing.
+SCALAR_PROBES = 64
+# Number of words or (word, count) pairs of a bulk increment merged into the arrays at a time.
+CHUNK_SIZE = 64 * 1024
+
+
+class ArrayWordCounts(MutableMapping):
+    """
+    Mapping of word to count storing the vocabulary and the counts in NumPy arrays.
+    The words are stored UTF-8 encoded in a single byte buffer addressed by arrays of start offsets and lengths,
+    and are found through an open addressing hash table of ids, so a word costs a few dozen bytes instead of the
+    objects of a dictionary entry.  It behaves as the dictionary of words and counts it replaces, and adds
+    vectorized bulk increments.
+    The hashes of the words are those of the running interpreter, so they are left out when an instance is
+    pickled and recomputed when a word is first looked up after unpickling.
+    """
+    def __init__(self, capacity=CAPACITY, dtype=np.int64):
+        """
+        Constructor
+        :param capacity: Initial number of ids the arrays have room for.
+        :param dtype: NumPy type of the counts.  Use a floating point type for weighted sources.
+        """
+        self.blob = bytearray()
+        self.starts = np.zeros(capacity, dtype=np.int64)
+        # The length of a removed word is -1 until its id is reused.
+        self.lengths = np.zeros(capacity, dtype=np.int32)
+        self.hashes = np.zeros(capacity, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=dtype)
+        self.used = 0
+        self.free_ids = []
+        self.dead_bytes = 0
+        self.__table = np.full(8, EMPTY, dtype=np.int32)
+        self.__filled = 0
+
+    @staticmethod
+    def from_arrays(terms, counts):
+        """
+        Create a storage engine from a list of distinct words and the NumPy array of their counts.
+        :param terms: A list of distinct words.
+        :param counts: A NumPy array of the counts of the words, taken over by the new instance.
+        :return: A new ArrayWordCounts instance.
+        """
+        encoded = [word.encode('utf-8') for word in terms]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        return ArrayWordCounts.__from_buffer(bytearray(b''.join(encoded)), np.cumsum(lengths) - lengths, lengths,
+                                             counts)
+
+    @staticmethod
+    def from_blob(blob, counts):
+        """
+        Create a storage engine from distinct words joined by line breaks in UTF-8 and the NumPy array of their
+        counts, as stored in a snapshot.  The words are neither decoded nor hashed: the hash table is only built
+        when a word is first looked up, so a large vocabulary can be loaded and ranked in time proportional to
+        its size in bytes.
+        :param blob: A bytes-like object holding the words joined by line breaks.
+        :param counts: A NumPy array of the counts of the words, taken over by the new instance.
+        :return: A new ArrayWordCounts instance.
+        """
+        if not len(counts):
+            return ArrayWordCounts.__from_buffer(bytearray(), np.zeros(0, np.int64), np.zeros(0, np.int64), counts)
+        breaks = np.flatnonzero(np.frombuffer(blob, dtype=np.uint8) == ord('\n'))
+        starts = np.concatenate([[0], breaks + 1])
+        ends = np.concatenate([breaks, [len(blob)]])
+        return ArrayWordCounts.__from_buffer(bytearray(blob), starts, ends - starts, counts)
+
+    @staticmethod
+    def __from_buffer(blob, starts, lengths, counts):
+        """
+        Utility creating a storage engine whose hash table is built on first use.
+        :param blob: A bytearray holding the UTF-8 encoded words.
+        :param starts: A NumPy array of the offsets of the words in the blob.
+        :param lengths: A NumPy array of the lengths in bytes of the words.
+        :param counts: A NumPy array of the counts of the words, taken over by the new instance.
+        :return: A new ArrayWordCounts instance.
+        """
+        store = ArrayWordCounts(capacity=0, dtype=counts.dtype)
+        store.blob = blob
+        store.starts = starts.astype(np.int64)
+        store.lengths = lengths.astype(np.int32)
+        store.hashes = np.zeros(len(counts), dtype=np.int64)
+        store.counts = counts
+        store.used = len(counts)
+        store.__table = None
+        return store
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['hashes']
+        del state['_ArrayWordCounts__table']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.hashes = np.zeros(len(self.counts), dtype=np.int64)
+        self.__table = None
+
+    def to_arrays(self):
+        """
+        Returns the vocabulary and its counts as parallel sequences.
+        :return: A tuple of the list of words and the NumPy array of their counts.
+        """
+        ids = self.__live_ids()
+        return self.get_terms(ids), self.counts[ids]
+
+    def promote(self):
+        """
+        Switch integer counts to floating point counts, e.g. before fractional weights are applied.
+        :return:
+        """
+        if self.counts.dtype.kind != 'f':
+            self.counts = self.counts.astype(np.float64)
+
+    def __getitem__(self, word):
+        i = self.__probe(word)[1]
+        if i < 0:
+            raise KeyError(word)
+        return self.counts[i].item()
+
+    def __setitem__(self, word, count):
+        i = self.__probe(word)[1]
+        if i < 0:
+            i = self.__add([word])[0]
+        self.counts[i] = count
+
+    def __delitem__(self, word):
+        slot, i = self.__probe(word)
+        if i < 0:
+            raise KeyError(word)
+        self.__table[slot] = DELETED
+        self.counts[i] = 0
+        self.dead_bytes += self.lengths[i].item()
+        self.lengths[i] = -1
+        self.free_ids.append(i)
+        if self.dead_bytes > CAPACITY and self.dead_bytes * 2 > len(self.blob):
+            self.__compact()
+
+    def __contains__(self, word):
+        return self.__probe(word)[1] >= 0
+
+    def __iter__(self):
+        return iter(self.get_terms(self.__live_ids()))
+
+    def __len__(self):
+        return self.used - len(self.free_ids)
+
+    def items(self):
+        """
+        Returns the (word, count) pairs of the vocabulary.
+        :return: A list of (word, count) tuples.
+        """
+        ids = self.__live_ids()
+        return list(zip(self.get_terms(ids), self.counts[ids].tolist()))
+
+    def nlargest(self, k):
+        """
+        Returns the k most frequent words with a vectorized partial sort of the count array.
+        :param k: Number of words to return.
+        :return: A list of (word, count) tuples, most frequent first.
+        """
+        counts = self.counts[:self.used]
+        # The ids of removed words hold a count of 0, so room is made for them and they are dropped afterwards.
+        n = min(k + len(self.free_ids), len(counts))
+        if n <= 0:
+            return []
+        ids = np.argpartition(counts, len(counts) - n)[len(counts) - n:] if n < len(counts) else np.arange(n)
+        ids = ids[np.argsort(counts[ids], kind='stable')[::-1]]
+        ids = ids[self.lengths[ids] >= 0][:k]
+        return list(zip(self.get_terms(ids), counts[ids].tolist()))
+
+    def lookup(self, words):
+        """
+        Map distinct words to their ids, adding the words that are not in the vocabulary yet.
+        The hash table is probed for all of the words at once.
+        :param words: An iterable of distinct words.
+        :return: A tuple of the NumPy array of ids and the list of words that were added to the vocabulary.
+        """
+        words = list(words)
+        ids = self.__find(words)
+        missing = np.flatnonzero(ids < 0)
+        added = [words[k] for k in missing.tolist()]
+        if added:
+            ids[missing] = self.__add(added)
+        return ids, added
+
+    def increment(self, words):
+        """
+        Count one more use of each word.  The words are merged into the arrays CHUNK_SIZE at a time, each chunk
+        counted in a Counter first, so the arrays are only touched once per distinct word of a chunk and the
+        memory used beyond the arrays does not grow with the number of words.
+        :param words: An iterable of words.
+        :return: A tuple of the NumPy array of the distinct ids and the list of words that were added to the
+                 vocabulary.
+        """
+        return self.__merge(Counter(chunk) for chunk in self.__chunks(words))
+
+    def increment_counts(self, pairs):
+        """
+        Add the counts of (word, count) pairs, merging CHUNK_SIZE pairs at a time into the arrays with a
+        vectorized update of the count array.
+        :param pairs: An iterable of (word, count) tuples, e.g. the items( ) of a mapping of word counts.
+        :return: A tuple of the NumPy array of the distinct ids and the list of words that were added to the
+                 vocabulary.
+        """
+        return self.__merge(self.__totals(chunk) for chunk in self.__chunks(pairs))
+
+    @staticmethod
+    def __chunks(iterable):
+        """
+        Utility splitting an iterable into lists of at most CHUNK_SIZE items.
+        :param iterable: An iterable.
+        :return: An iterator over lists of items.
+        """
+        iterator = iter(iterable)
+        chunk = list(itertools.islice(iterator, CHUNK_SIZE))
+        while chunk:
+            yield chunk
+            chunk = list(itertools.islice(iterator, CHUNK_SIZE))
+
+    @staticmethod
+    def __totals(pairs):
+        """
+        Utility adding up the counts of the pairs of a chunk by word.
+        :param pairs: A list of (word, count) tuples.
+        :return: A dictionary in the form {word: count}.
+        """
+        totals = {}
+        for word, count in pairs:
+            totals[word] = totals.get(word, 0) + count
+        return totals
+
+    def __merge(self, chunks):
+        """
+        Utility adding the counts of chunks of distinct words to the arrays, one chunk at a time.
+        :param chunks: An iterable of mappings in the form {word: count}.
+        :return: A tuple of the NumPy array of the distinct ids and the list of words that were added to the
+                 vocabulary.
+        """
+        all_ids = []
+        all_added = []
+        for totals in chunks:
+            ids, added = self.lookup(totals.keys())
+            self.counts[ids] += np.fromiter(totals.values(), dtype=self.counts.dtype, count=len(totals))
+            all_ids.append(ids)
+            all_added += added
+        if len(all_ids) == 1:
+            return all_ids[0], all_added
+        ids = np.unique(np.concatenate(all_ids)) if all_ids else np.zeros(0, dtype=np.int64)
+        return ids, all_added
+
+    def get_terms(self, ids):
+        """
+        Map ids back to their words.
+        :param ids: An iterable of ids.
+        :return: A list of words.
+        """
+        ids = np.fromiter(ids, dtype=np.int64)
+        blob = self.blob
+        return [blob[start:start + length].decode('utf-8')
+                for start, length in zip(self.starts[ids].tolist(), self.lengths[ids].tolist())]
+
+    def __term(self, i):
+        """
+        Utility decoding the word of an id.
+        :param i: The id of the word.
+        :return: The word.
+        """
+        start = self.starts.item(i)
+        return self.blob[start:start + self.lengths.item(i)].decode('utf-8')
+
+    def __live_ids(self):
+        """
+        Utility returning the ids of the words in the vocabulary.
+        :return: A NumPy array of ids.
+        """
+        if not self.free_ids:
+            return np.arange(self.used)
+        return np.flatnonzero(self.lengths[:self.used] >= 0)
+
+    def __get_table(self):
+        """
+        Utility returning the hash table, building it on first use after from_blob( ) or from_arrays( ).
+        :return: A NumPy array of ids indexed by the hash of the words, EMPTY or DELETED.
+        """
+        if self.__table is None:
+            ids = self.__live_ids()
+            self.hashes[ids] = np.fromiter(map(hash, self.get_terms(ids)), dtype=np.int64, count=len(ids))
+            self.__rehash()
+        return self.__table
+
+    def __rehash(self):
+        """
+        Utility rebuilding the hash table at a load factor of at most a half, dropping the deleted slots.
+        :return:
+        """
+        size = 8
+        while size < 2 * len(self):
+            size *= 2
+        self.__table = np.full(size, EMPTY, dtype=np.int32)
+        self.__filled = 0
+        self.__insert(self.__live_ids())
+
+    def __insert(self, ids):
+        """
+        Utility inserting ids into the hash table with vectorized linear probing.  When several ids compete for
+        an empty slot, the first one takes it and the others probe on.
+        :param ids: A NumPy array of the ids of words that are not in the table.
+        :return:
+        """
+        table = self.__table
+        mask = len(table) - 1
+        self.__filled += len(ids)
+        pending = ids
+        slots = self.hashes[ids] & mask
+        while len(pending):
+            free = np.flatnonzero(table[slots] == EMPTY)
+            taken, first = np.unique(slots[free], return_index=True)
+            table[taken] = pending[free[first]]
+            placed = np.zeros(len(pending), dtype=bool)
+            placed[free[first]] = True
+            pending = pending[~placed]
+            slots = (slots[~placed] + 1) & mask
+
+    def __find(self, words):
+        """
+        Utility probing the hash table for distinct words, all at once for more than SCALAR_PROBES words.
+        :param words: A list of distinct words.
+        :return: A NumPy array of the ids of the words, EMPTY for the words that are not in the vocabulary.
+        """
+        if len(words) <= SCALAR_PROBES:
+            return np.array([self.__probe(word)[1] for word in words], dtype=np.int64)
+        table = self.__get_table()
+        mask = len(table) - 1
+        hashes = np.fromiter(map(hash, words), dtype=np.int64, count=len(words))
+        ids = np.full(len(words), EMPTY, dtype=np.int64)
+        pending = np.arange(len(words))
+        slots = hashes & mask
+        while len(pending):
+            candidates = table[slots].astype(np.int64)
+            hit = candidates >= 0
+            hit[hit] = self.hashes[candidates[hit]] == hashes[pending[hit]]
+            # Equal hashes are confirmed by comparing the words.
+            for k, i, j in zip(np.flatnonzero(hit).tolist(), candidates[hit].tolist(), pending[hit].tolist()):
+                if self.__term(i) != words[j]:
+                    hit[k] = False
+            ids[pending[hit]] = candidates[hit]
+            probe = ~hit & (candidates != EMPTY)
+            pending = pending[probe]
+            slots = (slots[probe] + 1) & mask
+        return ids
+
+    def __probe(self, word):
+        """
+        Utility probing the hash table for a single word.
+        :param word: The word to find.
+        :return: A tuple of the slot and the id of the word, (-1, EMPTY) if it is not in the vocabulary.
+        """
+        table = self.__get_table()
+        mask = len(table) - 1
+        h = hash(word)
+        slot = h & mask
+        while True:
+            i = table.item(slot)
+            if i == EMPTY:
+                return -1, EMPTY
+            if i >= 0 and self.hashes.item(i) == h and self.__term(i) == word:
+                return slot, i
+            slot = (slot + 1) & mask
+
+    def __add(self, words):
+        """
+        Utility adding distinct words that are not in the vocabulary, reusing the ids of removed words first.
+        :param words: A list of distinct words.
+        :return: A NumPy array of the ids of the words.
+        """
+        n = len(words)
+        ids = [self.free_ids.pop() for _ in range(min(n, len(self.free_ids)))]
+        fresh = n - len(ids)
+        if self.used + fresh > len(self.counts):
+            self.__grow(self.used + fresh)
+        ids.extend(range(self.used, self.used + fresh))
+        self.used += fresh
+        ids = np.array(ids, dtype=np.int64)
+        encoded = [word.encode('utf-8') for word in words]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=n)
+        self.starts[ids] = len(self.blob) + np.cumsum(lengths) - lengths
+        self.lengths[ids] = lengths
+        self.blob += b''.join(encoded)
+        self.hashes[ids] = np.fromiter(map(hash, words), dtype=np.int64, count=n)
+        self.counts[ids] = 0
+        # The table is rebuilt beyond a load factor of two thirds, counting the deleted slots.
+        if (self.__filled + n) * 3 > len(self.__table) * 2:
+            self.__rehash()
+        else:
+            self.__insert(ids)
+        return ids
+
+    def __grow(self, size):
+        """
+        Utility growing the arrays to room for at least size ids, doubling their capacity.
+        :param size: Number of ids needed.
+        :return:
+        """
+        capacity = max(len(self.counts), 1)
+        while capacity < size:
+            capacity *= 2
+        for name in ('starts', 'lengths', 'hashes', 'counts'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def __compact(self):
+        """
+        Utility rewriting the blob without the bytes of the removed words.
+        :return:
+        """
+        ids = self.__live_ids()
+        lengths = self.lengths[ids].astype(np.int64)
+        blob = self.blob
+        self.blob = bytearray(b''.join(blob[start:start + length]
+                                       for start, length in zip(self.starts[ids].tolist(), lengths.tolist())))
+        self.starts[ids] = np.cumsum(lengths) - lengths
+        self.dead_bytes = 0
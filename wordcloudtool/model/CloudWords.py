@@ -6,18 +6,64 @@
 @change: Mar 25, 2019 - Initial release
 Class for managing the words to be displayed on the word cloud.
 """
+from wordcloudtool.model.ApproximateWordCounts import ApproximateWordCounts
+from wordcloudtool.model.ArrayWordCounts import ArrayWordCounts
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from operator import itemgetter
+import heapq
+import mmap
+import numpy as np
+import os
+import struct
+import tempfile
+import threading
+
+TOP_CAPACITY = 512
+# Snapshot layout: header, the words joined by line breaks in UTF-8, padding to 8 bytes, the little endian counts.
+SNAPSHOT_MAGIC = b'WCTC'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<4sI8sQQ')  # magic, version, counts dtype, number of words, size of the words
+# Counts of weighted sources are compared against this tolerance instead of 0 when they are subtracted.
+EPSILON = 1e-9
+
+CloudWordsChanges = namedtuple('CloudWordsChanges', ['added', 'updated', 'removed'])
 
 
 class CloudWords(object):
     """
     Class for managing the words to be displayed on the word cloud.
     """
-    def __init__(self):
+    def __init__(self, debounce=0.0, words=None, top_capacity=TOP_CAPACITY, dispatcher=None):
         """
         Constructor
+        :param debounce: Number of seconds to coalesce changes for before observers are notified.
+                         0 notifies observers as soon as a change (or a batch of changes) is complete.
+        :param words: Empty mapping used to store the word counts.  Defaults to a dictionary.  Pass an
+                      ArrayWordCounts for large vocabularies to keep the words and the counts in compact
+                      NumPy arrays and get vectorized bulk increments, or an ApproximateWordCounts for unbounded
+                      streams to keep the most frequent words with estimated counts in fixed memory.
+        :param top_capacity: Number of most frequent words maintained incrementally for top( ).
+        :param dispatcher: Callable taking a function and running it on the thread of the observers, e.g. a
+                           qt5.GuiDispatcher.  The debounced notifications are sent from a timer thread, so without
+                           a dispatcher the observers are called on that thread and must marshal to their own.
         """
-        self.words = {}
+        self.words = words if words is not None else {}
+        self.dispatcher = dispatcher
+        self.top_capacity = top_capacity
+        self.__top = {}
+        self.__top_min = 0
+        self.__top_dirty = len(self.words) > 0
         self.observers = []
+        self.sources = {}
+        self.debounce = debounce
+        self.changes = CloudWordsChanges(frozenset(), frozenset(), frozenset())
+        self.__batch_depth = 0
+        self.__added = set()
+        self.__updated = set()
+        self.__removed = set()
+        self.__timer = None
+        self.__lock = threading.RLock()
 
     def add_word(self, word):
         """
@@ -26,11 +72,20 @@ class CloudWords(object):
         :param word: A string containing the word to be added to the cloud.
         :return:
         """
-        word = word.lower()
-        if word in self.words.keys():
-            self.words[word] = self.words[word] + 1
-        else:
-            self.words.update({word: 1})
+        if isinstance(self.words, ApproximateWordCounts):
+            self.add_words((word,))
+            return
+        with self.__lock:
+            word = word.lower()
+            if word in self.words:
+                self.words[word] = self.words[word] + 1
+                if self.observers:
+                    self.__updated.add(word)
+            else:
+                self.words[word] = 1
+                if self.observers:
+                    self.__added.add(word)
+            self.__offer_top((word,))
         self.__notify_observers()
 
     def add_words(self, words):
@@ -40,41 +95,265 @@ class CloudWords(object):
         :param words: A list of words to be added to the cloud.
         :return:
         """
-        for word in words:
-            word = word.lower()
-            if word in self.words.keys():
-                self.words[word] = self.words[word] + 1
+        with self.__lock:
+            if isinstance(self.words, ArrayWordCounts):
+                self.__record_bulk(*self.words.increment(map(str.lower, words)))
+            elif isinstance(self.words, ApproximateWordCounts):
+                self.__record_sketch(*self.words.increment(map(str.lower, words)))
+            elif self.observers:
+                added = set()
+                touched = set()
+                for word in words:
+                    word = word.lower()
+                    if word in self.words:
+                        self.words[word] = self.words[word] + 1
+                        touched.add(word)
+                    else:
+                        self.words[word] = 1
+                        added.add(word)
+                self.__added |= added
+                self.__updated |= touched
+                self.__offer_top(touched | added)
             else:
-                self.words.update({word: 1})
+                # Without observers there is no change set to record, only the top words to offer.
+                counts = self.words
+                touched = set()
+                for word in words:
+                    word = word.lower()
+                    counts[word] = counts.get(word, 0) + 1
+                    touched.add(word)
+                self.__offer_top(touched)
+        self.__notify_observers()
+
+    def add_counts(self, counts):
+        """
+        Adds the words of a mapping of word counts to the list of words to display in bulk.  If a word is
+        already added, its count is increased by the count in the mapping.
+        :param counts: A mapping in the form {word: count}, e.g. the Counter returned by ParserBase.parse_counts( ).
+        :return:
+        """
+        with self.__lock:
+            self.__add_pairs((word.lower(), count) for word, count in counts.items())
+        self.__notify_observers()
+
+    def add_source(self, name, counts, weight=1):
+        """
+        Adds the word counts of a named source (file, URL, pasted text...) to the cloud.  The counts are kept so the
+        source can later be removed or re-weighted without parsing it again.  A source of the same name is replaced.
+        :param name: A string naming the source.
+        :param counts: A mapping in the form {word: count}, e.g. the Counter returned by ParserBase.parse_counts( ).
+        :param weight: Factor applied to the counts of the source.  A fractional weight switches a NumPy store
+                       of integer counts to floating point counts.
+        :return:
+        """
+        source = Counter()
+        for word, count in counts.items():
+            source[word.lower()] += count
+        with self.__lock:
+            self.__promote(weight)
+            old, old_weight = self.sources.get(name, ({}, 0))
+            self.sources[name] = (source, weight)
+            self.__replace_pairs(((word, count * old_weight) for word, count in old.items()),
+                                 ((word, count * weight) for word, count in source.items()))
+        self.__notify_observers()
+
+    def remove_source(self, name):
+        """
+        Removes the word counts of a named source from the cloud in O(vocabulary of the source).
+        :param name: A string naming the source.
+        :return:
+        """
+        with self.__lock:
+            if name not in self.sources:
+                raise ValueError('{:s} is not a source.'.format(name))
+            source, weight = self.sources.pop(name)
+            self.__replace_pairs(((word, count * weight) for word, count in source.items()), ())
+        self.__notify_observers()
+
+    def set_source_weight(self, name, weight):
+        """
+        Changes the factor applied to the counts of a named source.
+        :param name: A string naming the source.
+        :param weight: New factor applied to the counts of the source.  A fractional weight switches a NumPy store
+                       of integer counts to floating point counts.
+        :return:
+        """
+        with self.__lock:
+            if name not in self.sources:
+                raise ValueError('{:s} is not a source.'.format(name))
+            self.__promote(weight)
+            source, old_weight = self.sources[name]
+            self.sources[name] = (source, weight)
+            self.__replace_pairs(((word, count * old_weight) for word, count in source.items()),
+                                 ((word, count * weight) for word, count in source.items()))
         self.__notify_observers()
 
+    def get_sources(self):
+        """
+        Method to return the names of the sources in the cloud.
+        :return: A list of source names.
+        """
+        return list(self.sources.keys())
+
     def remove_word(self, word):
         """
         Removes the specified word from the list of cloud words.
         :param word: A string containing the word to remove.
         :return:
         """
-        word = word.lower()
-        if word in self.words.keys():
-            self.words.pop(word, None)
-            self.__notify_observers()
-        else:
-            raise ValueError('{:s} is not in the list.'.format(word))
+        with self.__lock:
+            word = word.lower()
+            if word not in self.words:
+                raise ValueError('{:s} is not in the list.'.format(word))
+            self.__pop(word)
+        self.__notify_observers()
 
     def remove_words(self, words):
         """
         Removes a list of words from the list of cloud words.
+        The words are all checked before any is removed, so a ValueError leaves the cloud unchanged.
         :param words: A list of words to be removed from the cloud.
         :return:
         """
-        for word in words:
-            word = word.lower()
-            if word in self.words.keys():
-                self.words.pop(word, None)
-            else:
-                raise ValueError('{:s} is not in the list.'.format(word))
+        with self.__lock:
+            words = list(dict.fromkeys(word.lower() for word in words))
+            for word in words:
+                if word not in self.words:
+                    raise ValueError('{:s} is not in the list.'.format(word))
+            for word in words:
+                self.__pop(word)
         self.__notify_observers()
 
+    @contextmanager
+    def batch(self):
+        """
+        Context manager coalescing all of the changes made inside it into a single notification.
+        Batches may be nested; observers are notified when the outermost batch completes.
+        Example:
+        with cloud_words.batch():
+            cloud_words.add_words(words)
+            cloud_words.remove_word('foo')
+        :return:
+        """
+        with self.__lock:
+            self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.__lock:
+                self.__batch_depth -= 1
+            self.__notify_observers()
+
+    def flush(self):
+        """
+        Notify observers of any pending changes right away instead of waiting for the debounce delay.
+        :return:
+        """
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+        self.__fire()
+
+    def get_changes(self):
+        """
+        Method to return the change set delivered with the last notification.
+        :return: A CloudWordsChanges tuple of frozensets of the added, updated and removed words.
+        """
+        return self.changes
+
+    def top(self, k):
+        """
+        Method to return the k most frequent words without sorting the whole vocabulary.
+        Up to top_capacity words are served from the incrementally maintained top words in O(k log k);
+        larger requests select from the whole vocabulary in O(n log k).
+        :param k: Number of words to return.
+        :return: A list of (word, count) tuples, most frequent first.
+        """
+        with self.__lock:
+            if k > self.top_capacity:
+                return self.__nlargest(k)
+            if self.__top_dirty:
+                self.__top = dict(self.__nlargest(self.top_capacity))
+                self.__top_min = min(self.__top.values()) if len(self.__top) >= self.top_capacity else 0
+                self.__top_dirty = False
+            return heapq.nlargest(k, self.__top.items(), key=itemgetter(1))
+
+    def save(self, path):
+        """
+        Save the word counts to a binary snapshot file that load( ) maps back in.
+        The file is written to a temporary file first and then renamed, so a reader never sees a partial snapshot.
+        Sources are not saved; their counts are part of the saved word counts.
+        :param path: Path of the snapshot file.
+        :return:
+        """
+        with self.__lock:
+            if isinstance(self.words, ArrayWordCounts):
+                terms, counts = self.words.to_arrays()
+            else:
+                terms = list(self.words.keys())
+                counts = np.array(list(self.words.values()))
+        counts = counts.astype('<f8' if counts.dtype.kind == 'f' else '<i8')
+        blob = '\n'.join(terms).encode('utf-8')
+        if terms and blob.count(b'\n') != len(terms) - 1:
+            raise ValueError('A word containing a line break cannot be saved.')
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, counts.dtype.str.encode('ascii'),
+                                      len(terms), len(blob))
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(blob)
+                f.write(b'\0' * (-(len(header) + len(blob)) % 8))
+                f.write(counts.tobytes())
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    @staticmethod
+    def load(path, use_array=True, debounce=0.0, top_capacity=TOP_CAPACITY):
+        """
+        Create a CloudWords from a snapshot file written by save( ).
+        The file is memory mapped; the words are copied out of the map as one UTF-8 buffer, which an ArrayWordCounts
+        takes over as is and a dictionary decodes with a single split, and the counts are copied out of the map
+        with one NumPy copy, so loading takes time proportional to the size of the file.
+        :param path: Path of the snapshot file.
+        :param use_array: True stores the counts in an ArrayWordCounts, False in a dictionary.
+        :param debounce: Number of seconds to coalesce changes for before observers are notified.
+        :param top_capacity: Number of most frequent words maintained incrementally for top( ).
+        :return: A new CloudWords instance.
+        """
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if len(mm) < SNAPSHOT_HEADER.size or mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                    raise IOError('{:s} is not a word counts snapshot.'.format(path))
+                magic, version, dtype, n, blob_size = SNAPSHOT_HEADER.unpack_from(mm)
+                if version > SNAPSHOT_VERSION:
+                    raise IOError('{:s} has unsupported snapshot version {:d}.'.format(path, version))
+                dtype = np.dtype(dtype.rstrip(b'\0').decode('ascii'))
+                start = SNAPSHOT_HEADER.size
+                offset = start + blob_size
+                offset += -offset % 8
+                if len(mm) < offset + n * dtype.itemsize:
+                    raise IOError('{:s} is truncated.'.format(path))
+                blob = mm[start:start + blob_size]
+                counts = np.frombuffer(mm, dtype=dtype, count=n, offset=offset).astype(dtype.newbyteorder('='))
+        if n and blob.count(b'\n') != n - 1:
+            raise IOError('{:s} is corrupted.'.format(path))
+        try:
+            if use_array:
+                blob.decode('utf-8')
+                words = ArrayWordCounts.from_blob(blob, counts)
+            else:
+                words = dict(zip(blob.decode('utf-8').split('\n') if n else [], counts.tolist()))
+        except UnicodeDecodeError:
+            raise IOError('{:s} is corrupted.'.format(path))
+        if len(words) != n:
+            raise IOError('{:s} is corrupted.'.format(path))
+        return CloudWords(debounce=debounce, words=words, top_capacity=top_capacity)
+
     def get_word_list(self):
         """
         Method to return the list of words to be displayed in the cloud.
@@ -92,6 +371,8 @@ class CloudWords(object):
     def register_observer(self, observer):
         """
         Register a client that needs to be notified when the words for the cloud has been updated.
+        Changes are only recorded while an observer is registered, so the first change set an observer receives
+        does not report the changes made before it was registered.
         :param observer: Client method to be called when list has been updated.
         :return:
         """
@@ -105,13 +386,224 @@ class CloudWords(object):
         """
         self.observers.remove(observer)
 
+    def __nlargest(self, k):
+        """
+        Utility to select the k most frequent words from the whole vocabulary.
+        :param k: Number of words to return.
+        :return: A list of (word, count) tuples, most frequent first.
+        """
+        if isinstance(self.words, (ArrayWordCounts, ApproximateWordCounts)):
+            return self.words.nlargest(k)
+        return heapq.nlargest(k, self.words.items(), key=itemgetter(1))
+
+    def __add_pairs(self, pairs):
+        """
+        Utility to increase the counts of (word, count) pairs of lowercased words and record the changes.
+        :param pairs: An iterable of (word, count) tuples.
+        :return:
+        """
+        if isinstance(self.words, ArrayWordCounts):
+            self.__record_bulk(*self.words.increment_counts(pairs))
+            return
+        if isinstance(self.words, ApproximateWordCounts):
+            self.__record_sketch(*self.words.increment_counts(pairs))
+            return
+        record = bool(self.observers)
+        touched = set()
+        for word, count in pairs:
+            touched.add(word)
+            if word in self.words:
+                self.words[word] = self.words[word] + count
+                if record:
+                    self.__updated.add(word)
+            else:
+                self.words[word] = count
+                if record:
+                    self.__added.add(word)
+        self.__offer_top(touched)
+
+    def __replace_pairs(self, old, new):
+        """
+        Utility to replace the contribution of a source to the counts of its lowercased words by another one.
+        The difference is computed word by word from the two contributions, so each count changes once and only
+        the words whose count drops to zero are removed.
+        :param old: An iterable of (word, count) tuples of the contribution to remove.
+        :param new: An iterable of (word, count) tuples of the contribution to add.
+        :return:
+        """
+        delta = {}
+        for word, count in new:
+            delta[word] = delta.get(word, 0) + count
+        for word, count in old:
+            delta[word] = delta.get(word, 0) - count
+        self.__add_pairs((word, count) for word, count in delta.items() if count > 0)
+        self.__subtract_pairs((word, -count) for word, count in delta.items() if count < 0)
+
+    def __promote(self, weight):
+        """
+        Utility to switch a NumPy store of integer counts to floating point counts before a fractional weight is
+        applied, so the weighted counts are not truncated.
+        :param weight: Factor applied to the counts of a source.
+        :return:
+        """
+        if not float(weight).is_integer() and isinstance(self.words, (ArrayWordCounts, ApproximateWordCounts)):
+            self.words.promote()
+
+    def __subtract_pairs(self, pairs):
+        """
+        Utility to decrease the counts of (word, count) pairs of lowercased words and record the changes.
+        Words whose count drops to zero are removed.
+        :param pairs: An iterable of (word, count) tuples.
+        :return:
+        """
+        top = self.__top
+        for word, count in pairs:
+            if word not in self.words:
+                continue
+            remaining = self.words[word] - count
+            if remaining <= EPSILON:
+                self.__pop(word)
+            else:
+                self.words[word] = remaining
+                if self.observers:
+                    self.__updated.add(word)
+                if word in top:
+                    # Decreasing a top word may let another word move up, so they are rebuilt on the next top( ).
+                    self.__top_dirty = True
+
+    def __record_bulk(self, ids, added):
+        """
+        Utility to record the result of a bulk increment of an ArrayWordCounts in the pending change set.
+        :param ids: NumPy array of the distinct ids that were incremented.
+        :param added: List of the words that were added to the vocabulary.
+        :return:
+        """
+        if self.__top_dirty and not self.observers:
+            return
+        touched = self.words.get_terms(ids)
+        if self.observers:
+            added = set(added)
+            self.__added |= added
+            self.__updated.update(word for word in touched if word not in added)
+        self.__offer_top(touched, self.words.counts[ids].tolist())
+
+    def __record_sketch(self, updated, added, evicted):
+        """
+        Utility to record the result of an increment of an ApproximateWordCounts in the pending change set.
+        The tracked words are no more than a few top_capacity, so the top words are simply rebuilt on the next top( ).
+        :param updated: List of the tracked words whose count was increased.
+        :param added: List of the words that started being tracked.
+        :param evicted: List of the words that stopped being tracked.
+        :return:
+        """
+        self.__top_dirty = True
+        if not self.observers:
+            return
+        self.__updated.update(updated)
+        for word in evicted:
+            self.__updated.discard(word)
+            if word in self.__added:
+                self.__added.discard(word)
+            else:
+                self.__removed.add(word)
+        self.__added.update(added)
+
+    def __offer_top(self, words, counts=None):
+        """
+        Utility to update the top words with words whose count has increased.
+        Counts only increase between removals, so a word outside of the top words can only enter them
+        when its count is offered here.
+        :param words: An iterable of lowercased words whose count has increased.
+        :param counts: The counts of the words, in the same order.  Looked up in the store by default.
+        :return:
+        """
+        if self.__top_dirty:
+            return
+        top = self.__top
+        if counts is None:
+            words = list(words)
+            counts = [self.words[word] for word in words]
+        capacity = self.top_capacity
+        top_min = self.__top_min
+        for word, count in zip(words, counts):
+            if word in top or len(top) < capacity or count > top_min:
+                top[word] = count
+        # The top words may hold up to twice their capacity so the cost of trimming them is amortized.
+        # Between trims top_min may lag behind the true minimum, which only admits extra candidates.
+        if len(top) > 2 * capacity:
+            self.__top = top = dict(heapq.nlargest(capacity, top.items(), key=itemgetter(1)))
+            self.__top_min = min(top.values())
+        elif top_min == 0 and len(top) >= capacity:
+            self.__top_min = min(top.values())
+
+    def __pop(self, word):
+        """
+        Utility to remove a word and record the removal in the pending change set.
+        :param word: A lowercased word known to be in the cloud.
+        :return:
+        """
+        self.words.pop(word)
+        if word in self.__top:
+            # The word that moves up into the top words is unknown, so they are rebuilt on the next top( ) call.
+            self.__top_dirty = True
+        if not self.observers:
+            return
+        self.__updated.discard(word)
+        if word in self.__added:
+            self.__added.discard(word)
+        else:
+            self.__removed.add(word)
+
     def __notify_observers(self):
         """
         Utility to notify observers of a change to the words in the cloud.
+        Nothing is sent while a batch is open, and with a debounce delay the notification is deferred
+        so the changes made within the delay are coalesced.
+        :return:
+        """
+        with self.__lock:
+            if self.__batch_depth:
+                return
+            if self.debounce > 0:
+                if self.__timer is None:
+                    self.__timer = threading.Timer(self.debounce, self.__debounced)
+                    self.__timer.daemon = True
+                    self.__timer.start()
+                return
+        self.__fire()
+
+    def __debounced(self):
+        """
+        Utility called by the debounce timer to send the pending notification, through the dispatcher if there is one.
+        :return:
+        """
+        with self.__lock:
+            self.__timer = None
+        if self.dispatcher is not None:
+            self.dispatcher(self.__fire)
+        else:
+            self.__fire()
+
+    def __fire(self):
+        """
+        Utility to notify observers of the pending change set.
         Observers must have the signature where this instance is passed as the only argument.
+        The change set is available from get_changes( ) during the call.
         Example:
         CloudView.cloud_observer(cloud_words)
         :return:
         """
+        with self.__lock:
+            added = self.__added - self.__removed
+            updated = self.__updated - self.__added
+            removed = self.__removed
+            # A word that was removed and then added again within the batch was updated.
+            updated |= self.__added & self.__removed
+            if not (added or updated or removed):
+                return
+            self.changes = CloudWordsChanges(frozenset(added), frozenset(updated), frozenset(removed - updated))
+            self.__added = set()
+            self.__updated = set()
+            self.__removed = set()
         for observer in self.observers:
             observer(self)
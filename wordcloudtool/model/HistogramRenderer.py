@@ -0,0 +1,127 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Renderers drawing the bar chart of the most frequent words straight into an RGB pixel buffer.
+"""
+import threading
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image, ImageDraw, ImageFont
+
+PYPLOT_BACKEND = 'pyplot'
+AGG_BACKEND = 'agg'
+PIL_BACKEND = 'pil'
+WIDTH = 640
+HEIGHT = 480
+DPI = 100
+MARGIN = 10
+BAR_COLOR = (31, 119, 180)
+# pyplot keeps the current figure in global state, so the renders through it are serialized.
+PYPLOT_LOCK = threading.Lock()
+
+
+def render_pyplot(words, counts, width=WIDTH, height=HEIGHT):
+    """
+    Render the histogram with matplotlib.pyplot.  pyplot is only imported when this backend is used.
+    :param words: A list of the words to plot, most frequent first.
+    :param counts: A list of the counts of the words.
+    :param width: Width of the image in pixels.
+    :param height: Height of the image in pixels.
+    :return: A contiguous numpy array of shape (height, width, 3) holding the RGB pixels.
+    """
+    import matplotlib.pyplot as plt
+    with PYPLOT_LOCK:
+        fig = plt.figure(figsize=(width / DPI, height / DPI), dpi=DPI)
+        try:
+            indexes = np.arange(len(words))
+            plt.bar(indexes, counts)
+            plt.xticks(indexes, words, rotation=90)
+            fig.canvas.draw()
+            return np.ascontiguousarray(np.asarray(fig.canvas.buffer_rgba())[:, :, :3])
+        finally:
+            plt.close(fig)
+
+
+def render_agg(words, counts, width=WIDTH, height=HEIGHT):
+    """
+    Render the histogram on a Figure of its own with an Agg canvas, without any pyplot global state, so it can
+    be called from several threads at once.
+    :param words: A list of the words to plot, most frequent first.
+    :param counts: A list of the counts of the words.
+    :param width: Width of the image in pixels.
+    :param height: Height of the image in pixels.
+    :return: A contiguous numpy array of shape (height, width, 3) holding the RGB pixels.
+    """
+    fig = Figure(figsize=(width / DPI, height / DPI), dpi=DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    indexes = np.arange(len(words))
+    ax.bar(indexes, counts)
+    ax.set_xticks(indexes)
+    ax.set_xticklabels(words, rotation=90)
+    canvas.draw()
+    return np.ascontiguousarray(np.asarray(canvas.buffer_rgba())[:, :, :3])
+
+
+def render_pil(words, counts, width=WIDTH, height=HEIGHT):
+    """
+    Render a plain histogram with PIL ImageDraw.  It draws the bars, the axes, the largest count and the words
+    rotated below the bars, and is the cheapest backend.
+    :param words: A list of the words to plot, most frequent first.
+    :param counts: A list of the counts of the words.
+    :param width: Width of the image in pixels.
+    :param height: Height of the image in pixels.
+    :return: A contiguous numpy array of shape (height, width, 3) holding the RGB pixels.
+    """
+    image = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    peak = max(counts, default=0)
+    peak_label = '{:g}'.format(peak)
+    label_height = max((int(draw.textlength(word, font=font)) for word in words), default=0)
+    left = MARGIN * 2 + int(draw.textlength(peak_label, font=font))
+    right = width - MARGIN
+    top = MARGIN
+    bottom = max(height - label_height - MARGIN * 2, height // 2)
+    draw.line([(left, top), (left, bottom), (right, bottom)], fill='black')
+    if words and peak > 0:
+        draw.text((MARGIN, top), peak_label, fill='black', font=font)
+        slot = (right - left) / len(words)
+        for i, (word, count) in enumerate(zip(words, counts)):
+            x0 = left + i * slot + slot * 0.1
+            x1 = x0 + slot * 0.8
+            draw.rectangle([x0, bottom - (bottom - top) * count / peak, x1, bottom - 1], fill=BAR_COLOR)
+            # Draw the word on a mask of its own and paste it rotated under the bar.
+            left_edge, top_edge, right_edge, bottom_edge = font.getbbox(word)
+            mask = Image.new('L', (max(right_edge, 1), max(bottom_edge, 1)), 0)
+            ImageDraw.Draw(mask).text((0, 0), word, fill=255, font=font)
+            mask = mask.rotate(90, expand=True)
+            image.paste((0, 0, 0), (int((x0 + x1 - mask.width) / 2), bottom + MARGIN // 2), mask)
+    return np.asarray(image)
+
+
+RENDERERS = {
+    PYPLOT_BACKEND: render_pyplot,
+    AGG_BACKEND: render_agg,
+    PIL_BACKEND: render_pil,
+}
+
+
+def render_histogram(words, counts, backend=AGG_BACKEND, width=WIDTH, height=HEIGHT):
+    """
+    Render the histogram of the words with the selected backend.
+    :param words: A list of the words to plot, most frequent first.
+    :param counts: A list of the counts of the words.
+    :param backend: Name of the backend, one of the keys of RENDERERS.
+    :param width: Width of the image in pixels.
+    :param height: Height of the image in pixels.
+    :return: A contiguous numpy array of shape (height, width, 3) holding the RGB pixels.
+    """
+    renderer = RENDERERS.get(backend)
+    if renderer is None:
+        raise ValueError('{:s} is not a histogram backend.'.format(backend))
+    return renderer(words, counts, width, height)
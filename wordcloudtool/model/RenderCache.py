@@ -0,0 +1,103 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+In-memory cache of the images rendered by the WordCloudWrapper.
+"""
+from collections import OrderedDict
+import hashlib
+import threading
+
+MAX_BYTES = 128 * 1024 * 1024
+
+
+class RenderCache(object):
+    """
+    Size bounded, least recently used in-memory cache of rendered images.
+    Entries are keyed by a hash of the frequency table that was drawn and the settings of the render, and hold
+    read-only image arrays, so a hit hands out the very buffers of the first render.
+    """
+    def __init__(self, max_bytes=MAX_BYTES):
+        """
+        Constructor
+        :param max_bytes: Maximum total size of the cached images before the least recently used are evicted.
+        """
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def key(frequencies, settings):
+        """
+        Build the cache key of a render.
+        :param frequencies: A list of (word, count) tuples, most frequent first.
+        :param settings: A tuple of the settings of the render, made of strings, numbers and None.
+        :return: A string containing the cache key.
+        """
+        h = hashlib.blake2b(repr(settings).encode('utf-8'), digest_size=16)
+        for word, count in frequencies:
+            h.update(word.encode('utf-8'))
+            h.update(b'\0')
+            h.update(repr(float(count)).encode('ascii'))
+            h.update(b'\n')
+        return h.hexdigest()
+
+    def get(self, key):
+        """
+        Look up cached images and mark them as recently used.
+        :param key: The cache key returned by key( ).
+        :return: The tuple of cached images, or None if there is no entry.
+        """
+        with self.__lock:
+            images = self.__entries.get(key) if self.enabled else None
+            if images is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return images
+
+    def put(self, key, images):
+        """
+        Store the images of a render and evict the least recently used entries beyond max_bytes.
+        The images are made read-only.  Images larger than max_bytes are not stored.
+        :param key: The cache key returned by key( ).
+        :param images: A tuple of numpy arrays.
+        :return:
+        """
+        nbytes = sum(image.nbytes for image in images)
+        if not self.enabled or nbytes > self.max_bytes:
+            return
+        for image in images:
+            image.flags.writeable = False
+        with self.__lock:
+            old = self.__entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= sum(image.nbytes for image in old)
+            self.__entries[key] = images
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self.__entries.popitem(last=False)
+                self.nbytes -= sum(image.nbytes for image in old)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.  The hit and miss counters are kept.
+        :return:
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.nbytes = 0
+
+    def __contains__(self, key):
+        with self.__lock:
+            return self.enabled and key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
@@ -6,63 +6,219 @@
 @change: Mar 26, 2019 - Initial release
 Specialized model class for providing source for words to remove from the list of words to cloudify.
 """
-from wordcloud import STOPWORDS
+from collections import Counter, OrderedDict
+import itertools
 import os
+import threading
+
+# Versions are drawn from a single counter so two StopWords instances never share a version.
+VERSIONS = itertools.count(1)
+BUILTIN_LAYER = 'builtin'
+PACKAGE_LAYER = 'package'
+FILE_LAYER = 'file'
+PACKAGE_STOPFILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'parser', 'stopwords')
+# Least recently used parsed stop files in the form {path: ((st_mtime_ns, st_size), words)}.
+STOPFILES = OrderedDict()
+MAX_STOPFILES = 16
+STOPFILES_LOCK = threading.Lock()
+
+
+def normalize(words):
+    """
+    Normalize stop words the way they are matched: stripped and lowercased, without empty words.
+    :param words: An iterable of words.
+    :return: A frozenset of normalized words.
+    """
+    return frozenset(word for word in (word.strip().lower() for word in words) if word)
+
+
+def read_stopfile(filename):
+    """
+    Read a stop file of one word per line.  The parsed words of the MAX_STOPFILES most recently read files are
+    cached by path and only read again once the modification time or size of the file changes.
+    :param filename: Name of the stop file.
+    :return: A frozenset of normalized words.
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with STOPFILES_LOCK:
+        entry = STOPFILES.get(path)
+        if entry is not None and entry[0] == stamp:
+            STOPFILES.move_to_end(path)
+            return entry[1]
+    with open(path) as f:
+        words = normalize(f)
+    with STOPFILES_LOCK:
+        STOPFILES[path] = (stamp, words)
+        STOPFILES.move_to_end(path)
+        while len(STOPFILES) > MAX_STOPFILES:
+            STOPFILES.popitem(last=False)
+    return words
 
 
 class StopWords(object):
     """
     Class to model the words to use for filtering out unwanted words when creating the word cloud.
+    The stop words are the union of a stack of named layers, such as the built-in wordcloud STOPWORDS, the
+    packaged parser/stopwords and user stop files, with the ad-hoc edits made through add_stopwords( ) and
+    del_stopwords( ) applied on top.  The number of layers holding each word is kept, so changing a layer
+    only costs the size of that layer.
+    The stop words are kept normalized in a frozen snapshot that is replaced on every change, and each
+    snapshot has a version that only increases, so clients can cache anything derived from the stop words
+    and invalidate it by comparing get_version( ).
     """
     def __init__(self):
         """
         Constructor
         """
-        self.stopwords = set(STOPWORDS)
+        self.stopwords = frozenset()
+        self.version = next(VERSIONS)
         self.stop_filename = ""
         self.observers = []
+        self.layers = {}
+        self.layer_files = {}
+        self.__counts = Counter()
+        self.__added = set()
+        self.__removed = set()
+        # wordcloud is only imported when a model is created, so the parsers can share read_stopfile( ) cheaply.
+        from wordcloud import STOPWORDS
+        self.set_layer(BUILTIN_LAYER, STOPWORDS)
+        self.add_stopfile(PACKAGE_STOPFILE, PACKAGE_LAYER)
 
     def get_stopfile(self):
         return self.stop_filename
 
     def set_stopfile(self, filename):
-        if os.path.exists(filename):
-            self.stopwords = set(map(str.strip, open(os.path.abspath(filename)).readlines()))
+        """
+        Use a stop file as the file layer of the stop words, replacing the previous stop file.
+        :param filename: Name of the stop file.  An empty string removes the file layer.
+        :return:
+        """
+        if filename == "":
+            if FILE_LAYER in self.layers:
+                self.remove_layer(FILE_LAYER)
+            self.stop_filename = filename
+        elif os.path.exists(filename):
+            self.add_stopfile(filename, FILE_LAYER)
             self.stop_filename = filename
         else:
             raise ValueError("{:s} stop file cannot be found!".format(filename))
 
+    def add_stopfile(self, filename, name=None):
+        """
+        Add the words of a stop file as a layer of the stop words, or update the layer if the file changed.
+        :param filename: Name of the stop file.
+        :param name: Name of the layer.  Defaults to the absolute path of the file.
+        :return:
+        """
+        if name is None:
+            name = os.path.abspath(filename)
+        words = read_stopfile(filename)
+        self.layer_files[name] = filename
+        self.__set_layer(name, words)
+
+    def reload_stopfiles(self):
+        """
+        Update the layers read from stop files that changed on disk.  Unchanged files are not read again.
+        :return:
+        """
+        for name, filename in list(self.layer_files.items()):
+            self.__set_layer(name, read_stopfile(filename))
+
+    def set_layer(self, name, words):
+        """
+        Set the words of a named layer, adding the layer on top of the stack if it is new.
+        :param name: A string naming the layer.
+        :param words: An iterable of words.
+        :return:
+        """
+        self.__set_layer(name, normalize(words))
+
+    def __set_layer(self, name, new):
+        """
+        Utility to set the words of a named layer from normalized words, e.g. the frozenset cached by
+        read_stopfile( ), which is kept as is so the layer shares it.
+        :param name: A string naming the layer.
+        :param new: A frozenset of normalized words.
+        :return:
+        """
+        old = self.layers.get(name, frozenset())
+        self.layers[name] = new
+        counts = self.__counts
+        for word in new - old:
+            counts[word] += 1
+        for word in old - new:
+            counts[word] -= 1
+            if not counts[word]:
+                del counts[word]
+        self.__refresh()
+
+    def remove_layer(self, name):
+        """
+        Remove a named layer from the stack.
+        :param name: A string naming the layer.
+        :return:
+        """
+        if name not in self.layers:
+            raise ValueError('{:s} is not a layer.'.format(name))
+        self.set_layer(name, ())
+        del self.layers[name]
+        self.layer_files.pop(name, None)
+
+    def get_layers(self):
+        """
+        Get the names of the layers, from the bottom of the stack to the top.
+        :return: A list of layer names.
+        """
+        return list(self.layers.keys())
+
     def get_stopwords(self):
         """
         Get the current set of stopwords.
-        :return: A set of stopwords.
+        :return: A frozenset of stripped, lowercased stopwords.
         """
         return self.stopwords
 
+    def get_version(self):
+        """
+        Get the version of the current set of stopwords.
+        :return: An integer that increases every time the stopwords change.
+        """
+        return self.version
+
     def add_stopword(self, word):
         """
         Add a new stopword to the set of stopwords.
         :param word: A new word to add to the set of stop words.
         :return:
         """
-        if word in self.stopwords:
-            raise ValueError('{:s} was already added to stopwords.'.format(word))
-        else:
-            self.stopwords.add(word)
-            self.__notify_observers()
+        self.add_stopwords([word])
 
     def add_stopwords(self, words):
         """
         Add a new set of stopwords to the set of stopwords.
+        The words are all checked before any is added, so a ValueError leaves the stopwords unchanged.
         :param words: A set of new words to add to stopwords.
         :return:
         """
+        words = list(words)
         for word in words:
-            if word in self.stopwords:
+            if word.strip().lower() in self.stopwords:
                 raise ValueError('{:s} was already added to stopwords.'.format(word))
-            else:
-                self.stopwords.add(word)
-        self.__notify_observers()
+        self.update(words)
+
+    def update(self, words):
+        """
+        Add all of the words to the set of stopwords, ignoring the words already in it.
+        Observers are notified once, and only if the stopwords changed.
+        :param words: An iterable of words.
+        :return:
+        """
+        words = normalize(words)
+        self.__added |= words
+        self.__removed -= words
+        self.__refresh()
 
     def del_stopword(self, word):
         """
@@ -70,21 +226,32 @@ class StopWords(object):
         :param word: A string containing the word to remove.
         :return:
         """
-        self.stopwords.remove(word)
-        self.__notify_observers()
+        self.del_stopwords([word])
 
     def del_stopwords(self, words):
         """
         Removes a list of words from the list of stop words.
+        The words are all checked before any is removed, so a ValueError leaves the stopwords unchanged.
         :param words: A list of words to be removed from the stop words model.
         :return:
         """
+        words = list(words)
         for word in words:
-            if word in self.stopwords:
-                self.stopwords.pop()
-            else:
+            if word.strip().lower() not in self.stopwords:
                 raise ValueError('{:s} is not in the list.'.format(word))
-        self.__notify_observers()
+        self.difference_update(words)
+
+    def difference_update(self, words):
+        """
+        Remove all of the words from the set of stopwords, ignoring the words not in it.
+        Observers are notified once, and only if the stopwords changed.
+        :param words: An iterable of words.
+        :return:
+        """
+        words = normalize(words)
+        self.__removed |= words
+        self.__added -= words
+        self.__refresh()
 
     def register_observer(self, observer):
         """
@@ -102,6 +269,19 @@ class StopWords(object):
         """
         self.observers.remove(observer)
 
+    def __refresh(self):
+        """
+        Utility to install a new snapshot of the union of the layers and the edits, bump the version and
+        notify the observers.
+        :return:
+        """
+        stopwords = frozenset(self.__counts.keys() | self.__added) - self.__removed
+        if stopwords == self.stopwords:
+            return
+        self.stopwords = stopwords
+        self.version = next(VERSIONS)
+        self.__notify_observers()
+
     def __notify_observers(self):
         """
         Utility to notify observers of a change to the words in the stopwords.
@@ -7,12 +7,109 @@
 Specialized class for managing a WordCloud instance.
 """
 import multidict as multidict
+import copy
 import operator
-import numpy as np
-import cv2
-import matplotlib.pyplot as plt
+from PIL import Image
 from wordcloud import WordCloud
 from wordcloudtool.model.StopWords import StopWords
+from wordcloudtool.model.HistogramRenderer import AGG_BACKEND, RENDERERS, render_histogram
+from wordcloudtool.model.RenderCache import RenderCache
+
+PREVIEW_STAGE = 'preview'
+FINAL_STAGE = 'final'
+PREVIEW_SCALE = 0.25
+PREVIEW_WORDS = 50
+PREVIEW_MAX_SIZE = 400
+
+
+class RenderJob(object):
+    """
+    Snapshot of everything a render of a list of words depends on: a copy of the WordCloud, the settings of the
+    wrapper and the key of the render cache.  Take it with WordCloudWrapper.snapshot( ) on the thread changing the
+    settings, then render it on any thread: changing the settings of the wrapper meanwhile affects neither the
+    images nor the key they are cached under.
+    """
+    def __init__(self, wrapper, sorted_x):
+        """
+        Constructor
+        :param wrapper: The WordCloudWrapper whose settings are captured.
+        :param sorted_x: A list of (word, count) tuples, most frequent first.
+        """
+        self.sorted_x = sorted_x
+        self.wordcloud = copy.copy(wrapper.wordcloud)
+        self.freq_size = wrapper.freq_size
+        self.histogram_backend = wrapper.histogram_backend
+        self.progressive = wrapper.progressive
+        self.preview_scale = wrapper.preview_scale
+        self.preview_words = wrapper.preview_words
+        self.render_cache = wrapper.render_cache
+        frequencies = sorted_x[:max(self.wordcloud.max_words, self.freq_size)]
+        self.cache_key = self.render_cache.key(frequencies, self.__render_settings(wrapper.stopwords.get_version()))
+
+    def is_rendered(self):
+        """
+        Check if the images of the job are in the render cache.
+        :return: True if render( ) would return cached images.
+        """
+        return self.cache_key in self.render_cache
+
+    def render_preview(self):
+        """
+        Render a preview of the cloud: the canvas and font sizes are scaled down by preview_scale, and further so
+        the longest side of the canvas is at most PREVIEW_MAX_SIZE pixels, and at most preview_words words are drawn.
+        :return: An RGB image array.
+        """
+        wordcloud = copy.copy(self.wordcloud)
+        # The cap keeps the cost of the preview bounded on large canvases, whatever the preview scale.
+        scale = min(self.preview_scale, float(PREVIEW_MAX_SIZE) / max(wordcloud.width, wordcloud.height))
+        wordcloud.width = max(1, int(wordcloud.width * scale))
+        wordcloud.height = max(1, int(wordcloud.height * scale))
+        wordcloud.min_font_size = max(1, int(wordcloud.min_font_size * scale))
+        if wordcloud.max_font_size is not None:
+            wordcloud.max_font_size = max(wordcloud.min_font_size, int(wordcloud.max_font_size * scale))
+        wordcloud.max_words = min(wordcloud.max_words, self.preview_words)
+        full_terms_dict = multidict.MultiDict()
+        for key, value in self.sorted_x[:wordcloud.max_words]:
+            full_terms_dict.add(key, value)
+        return wordcloud.generate_from_frequencies(full_terms_dict).to_array()
+
+    def render(self):
+        """
+        Render the cloud and frequency images, or return them from the render cache.
+        The cloud is laid out on a copy of the WordCloud of the snapshot, so a job can be rendered more than once.
+        :return: A tuple (cloud image, frequency image) of RGB image arrays.
+        """
+        images = self.render_cache.get(self.cache_key)
+        if images is not None:
+            return images
+        wordcloud = copy.copy(self.wordcloud)
+        sorted_x = self.sorted_x
+        # Need to normalize the frequencies
+        full_terms_dict = multidict.MultiDict()
+        for key, value in sorted_x[:wordcloud.max_words]:
+            full_terms_dict.add(key, value)
+        # to_array( ) returns the canvas of the cloud as a contiguous RGB array without touching the disk.
+        wordcloud_image = wordcloud.generate_from_frequencies(full_terms_dict).to_array()
+        plot_words = [x[0] for x in sorted_x[:self.freq_size]]
+        plot_counts = [x[1] for x in sorted_x[:self.freq_size]]
+        freq_image = render_histogram(plot_words, plot_counts, self.histogram_backend)
+        images = (wordcloud_image, freq_image)
+        self.render_cache.put(self.cache_key, images)
+        return images
+
+    def __render_settings(self, stopwords_version):
+        """
+        Utility to collect the settings that change the rendered images, for the key of the render cache.
+        Layouts are random unless random_state is set, so a hit returns the layout of the first render.
+        :param stopwords_version: The version of the stop words the words were selected with.
+        :return: A tuple of strings, numbers and None.
+        """
+        wc = self.wordcloud
+        random_state = wc.random_state if isinstance(wc.random_state, int) else None
+        return (wc.width, wc.height, wc.background_color, wc.min_font_size, wc.max_font_size, wc.font_path,
+                wc.max_words, wc.scale, wc.margin, wc.prefer_horizontal, wc.relative_scaling, wc.mode,
+                getattr(wc.colormap, 'name', wc.colormap), random_state,
+                self.freq_size, self.histogram_backend, stopwords_version)
 
 
 class WordCloudWrapper(object):
@@ -43,9 +140,15 @@ class WordCloudWrapper(object):
         self.wordcloud_image = None
         self.freq_image = None
         self.freq_size = 20
+        self.histogram_backend = AGG_BACKEND
+        self.render_cache = RenderCache()
+        self.progressive = False
+        self.preview_scale = PREVIEW_SCALE
+        self.preview_words = PREVIEW_WORDS
+        self.stage = FINAL_STAGE
         self.wordcloud = WordCloud(width=800, height=800,
                                    background_color='white',
-                                   stopwords=set(self.stopwords.get_stopwords()),
+                                   stopwords=self.stopwords.get_stopwords(),
                                    min_font_size=10)
 
     def get_width(self):
@@ -87,50 +190,193 @@ class WordCloudWrapper(object):
     def set_freq_size(self, size):
         self.freq_size = size
 
+    def get_histogram_backend(self):
+        return self.histogram_backend
+
+    def set_histogram_backend(self, backend):
+        """
+        Select the renderer of the frequency image.
+        :param backend: One of HistogramRenderer.AGG_BACKEND (default), PIL_BACKEND or PYPLOT_BACKEND.
+        :return:
+        """
+        if backend not in RENDERERS:
+            raise ValueError('{:s} is not a histogram backend.'.format(backend))
+        self.histogram_backend = backend
+
+    def get_render_cache(self):
+        return self.render_cache
+
+    def get_progressive(self):
+        return self.progressive
+
+    def set_progressive(self, progressive):
+        """
+        Enable the progressive mode, where a quick preview of the cloud is sent to the image observers before the
+        full size cloud is rendered.
+        :param progressive: True to render a preview first.
+        :return:
+        """
+        self.progressive = progressive
+
+    def get_stage(self):
+        """
+        Returns the stage of the current cloud image, so image observers can tell a preview from the final image.
+        :return: PREVIEW_STAGE or FINAL_STAGE.
+        """
+        return self.stage
+
     def generate_from_count(self, count):
         """
         Generate the cloud image from a dictionary of word and counts.
         :param count: A dictionary in the form {word: count}
         :return:
         """
-        stopwords = set([i.lower() for i in self.stopwords.get_stopwords()])
+        self.__generate(self.select_from_count(count))
+
+    def generate_from_cloud_words(self, cloud_words):
+        """
+        Generate the cloud image from the most frequent words of a CloudWords model.
+        :param cloud_words: The CloudWords instance holding the words and counts.
+        :return:
+        """
+        self.__generate(self.select_from_cloud_words(cloud_words))
+
+    def select_from_count(self, count):
+        """
+        Select the words to draw from a dictionary of word and counts.
+        :param count: A dictionary in the form {word: count}
+        :return: A list of (word, count) tuples without the stopwords, most frequent first.
+        """
+        stopwords = self.stopwords.get_stopwords()
         # remove stopwords
         count = {x: count[x] for x in count if x.lower() not in stopwords}
-        # Need to normalize the frequencies
-        full_terms_dict = multidict.MultiDict()
-        for key in count:
-            full_terms_dict.add(key, count[key])
-        self.wordcloud.generate_from_frequencies(full_terms_dict).to_file('wordcloud.png')
-        # self.wordcloud_image = self.wordcloud.generate_from_frequencies(full_terms_dict).to_image()
-        self.wordcloud_image = cv2.imread('wordcloud.png')
-        sorted_x = sorted(count.items(), key=lambda cnt: cnt[1], reverse=True)
-        plot_words = [x[0] for x in sorted_x[:self.freq_size]]
-        plot_counts = [x[1] for x in sorted_x[:self.freq_size]]
-        # Plot histogram using matplotlib bar().
-        indexes = np.arange(len(plot_words))
-        fig = plt.bar(indexes, plot_counts)
-        plt.xticks(indexes, plot_words, rotation=90)
-        plt.savefig('histogram.png')
-        # plt.close(fig)
-        plt.close()
-        self.freq_image = cv2.imread('histogram.png')
+        return sorted(count.items(), key=lambda cnt: cnt[1], reverse=True)
+
+    def select_from_cloud_words(self, cloud_words):
+        """
+        Select the words to draw from the most frequent words of a CloudWords model.
+        Only the words that can be drawn are selected with CloudWords.top( ), so the vocabulary is never sorted.
+        :param cloud_words: The CloudWords instance holding the words and counts.
+        :return: A list of (word, count) tuples without the stopwords, most frequent first.
+        """
+        stopwords = self.stopwords.get_stopwords()
+        size = max(self.wordcloud.max_words, self.freq_size)
+        # At most len(stopwords) of the top words are removed as stopwords.
+        top = cloud_words.top(size + len(stopwords))
+        return [x for x in top if x[0].lower() not in stopwords][:size]
+
+    def __generate(self, sorted_x):
+        """
+        Utility to generate the images of the words sorted by decreasing count, with a preview first in the
+        progressive mode unless the images are already cached.
+        :param sorted_x: A list of (word, count) tuples, most frequent first.
+        :return:
+        """
+        job = self.snapshot(sorted_x)
+        if job.progressive and not job.is_rendered():
+            self.set_preview_image(job.render_preview())
+        self.set_images(job.render())
+
+    def snapshot(self, sorted_x):
+        """
+        Capture the settings of a render of the words in a RenderJob.  Take the snapshot on the thread changing
+        the settings and hand the job to a worker thread, which renders it with the settings of the snapshot.
+        :param sorted_x: A list of (word, count) tuples, most frequent first.
+        :return: A RenderJob.
+        """
+        return RenderJob(self, sorted_x)
+
+    def is_rendered(self, sorted_x):
+        """
+        Check if the images of the words with the current settings are in the render cache.
+        :param sorted_x: A list of (word, count) tuples, most frequent first.
+        :return: True if render( ) would return cached images.
+        """
+        return self.snapshot(sorted_x).is_rendered()
+
+    def render_preview(self, sorted_x):
+        """
+        Render a preview of the cloud with the current settings.  See RenderJob.render_preview( ).
+        :param sorted_x: A list of (word, count) tuples, most frequent first.
+        :return: An RGB image array.
+        """
+        return self.snapshot(sorted_x).render_preview()
+
+    def render(self, sorted_x):
+        """
+        Render the cloud and frequency images of the words sorted by decreasing count with the current settings.
+        The wrapper is left unchanged, so renders can run on worker threads while the images are installed with
+        set_images( ) on the thread owning the observers.  When the settings may change during the render, take
+        a snapshot( ) first and render it instead.
+        :param sorted_x: A list of (word, count) tuples, most frequent first.
+        :return: A tuple (cloud image, frequency image) of RGB image arrays.
+        """
+        return self.snapshot(sorted_x).render()
+
+    def set_preview_image(self, image):
+        """
+        Install a preview of the cloud and notify the image observers with the stage set to PREVIEW_STAGE.
+        The frequency image is left unchanged.
+        :param image: An RGB image array as returned by render_preview( ).
+        :return:
+        """
+        self.stage = PREVIEW_STAGE
+        self.wordcloud_image = image
+        self.__notify_image_observers()
+
+    def set_images(self, images):
+        """
+        Install rendered images and notify the image and frequency observers with the stage set to FINAL_STAGE.
+        :param images: A tuple (cloud image, frequency image) as returned by render( ).
+        :return:
+        """
+        self.stage = FINAL_STAGE
+        self.wordcloud_image, self.freq_image = images
         self.__notify_image_observers()
         self.__notify_frequency_observers()
 
     def get_cloud_image(self):
         """
         Returns the generated image of the cloud.
-        :return:
+        :return: A contiguous numpy array of shape (height, width, 3) holding the RGB pixels, or None.
         """
         return self.wordcloud_image
 
     def get_frequency_image(self):
         """
         Returns the generated image of the frequency plot of the top 20 words.
-        :return:
+        :return: A contiguous numpy array of shape (height, width, 3) holding the RGB pixels, or None.
         """
         return self.freq_image
 
+    def export_cloud_image(self, filename):
+        """
+        Write the generated image of the cloud to a file.  The format is chosen from the file extension.
+        :param filename: Name of the image file to write.
+        :return:
+        """
+        self.__export(self.wordcloud_image, filename)
+
+    def export_frequency_image(self, filename):
+        """
+        Write the generated image of the frequency plot to a file.  The format is chosen from the file extension.
+        :param filename: Name of the image file to write.
+        :return:
+        """
+        self.__export(self.freq_image, filename)
+
+    @staticmethod
+    def __export(image, filename):
+        """
+        Utility to write an RGB image array to a file.
+        :param image: The RGB image array or None if no image was generated.
+        :param filename: Name of the image file to write.
+        :return:
+        """
+        if image is None:
+            raise ValueError('No image has been generated.')
+        Image.fromarray(image, 'RGB').save(filename)
+
     def register_image_observer(self, observer):
         """
         Register an image client that needs to be notified when the words for the cloud has been updated.
@@ -0,0 +1,183 @@
+"""
+@package wordcloudtool.parser
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Class for counting the words of a corpus of files across a process pool.
+"""
+from wordcloudtool.parser.TextFileParser import TextFileParser
+from wordcloudtool.parser.PDFTextParser import PDFTextParser
+from wordcloudtool.parser.PDFImageParser import PDFImageParser
+from wordcloudtool.parser.WordDocParser import WordDocParser
+from wordcloudtool.parser.ImageFileParser import ImageFileParser
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections import Counter
+import os
+
+FILES_PER_TASK = 4
+PARSERS = {
+    '.txt': TextFileParser,
+    '.pdf': PDFTextParser,
+    '.doc': WordDocParser,
+    '.docx': WordDocParser,
+    '.png': ImageFileParser,
+    '.jpeg': ImageFileParser,
+    '.jpg': ImageFileParser,
+    '.gif': ImageFileParser,
+    '.tiff': ImageFileParser,
+}
+
+
+def _parse_counts(filename, ocr_workers=None):
+    """
+    Count the lowercased words of a file with the parser registered for its extension.
+    A PDF file without a text layer is parsed again with the PDFImageParser, as the views do.
+    :param filename: Name of the file to parse.
+    :param ocr_workers: Number of pages the PDFImageParser processes concurrently.  None uses one per CPU.
+    :return: A Counter in the form {word: count}.
+    """
+    parser_class = PARSERS[os.path.splitext(filename)[1].lower()]
+    try:
+        counts = parser_class(filename).parse_counts()
+    except IOError:
+        if parser_class is not PDFTextParser:
+            raise
+        counts = Counter()
+    if parser_class is PDFTextParser and len(counts) == 0:
+        counts = PDFImageParser(filename, workers=ocr_workers).parse_counts()
+    return counts
+
+
+def _count_files(filenames, ocr_workers=None):
+    """
+    Worker function counting the words of a group of files.
+    :param filenames: A list of file names.
+    :param ocr_workers: Number of pages the PDFImageParser processes concurrently.  None uses one per CPU.
+    :return: A tuple of the merged Counter of the files that were parsed and a dictionary in the form
+             {filename: exception} of the files that could not be parsed.
+    """
+    counts = Counter()
+    errors = {}
+    for filename in filenames:
+        try:
+            counts.update(_parse_counts(filename, ocr_workers))
+        except Exception as e:
+            errors[filename] = e
+    return counts, errors
+
+
+def _merge_counts(first, second):
+    """
+    Worker function merging two partial Counters.  The smaller one is added to the larger one, as the cost of
+    the merge is the size of the Counter added.
+    :param first: A Counter in the form {word: count}.
+    :param second: A Counter in the form {word: count}.
+    :return: A tuple of the merged Counter and an empty dictionary of errors, like _count_files( ).
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    first.update(second)
+    return first, {}
+
+
+class CorpusParser(object):
+    """
+    Counts the words of a list of files and directories in a process pool.
+    Each file is parsed by the FileParser subclass registered in PARSERS for its extension and groups of files
+    are counted in the worker processes, each sending back one Counter for its group.  The partial Counters are
+    then merged in pairs in the pool as they complete, a tree reduction spreading the merging over the CPUs, and
+    only the final Counter is handed to the caller.  The pool already uses every CPU, so a PDF file without a
+    text layer is recognized one page at a time in its worker.
+    """
+    def __init__(self, paths, processes=None, files_per_task=FILES_PER_TASK):
+        """
+        Constructor
+        :param paths: A file name, a directory name or a list of them.  Directories are searched recursively
+                      for the files with an extension in PARSERS.
+        :param processes: Number of worker processes.  None uses one process per CPU and 1 parses the files serially.
+        :param files_per_task: Number of files counted by each task of the pool.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        for path in paths:
+            if not os.path.exists(path):
+                raise IOError('{:s} does not exist!'.format(path))
+        self.paths = list(paths)
+        self.processes = processes
+        self.files_per_task = files_per_task
+        self.errors = {}
+
+    def get_filenames(self):
+        """
+        Method to return the files of the corpus.
+        Files named explicitly are kept whatever their extension is, so an unknown extension is reported in errors.
+        :return: A list of file names.
+        """
+        filenames = []
+        for path in self.paths:
+            if not os.path.isdir(path):
+                filenames.append(path)
+                continue
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in PARSERS:
+                        filenames.append(os.path.join(root, name))
+        return filenames
+
+    def count_files(self):
+        """
+        Count the lowercased words of all of the files of the corpus.
+        A file that fails is left out of the counts and its exception is recorded in errors.
+        :return: A Counter in the form {word: count}.
+        """
+        self.errors = {}
+        filenames = []
+        for filename in self.get_filenames():
+            if os.path.splitext(filename)[1].lower() in PARSERS:
+                filenames.append(filename)
+            else:
+                self.errors[filename] = IOError('{:s} is not a supported file type.'.format(filename))
+        # The largest files are dealt out first so the long tasks do not end up last on an otherwise idle pool.
+        filenames.sort(key=os.path.getsize, reverse=True)
+        tasks = [filenames[i:i + self.files_per_task] for i in range(0, len(filenames), self.files_per_task)]
+        if self.processes == 1 or len(tasks) < 2:
+            counts, errors = _count_files(filenames)
+            self.errors.update(errors)
+            return counts
+        return self.__reduce(tasks)
+
+    def add_to(self, cloud_words, name=None):
+        """
+        Feed the counts of the corpus to a CloudWords model.
+        :param cloud_words: The CloudWords instance to add the counts to.
+        :param name: A string naming the corpus as a source of the model, or None to merge the counts into the model.
+        :return:
+        """
+        counts = self.count_files()
+        if name is None:
+            cloud_words.add_counts(counts)
+        else:
+            cloud_words.add_source(name, counts)
+
+    def __reduce(self, tasks):
+        """
+        Utility method counting the tasks in a process pool, each with a single threaded PDFImageParser, and
+        merging their Counters in pairs in the pool as soon as two of them are ready.
+        The errors of the tasks are recorded in errors.
+        :param tasks: A list of lists of file names.
+        :return: A Counter in the form {word: count}.
+        """
+        ready = []
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            pending = set(executor.submit(_count_files, task, 1) for task in tasks)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    counts, errors = future.result()
+                    self.errors.update(errors)
+                    ready.append(counts)
+                while len(ready) > 1:
+                    pending.add(executor.submit(_merge_counts, ready.pop(), ready.pop()))
+        return ready[0]
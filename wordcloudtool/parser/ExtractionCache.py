@@ -0,0 +1,136 @@
+"""
+@package wordcloudtool.parser
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+On-disk cache of the words extracted by the file based input decoders.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'wordcloudtool')
+MAX_BYTES = 256 * 1024 * 1024
+
+
+class ExtractionCache(object):
+    """
+    Size bounded, least recently used on-disk cache of extraction results.
+    Entries are keyed by the identity of the input file (device, inode, size and modification time),
+    the parser type and the parser settings, so a changed file or parser setting never hits a stale entry.
+    """
+    inst = None
+
+    @staticmethod
+    def get_ExtractionCache():
+        """
+        Factory method for creating a single use instance (Singleton) of the cache.
+        :return:
+        """
+        if ExtractionCache.inst is None:
+            ExtractionCache.inst = ExtractionCache()
+        return ExtractionCache.inst
+
+    def __init__(self, directory=DIRECTORY, max_bytes=MAX_BYTES):
+        """
+        Constructor
+        :param directory: Directory holding the cache entries.
+        :param max_bytes: Maximum total size of the cache entries before the least recently used are evicted.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = True
+
+    def key(self, parser, kind):
+        """
+        Build the cache key of an extraction result.
+        :param parser: The FileParser instance producing the result.
+        :param kind: A string naming the kind of result, e.g. 'words'.
+        :return: A string containing the cache key.
+        """
+        stat = os.stat(parser.filename)
+        fields = (type(parser).__name__, kind, os.path.abspath(parser.filename), stat.st_dev, stat.st_ino,
+                  stat.st_size, stat.st_mtime_ns, parser.cache_settings())
+        return hashlib.sha1(repr(fields).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a cached extraction result and mark it as recently used.
+        :param key: The cache key returned by key( ).
+        :return: The cached result, or None if there is no usable entry.
+        """
+        if not self.enabled:
+            return None
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return value
+
+    def put(self, key, value):
+        """
+        Store an extraction result and evict the least recently used entries beyond max_bytes.
+        :param key: The cache key returned by key( ).
+        :param value: The result to store.
+        :return:
+        """
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, os.path.join(self.directory, key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.__evict()
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        :return:
+        """
+        for path, _ in self.__entries():
+            os.remove(path)
+
+    def __entries(self):
+        """
+        Utility method listing the cache entries, least recently used first.
+        :return: A list of (path, stat) tuples.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((path, os.stat(path)))
+            except OSError:
+                pass
+        entries.sort(key=lambda entry: entry[1].st_mtime_ns)
+        return entries
+
+    def __evict(self):
+        """
+        Utility method removing the least recently used entries until the cache fits in max_bytes.
+        :return:
+        """
+        entries = self.__entries()
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= stat.st_size
@@ -8,8 +8,12 @@ Base class for file based input decoders providing source for words to cloudify.
 """
 from abc import ABCMeta, abstractmethod
 from wordcloudtool.parser.ParserBase import ParserBase
+from wordcloudtool.parser.ExtractionCache import ExtractionCache
 import os
 
+# Largest input file whose list of words is stored in the ExtractionCache.  The counts are cached for any size.
+MAX_CACHED_WORDS_SIZE = 16 * 1024 * 1024
+
 
 class FileParser(ParserBase):
     """
@@ -24,11 +28,74 @@ class FileParser(ParserBase):
         if filename is None:
             raise AssertionError('No filename was passed to the constructor.')
         self.filename = filename
+        self.use_cache = True
         # self.fd = None
         super(FileParser, self).__init__(stopwords, include_numbers, min_word_length)
         if not os.path.exists(filename):
             raise IOError('{:s} does not exist!'.format(filename))
 
+    def parse(self):
+        """
+        Process the input file and decode it into a list of word tokens.
+        The words are served from the ExtractionCache when the file and tokenizer are unchanged, unless the file is
+        larger than MAX_CACHED_WORDS_SIZE bytes: the list of words of a large file is not worth storing, use
+        parse_counts( ) instead.  Set use_cache to False to always parse the file.
+        :return: A list of words from the input file.
+        """
+        if os.path.getsize(self.filename) > MAX_CACHED_WORDS_SIZE:
+            return super(FileParser, self).parse()
+        return self.__cached('words', super(FileParser, self).parse)
+
+    def parse_counts(self):
+        """
+        Process the input file and count the lowercased word tokens.
+        The counts are served from the ExtractionCache when the file and tokenizer are unchanged.
+        Set use_cache to False to always parse the file.
+        :return: A Counter in the form {word: count}.
+        """
+        return self.__cached('counts', self.count_words)
+
+    def count_words(self):
+        """
+        Count the lowercased word tokens of the input file, bypassing the ExtractionCache.
+        Derived classes override it to count their input more efficiently.
+        :return: A Counter in the form {word: count}.
+        """
+        return super(FileParser, self).parse_counts()
+
+    def cache_settings(self):
+        """
+        Returns the settings of the parser that change the extraction results, for the key of the ExtractionCache.
+        Derived classes with settings of their own extend the tuple.
+        :return: A tuple of strings, numbers and booleans.
+        """
+        return self.get_pattern().pattern, self.include_numbers, self.min_word_length
+
+    def is_cacheable(self):
+        """
+        Check if the last extraction result is complete and may be stored in the ExtractionCache.
+        :return: True unless a derived class reports an incomplete extraction.
+        """
+        return True
+
+    def __cached(self, kind, produce):
+        """
+        Utility method looking up an extraction result in the ExtractionCache, producing and storing it on a miss.
+        :param kind: A string naming the kind of result.
+        :param produce: Method called to produce the result on a miss.
+        :return: The extraction result.
+        """
+        if not self.use_cache:
+            return produce()
+        cache = ExtractionCache.get_ExtractionCache()
+        key = cache.key(self, kind)
+        value = cache.get(key)
+        if value is None:
+            value = produce()
+            if self.is_cacheable():
+                cache.put(key, value)
+        return value
+
     # def open(self):
     #     """
     #     Opens the file to be parsed and returns the file descriptor to the opened file.
@@ -8,7 +8,6 @@ Specialized class for raw image file based input decoders providing source for w
 """
 from wordcloudtool.parser.FileParser import FileParser
 import textract
-import re
 
 
 class ImageFileParser(FileParser):
@@ -20,25 +19,12 @@ class ImageFileParser(FileParser):
         Constructor
         :param filename: Name of the text file to parse.
         """
-        self.regexp = None
         super(ImageFileParser, self).__init__(filename)
 
-    def parse(self):
+    def iter_text(self):
         """
-        Parse the contents of the raw image file and extract all the words into a list.
-        :return: A list of words from the text file.
+        Extract the text contents of the raw image file.
+        :return: An iterator over the extracted text.
         """
         line = textract.process(self.filename, method='tesseract', language='eng')
-        line = line.decode('ascii', 'ignore')
-        ret = self.__process_line(line)
-        return ret
-
-    def __process_line(self, line):
-        """
-        Process the contents of the line to strip out non-word characters and return a list of words.
-        :param line: A string containing the characters from the line of the text file.
-        :return: A list of words.
-        """
-        regexp = self.regexp if self.regexp is not None else r"\w[\w']+"
-        words = re.findall(regexp, line, 0)
-        return words
+        yield line.decode('ascii', 'ignore')
@@ -7,43 +7,109 @@
 Specialized class for PDF image file based input decoders providing source for words to cloudify.
 """
 from wordcloudtool.parser.FileParser import FileParser
-import textract
-import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import PyPDF2
+import os
+import subprocess
+import tempfile
+import time
+
+RESOLUTION = 300
+
+
+def _ocr_page(filename, page, workdir, timeout):
+    """
+    Worker function rasterizing a single page of the PDF file with pdftoppm and running tesseract on it.
+    :param filename: Name of the PDF file to parse.
+    :param page: Index of the page to process.
+    :param workdir: Directory to hold the rasterized page image.
+    :param timeout: Maximum number of seconds to spend on the page, or None for no limit.
+    :return: The text recognized on the page.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    prefix = os.path.join(workdir, 'page{:d}'.format(page))
+    subprocess.run(['pdftoppm', '-f', str(page + 1), '-l', str(page + 1), '-r', str(RESOLUTION),
+                    '-png', '-singlefile', filename, prefix],
+                   check=True, timeout=timeout, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    image = prefix + '.png'
+    try:
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        # Pages are already processed concurrently, so each tesseract process is limited to a single OpenMP
+        # thread.  The environment is copied on every call so changes to PATH or TESSDATA_PREFIX are honored.
+        env = dict(os.environ, OMP_THREAD_LIMIT='1')
+        out = subprocess.run(['tesseract', image, 'stdout', '-l', 'eng'], check=True, timeout=remaining,
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+    finally:
+        os.remove(image)
+    return out.stdout.decode('ascii', 'ignore')
 
 
 class PDFImageParser(FileParser):
     """
     Specialized class for PDF image file based input decoders.
     """
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, workers=None, page_timeout=None):
         """
         Constructor
         :param filename: Name of the PDF file to parse.
+        :param workers: Maximum number of pages processed concurrently.  None uses one worker per CPU, each
+                        running a single threaded tesseract.
+        :param page_timeout: Maximum number of seconds to spend on a single page, or None for no limit.
         """
-        self.regexp = None
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.page_timeout = page_timeout
+        self.timed_out_pages = []
         super(PDFImageParser, self).__init__(filename)
         if not self.__test_for_pdf():
             raise IOError('{:s} is not a text based PDF file.'.format(filename))
 
-    def parse(self):
+    def is_cacheable(self):
         """
-        Parse the contents of the PDF file and extract all the words into a list.
-        :return: A list of words from the text file.
+        Check if the last extraction result is complete.  Results missing pages that timed out are not cached.
+        :return: True if no page timed out.
         """
-        line = textract.process(self.filename, method='tesseract', language='eng')
-        line = line.decode('ascii', 'ignore')
-        ret = self.__process_line(line)
-        return ret
+        return not self.timed_out_pages
 
-    def __process_line(self, line):
+    def iter_text(self):
         """
-        Process the contents of the line to strip out non-word characters and return a list of words.
-        :param line: A string containing the characters from the line of the text file.
-        :return: A list of words.
+        Extract the text contents of the PDF file one page at a time in page order.
+        A page is returned as soon as it and all of the pages before it have been processed.
+        :return: An iterator over the text of each page of the PDF file.
         """
-        regexp = self.regexp if self.regexp is not None else r"\w[\w']+"
-        words = re.findall(regexp, line, 0)
-        return words
+        pending = {}
+        next_page = 0
+        for page, text in self.iter_pages():
+            pending[page] = text
+            while next_page in pending:
+                yield pending.pop(next_page)
+                next_page += 1
+
+    def iter_pages(self):
+        """
+        Rasterize and OCR the pages of the PDF file on a pool of workers.
+        Pages are returned in the order they complete.  A page exceeding page_timeout is returned as
+        empty text and its index is recorded in timed_out_pages.
+        :return: An iterator over (page index, text) tuples.
+        """
+        with open(self.filename, 'rb') as f:
+            num_pages = PyPDF2.PdfFileReader(f).numPages
+        self.timed_out_pages = []
+        with tempfile.TemporaryDirectory() as workdir:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(_ocr_page, self.filename, page, workdir, self.page_timeout): page
+                           for page in range(num_pages)}
+                try:
+                    for future in as_completed(futures):
+                        page = futures[future]
+                        try:
+                            text = future.result()
+                        except subprocess.TimeoutExpired:
+                            self.timed_out_pages.append(page)
+                            text = ''
+                        yield page, text
+                finally:
+                    for future in futures:
+                        future.cancel()
 
     def __test_for_pdf(self):
         """
@@ -57,4 +123,3 @@ class PDFImageParser(FileParser):
             if tag != b'%PDF':
                 return False
             return True
-
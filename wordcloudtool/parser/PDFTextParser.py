@@ -7,50 +7,131 @@
 Specialized class for PDF text file based input decoders providing source for words to cloudify.
 """
 from wordcloudtool.parser.FileParser import FileParser
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
 import PyPDF2
 import re
 
+PAGES_PER_TASK = 16
+
+
+def _page_words(filename, regexp, first, last):
+    """
+    Worker function extracting the words of a range of pages with a PDF reader of its own.
+    :param filename: Name of the PDF file to parse.
+    :param regexp: The tokenizer regular expression string.
+    :param first: Index of the first page of the range.
+    :param last: Index one past the last page of the range.
+    :return: A list holding the list of words of each page in page order.
+    """
+    findall = re.compile(regexp).findall
+    with open(filename, 'rb') as f:
+        pdfReader = PyPDF2.PdfFileReader(f)
+        return [findall(pdfReader.getPage(count).extractText()) for count in range(first, last)]
+
+
+def _page_counts(filename, regexp, first, last):
+    """
+    Worker function counting the words of a range of pages with a PDF reader of its own.
+    :param filename: Name of the PDF file to parse.
+    :param regexp: The tokenizer regular expression string.
+    :param first: Index of the first page of the range.
+    :param last: Index one past the last page of the range.
+    :return: A list holding a Counter of the words of each page in page order.
+    """
+    return [Counter(words) for words in _page_words(filename, regexp, first, last)]
+
 
 class PDFTextParser(FileParser):
     """
     Specialized class for PDF text file based input decoders.
     """
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, processes=1):
         """
         Constructor
         :param filename: Name of the PDF file to parse.
+        :param processes: Number of worker processes extracting pages.  1 extracts the pages serially and
+                          None uses one process per CPU.
         """
-        self.regexp = None
+        self.processes = processes
         super(PDFTextParser, self).__init__(filename)
         if not self.__test_for_pdf():
             raise IOError('{:s} is not a text based PDF file.'.format(filename))
 
-    def parse(self):
+    def iter_text(self):
         """
-        Parse the contents of the PDF file and extract all the words into a list.
-        :return: A list of words from the text file.
+        Read the contents of the PDF file one page at a time.
+        :return: An iterator over the text of each page of the PDF file.
         """
         with open(self.filename, 'rb') as f:
-            ret = []
             pdfReader = PyPDF2.PdfFileReader(f)
             num_pages = pdfReader.numPages
             count = 0
-            line = ""
             while count < num_pages:
                 pageObj = pdfReader.getPage(count)
                 count += 1
-                ret += self.__process_line(pageObj.extractText())
-            return ret
+                yield pageObj.extractText()
+
+    def iter_words(self):
+        """
+        Generator yielding the words of the PDF file one at a time in page order.
+        :return: An iterator over the words of the PDF file.
+        """
+        if self.processes == 1:
+            return super(PDFTextParser, self).iter_words()
+        return self.__iter_parallel_words()
 
-    def __process_line(self, line):
+    def count_words(self):
         """
-        Process the contents of the line to strip out non-word characters and return a list of words.
-        :param line: A string containing the characters from the line of the text file.
-        :return: A list of words.
+        Count the lowercased words of the PDF file.  With worker processes, only the per-page Counters of
+        count_pages( ) are sent back from the workers and merged, instead of the lists of words of every page.
+        :return: A Counter in the form {word: count}.
         """
-        regexp = self.regexp if self.regexp is not None else r"\w[\w']+"
-        words = re.findall(regexp, line, 0)
-        return words
+        if self.processes == 1:
+            return super(PDFTextParser, self).count_words()
+        ret = Counter()
+        for counts in self.count_pages():
+            for word, count in counts.items():
+                ret[word.lower()] += count
+        return ret
+
+    def count_pages(self):
+        """
+        Count the words of every page of the PDF file, splitting the pages across the worker processes.
+        :return: A list holding a Counter of the words of each page in page order.
+        """
+        ret = []
+        for counts in self.__map_pages(_page_counts):
+            ret += counts
+        return ret
+
+    def __iter_parallel_words(self):
+        """
+        Extract the words of the PDF file in the worker processes and yield them in page order.
+        :return: An iterator over the words of the PDF file.
+        """
+        for pages in self.__map_pages(_page_words):
+            for words in pages:
+                for word in words:
+                    yield word
+
+    def __map_pages(self, worker):
+        """
+        Utility method splitting the page range of the PDF file into tasks for a process pool.
+        :param worker: Module level function called with (filename, regexp, first, last) for each task.
+        :return: An iterator over the results of the tasks in page order.
+        """
+        with open(self.filename, 'rb') as f:
+            num_pages = PyPDF2.PdfFileReader(f).numPages
+        regexp = self.get_pattern().pattern
+        if self.processes == 1:
+            yield worker(self.filename, regexp, 0, num_pages)
+            return
+        firsts = range(0, num_pages, PAGES_PER_TASK)
+        lasts = [min(first + PAGES_PER_TASK, num_pages) for first in firsts]
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            for result in executor.map(worker, [self.filename] * len(firsts), [regexp] * len(firsts), firsts, lasts):
+                yield result
 
     def __test_for_pdf(self):
         """
@@ -64,4 +145,3 @@ class PDFTextParser(FileParser):
             if tag != b'%PDF':
                 return False
             return True
-
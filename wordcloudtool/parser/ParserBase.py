@@ -6,11 +6,34 @@
 @change: Mar 25, 2019 - Initial release
 Base class for input decoders providing source for words to cloudify.
 """
+from wordcloudtool.model.StopWords import read_stopfile
 from abc import ABCMeta, abstractmethod
+from collections import Counter
 import os
+import re
 
 FILE = os.path.dirname(__file__)
-STOPWORDS = set(map(str.strip, open(os.path.join(FILE, 'stopwords')).readlines()))
+STOPFILE = os.path.join(FILE, 'stopwords')
+REGEXP = r"\w[\w']+"
+
+
+def get_default_stopwords():
+    """
+    Returns the packaged stop words.  The stopwords file is only read the first time the stop words are needed,
+    so importing the parsers does no file I/O.  The words come from the read_stopfile( ) cache shared with the
+    package layer of the StopWords model, so the result is shared by every parser and model of the process.
+    :return: A frozenset of stop words.
+    """
+    return read_stopfile(STOPFILE)
+
+
+def __getattr__(name):
+    """
+    Module attribute hook keeping the STOPWORDS module attribute available without reading it at import time.
+    """
+    if name == 'STOPWORDS':
+        return get_default_stopwords()
+    raise AttributeError('module {:s} has no attribute {:s}'.format(__name__, name))
 
 
 class ParserBase(object):
@@ -23,33 +46,141 @@ class ParserBase(object):
         """
         Constructor
         """
-        self.stopwords = stopwords if stopwords is not None else STOPWORDS
+        self.__stopwords = None
+        self.__stopwords_version = 0
+        self.__normalized_stopwords = None
+        self.__normalized_version = None
+        self.stopwords = stopwords
         self.include_numbers = include_numbers
         self.min_word_length = min_word_length
+        self.regexp = None
+        self.__pattern = None
+
+    @property
+    def stopwords(self):
+        """
+        The collection of stop words, or a StopWords model.  Assigning a different collection bumps the stop
+        words version so the normalized set used by prune( ) is rebuilt, and so does adding or removing words of
+        a mutable collection in place, which is detected by its length.  Changes keeping the length (e.g. replacing
+        a word) are not detected: assign the changed collection again, or use a StopWords model.  A StopWords
+        model is already normalized and versioned, so its snapshot is used as is and picked up again when its
+        version changes.
+        None stands for the packaged stop words, which are only loaded when they are first used.  Each parser gets
+        its own copy of them, so adding words to the stop words of one parser leaves the other parsers unchanged.
+        """
+        if self.__stopwords is None:
+            self.stopwords = set(get_default_stopwords())
+        return self.__stopwords
+
+    @stopwords.setter
+    def stopwords(self, stopwords):
+        if stopwords is not self.__stopwords:
+            self.__stopwords = stopwords
+            self.__stopwords_version += 1
+
+    def get_normalized_stopwords(self):
+        """
+        Returns the lowercased stop words.  The set is only rebuilt when the stop words version changed or the
+        length of a mutable collection of stop words changed, so checking for changes costs O(1).
+        :return: A frozenset of lowercased stop words.
+        """
+        stopwords = self.stopwords
+        get_version = getattr(stopwords, 'get_version', None)
+        if get_version is not None:
+            contents = get_version()
+        elif isinstance(stopwords, (frozenset, tuple)):
+            contents = None
+        else:
+            contents = len(stopwords)
+        version = (self.__stopwords_version, contents)
+        if self.__normalized_version != version:
+            if get_version is not None:
+                self.__normalized_stopwords = stopwords.get_stopwords()
+            else:
+                self.__normalized_stopwords = frozenset(word.lower() for word in stopwords)
+            self.__normalized_version = version
+        return self.__normalized_stopwords
+
+    def get_pattern(self):
+        """
+        Returns the compiled tokenizer pattern for the current parser configuration.
+        The pattern is compiled once and only recompiled if self.regexp is changed.
+        :return: A compiled regular expression object.
+        """
+        regexp = self.regexp if self.regexp is not None else REGEXP
+        if self.__pattern is None or self.__pattern.pattern != regexp:
+            self.__pattern = re.compile(regexp)
+        return self.__pattern
+
+    def iter_words(self):
+        """
+        Generator yielding the words of the input one at a time.  Only one segment of text
+        returned by iter_text( ) is held in memory at a time.
+        :return: An iterator over the words of the input.
+        """
+        findall = self.get_pattern().findall
+        for text in self.iter_text():
+            for word in findall(text):
+                yield word
 
     def prune(self, words, stopwords=None):
         """
         Eliminate unwanted words from the list of words.
         """
-        self.stopwords = stopwords if stopwords is not None else self.stopwords
-        stopwords = set([i.lower() for i in self.stopwords])
-        # remove stopwords
-        words = [word for word in words if word.lower() not in stopwords]
-        # remove 's
-        words = [word[:-2] if word.lower().endswith("'s") else word
-                 for word in words]
-        # remove numbers
-        if not self.include_numbers:
-            words = [word for word in words if not word.isdigit()]
-        # remove short words
-        if self.min_word_length:
-            words = [word for word in words if len(word) >= self.min_word_length]
-        return words
+        return list(self.iter_prune(words, stopwords))
+
+    def iter_prune(self, words, stopwords=None):
+        """
+        Streaming form of prune( ).  All of the filters are applied in a single pass over words,
+        which may be any iterable such as the generator returned by iter_words( ).
+        :param words: An iterable of words.
+        :param stopwords: Optional collection of stop words replacing the current stop words.
+        :return: An iterator over the words that were kept.
+        """
+        if stopwords is not None:
+            self.stopwords = stopwords
+        return self.__iter_prune(words, self.get_normalized_stopwords(), self.include_numbers, self.min_word_length)
+
+    @staticmethod
+    def __iter_prune(words, stopwords, include_numbers, min_word_length):
+        """
+        Utility generator applying the stop word, 's, number and length filters to each word.
+        """
+        for word in words:
+            lower = word.lower()
+            # remove stopwords
+            if lower in stopwords:
+                continue
+            # remove 's
+            if lower.endswith("'s"):
+                word = word[:-2]
+            # remove numbers
+            if not include_numbers and word.isdigit():
+                continue
+            # remove short words
+            if min_word_length and len(word) < min_word_length:
+                continue
+            yield word
 
-    @abstractmethod
     def parse(self):
         """
-        Abstract method defining interface to process the input file data and decode it into word tokens.
-        :return:
+        Process the input data and decode it into a list of word tokens.
+        :return: A list of words from the input.
+        """
+        return list(self.iter_words())
+
+    def parse_counts(self):
+        """
+        Process the input data and count the lowercased word tokens straight from the token stream,
+        without building the list of words.
+        :return: A Counter in the form {word: count}.
+        """
+        return Counter(map(str.lower, self.iter_words()))
+
+    @abstractmethod
+    def iter_text(self):
+        """
+        Abstract method defining interface to read the input data as a sequence of text segments (lines, pages, etc.).
+        :return: An iterator over strings of text.
         """
-        raise NotImplementedError('Derived classes must implement the parse( ) method to decode the input data.')
+        raise NotImplementedError('Derived classes must implement the iter_text( ) method to read the input data.')
@@ -7,73 +7,135 @@
 Specialized class for text file based input decoders providing source for words to cloudify.
 """
 from wordcloudtool.parser.FileParser import FileParser
+import numpy as np
+import codecs
+import locale
+import mmap
+import os
 import re
 
+CHUNK_SIZE = 16 * 1024 * 1024
+SAMPLE_SIZE = 64 * 1024
+SAMPLE_BLOCKS = 5
+# Byte values counted as binary when sniffing a file: control characters other than
+# tab, line feed, form feed and carriage return, DEL and everything outside of ASCII.
+BINARY_BYTES = np.ones(256, dtype=bool)
+BINARY_BYTES[32:127] = False
+BINARY_BYTES[[9, 10, 12, 13]] = False
+# Characters an encoding must encode as the same ASCII bytes for the memory mapped mode to split windows on them.
+ASCII_PROBE = '\t\n\x0b\x0c\r azAZ09'
+
 
 class TextFileParser(FileParser):
     """
     Specialized class for text file based input decoders.
     """
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, use_mmap=False, chunk_size=CHUNK_SIZE, sample_size=SAMPLE_SIZE, encoding=None):
         """
         Constructor
         :param filename: Name of the text file to parse.
+        :param use_mmap: True to scan the memory mapped file in fixed-size byte windows instead of line by line.
+                         Ignored for encodings that are not ASCII compatible (e.g. UTF-16), which are read line by line.
+        :param chunk_size: Size in bytes of each window scanned when use_mmap is True.
+        :param sample_size: Maximum number of bytes read to decide whether the file is a text file.
+        :param encoding: Encoding of the text file.  Defaults to the locale encoding, as for open( ).
         """
-        self.regexp = None
+        self.use_mmap = use_mmap
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.sample_size = sample_size
         super(TextFileParser, self).__init__(filename)
         if not self.__test_for_text():
             raise IOError('{:s} is not a text file.'.format(filename))
 
-    def parse(self):
+    def cache_settings(self):
+        """
+        Returns the settings of the parser that change the extraction results, for the key of the ExtractionCache.
+        :return: A tuple of strings, numbers and booleans.
+        """
+        return super(TextFileParser, self).cache_settings() + (self.use_mmap, self.chunk_size, self.encoding)
+
+    def iter_text(self):
         """
-        Parse the contents of the text file and extract all the words into a list.
-        :return: A list of words from the text file.
+        Read the contents of the text file one line at a time.
+        :return: An iterator over the lines of the text file.
         """
-        with open(self.filename, 'r') as f:
-            ret = []
+        with open(self.filename, 'r', encoding=self.encoding) as f:
             for line in f:
-                ret += self.__process_line(line)
-            return ret
+                yield line
 
-    def __process_line(self, line):
+    def iter_words(self):
         """
-        Process the contents of the line to strip out non-word characters and return a list of words.
-        :param line: A string containing the characters from the line of the text file.
-        :return: A list of words.
+        Generator yielding the words of the text file one at a time.
+        :return: An iterator over the words of the text file.
         """
-        regexp = self.regexp if self.regexp is not None else r"\w[\w']+"
-        words = re.findall(regexp, line, 0)
-        return words
+        if self.use_mmap and self.__is_ascii_compatible():
+            return self.__iter_mmap_words()
+        return super(TextFileParser, self).iter_words()
 
-    def __test_for_text(self):
+    def __get_encoding(self):
         """
-        Utility method to validate a text file is being processed.
-        :return: True if text is found at the beginning of the file.  Otherwise, False is returned.
+        Utility returning the encoding the text file is decoded with.
+        :return: The name of the encoding.
         """
-        chr_cnt = 0
-        bin_cnt = 0
-        with open(self.filename, 'r') as f:
-            for line in f:
-                bc = self.__find_binary(line)
-                chr_cnt += len(line)
-                bin_cnt += bc
-        return False if bin_cnt/chr_cnt > 0.30 else True
+        return self.encoding if self.encoding is not None else locale.getpreferredencoding(False)
+
+    def __is_ascii_compatible(self):
+        """
+        Utility to check that the encoding of the text file encodes ASCII characters as single ASCII bytes, so the
+        memory mapped windows can be split on ASCII whitespace bytes without splitting a character.
+        :return: True if the encoding is ASCII compatible.  Otherwise, False is returned.
+        """
+        encoder = codecs.lookup(self.__get_encoding()).incrementalencoder()
+        # The first call may emit a byte order mark, which only starts the file.
+        encoder.encode(' ')
+        return encoder.encode(ASCII_PROBE) == ASCII_PROBE.encode('ascii')
 
-    def __find_binary(self, line):
-        """
-        Utility method to validate a line of text contains binary characters or not.
-        :param line: A string containing the characters from the line of the text file.
-        :return: The number of binary characters found in the string.
-        """
-        def isascii(s): return len(s) == len(s.encode())
-        bc = 0
-        if isascii(line):
-            for c in line:
-                if ord(c) < ord(' '):
-                    bc += 1
-                elif ord(c) > 126:
-                    bc += 1
-        else:
-            bc += len(line)
-        return bc
+    def __iter_mmap_words(self):
+        """
+        Scan the memory mapped text file in windows of chunk_size bytes.
+        Each window is extended to the next ASCII whitespace byte so neither a word nor an encoded character
+        straddles two windows, then decoded and tokenized with the same pattern as the line by line mode.
+        :return: An iterator over the words of the text file.
+        """
+        finditer = self.get_pattern().finditer
+        find_space = re.compile(rb"\s").search
+        encoding = self.__get_encoding()
+        with open(self.filename, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                while start < size:
+                    end = min(start + self.chunk_size, size)
+                    if end < size:
+                        space = find_space(mm, end)
+                        end = space.end() if space is not None else size
+                    for match in finditer(mm[start:end].decode(encoding)):
+                        yield match.group()
+                    start = end
 
+    def __test_for_text(self):
+        """
+        Utility method to validate a text file is being processed.
+        Only a sample of at most sample_size bytes is read: the head of the file plus blocks at evenly
+        spaced offsets through the rest of it.  The sample bytes are classified with a histogram.
+        :return: True if the sample is mostly text.  Otherwise, False is returned.
+        """
+        size = os.path.getsize(self.filename)
+        if size == 0:
+            return True
+        with open(self.filename, 'rb') as f:
+            if size <= self.sample_size:
+                sample = f.read()
+            else:
+                block = max(self.sample_size // SAMPLE_BLOCKS, 1)
+                parts = []
+                for i in range(SAMPLE_BLOCKS):
+                    f.seek((size - block) * i // (SAMPLE_BLOCKS - 1))
+                    parts.append(f.read(block))
+                sample = b''.join(parts)
+        histogram = np.bincount(np.frombuffer(sample, dtype=np.uint8), minlength=256)
+        bin_cnt = histogram[BINARY_BYTES].sum()
+        return False if bin_cnt/len(sample) > 0.30 else True
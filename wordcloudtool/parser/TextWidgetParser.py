@@ -7,7 +7,6 @@
 Common class for text based widget decoders providing source for words to cloudify.
 """
 from wordcloudtool.parser.ParserBase import ParserBase
-import re
 
 
 class TextWidgetParser(ParserBase):
@@ -21,26 +20,14 @@ class TextWidgetParser(ParserBase):
                      This is typically the text variable for the widget.
                      Thus, changes to the widget would be reflected here.
         """
-        super(ParserBase, self).__init__()
-        self.regexp = None
+        super(TextWidgetParser, self).__init__()
         self.text = text
 
-    def parse(self):
+    def iter_text(self):
         """
-        Parse the contents of the text field and extract all the words into a list.
-        :return: A list of words from the text widget.
+        Read the contents of the text field one line at a time.
+        :return: An iterator over the lines of the text widget.
         """
-        ret = []
-        for line in self.text:
-            ret += self.__process_line(line)
-        return ret
-
-    def __process_line(self, line):
-        """
-        Process the contents of the line to strip out non-word characters and return a list of words.
-        :param line: A string containing the characters from the line of the text file.
-        :return: A list of words.
-        """
-        regexp = self.regexp if self.regexp is not None else r"\w[\w']+"
-        words = re.findall(regexp, line, 0)
-        return words
+        lines = self.text.splitlines() if isinstance(self.text, str) else self.text
+        for line in lines:
+            yield line
@@ -0,0 +1,77 @@
+"""
+@package wordcloudtool.parser
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Class for fetching and counting the words of many URLs concurrently.
+"""
+from wordcloudtool.parser.URLParser import URLParser, MAX_CONNECTIONS
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# One worker per pooled connection of a host.
+MAX_WORKERS = MAX_CONNECTIONS
+
+
+class URLBatchParser(object):
+    """
+    Fetches a list of URLs on a bounded thread pool and counts the words of each page.
+    Each URL is handled by a URLParser, so unchanged pages are served from the ETag/Last-Modified cache.
+    """
+    def __init__(self, urls, max_workers=MAX_WORKERS):
+        """
+        Constructor
+        :param urls: A list of strings containing the URLs of the sites to be processed.
+        :param max_workers: Maximum number of URLs fetched concurrently.
+        """
+        self.urls = list(urls)
+        self.max_workers = max_workers
+        self.errors = {}
+
+    def iter_counts(self):
+        """
+        Fetch the URLs concurrently and count the lowercased words of each page.
+        A URL that fails is left out of the results and its exception is recorded in errors.
+        :return: An iterator over (url, Counter) tuples in the order the pages complete.
+        """
+        self.errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.__count_url, url): url for url in self.urls}
+            try:
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        counts = future.result()
+                    except Exception as e:
+                        self.errors[url] = e
+                        continue
+                    yield url, counts
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def count_urls(self):
+        """
+        Fetch the URLs concurrently and count the lowercased words of each page.
+        :return: A dictionary in the form {url: Counter}.
+        """
+        return dict(self.iter_counts())
+
+    def add_to(self, cloud_words):
+        """
+        Feed the counts of each URL to a CloudWords model as they complete, as a source named by the URL so the
+        pages can be reweighted or removed later.
+        :param cloud_words: The CloudWords instance to add the counts to.
+        :return:
+        """
+        for url, counts in self.iter_counts():
+            cloud_words.add_source(url, counts)
+
+    @staticmethod
+    def __count_url(url):
+        """
+        Utility method counting the words of a single URL.
+        :param url: A string containing the URL of the site to be processed.
+        :return: A Counter in the form {word: count}.
+        """
+        return URLParser(url).parse_counts()
@@ -7,43 +7,155 @@
 Common class for url based text decoders providing source for words to cloudify.
 """
 from wordcloudtool.parser.ParserBase import ParserBase
+from wordcloudtool.parser.ExtractionCache import ExtractionCache
+from html.parser import HTMLParser
+import codecs
+import hashlib
 import re
 import urllib3
 
+CHUNK_SIZE = 64 * 1024
+MAX_CONNECTIONS = 8
+# Connection pool shared by all URLParser instances so connections are reused across requests.  Each host keeps
+# up to MAX_CONNECTIONS connections, and further concurrent requests wait for one instead of opening connections
+# that would be discarded.
+HTTP = urllib3.PoolManager(maxsize=MAX_CONNECTIONS, block=True)
+CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+INVISIBLE_TAGS = frozenset(['script', 'style', 'noscript', 'template'])
+BLOCK_TAGS = frozenset(['address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption',
+                        'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+                        'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'title', 'tr', 'ul'])
+
+
+class VisibleTextParser(HTMLParser):
+    """
+    Incremental HTML parser collecting the visible text of a document.
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        super(VisibleTextParser, self).__init__(convert_charrefs=True)
+        self.pieces = []
+        self.__hidden = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in INVISIBLE_TAGS:
+            self.__hidden += 1
+        elif tag in BLOCK_TAGS:
+            self.pieces.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in INVISIBLE_TAGS:
+            self.__hidden = max(self.__hidden - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self.pieces.append('\n')
+
+    def handle_data(self, data):
+        if not self.__hidden:
+            self.pieces.append(data)
+
+    def take_text(self):
+        """
+        Returns the visible text collected since the last call.
+        :return: A string of visible text.
+        """
+        text = ''.join(self.pieces)
+        self.pieces = []
+        return text
+
 
 class URLParser(ParserBase):
     """
     Common features for all URL parsing.
     """
-    def __init__(self, url):
+    def __init__(self, url, chunk_size=CHUNK_SIZE):
         """
         Constructor
         :param url: A string containing the URL of the site to be processed.
+        :param chunk_size: Number of bytes of the response body decoded at a time.
         """
-        super(ParserBase, self).__init__()
-        self.regexp = None
-        self.text = None
+        super(URLParser, self).__init__()
         self.url = url
+        self.chunk_size = chunk_size
+        self.use_cache = True
+        self.request_headers = {}
+        self.status = None
+        self.response_headers = {}
 
-    def parse(self):
+    def parse_counts(self):
         """
-        Parse the contents of the text data and extract all the words into a list.
-        :return: A list of words from the text data.
+        Fetch the URL and count the lowercased word tokens.
+        The ETag and Last-Modified validators of the response are kept in the ExtractionCache with the counts,
+        so an unchanged page answered with 304 Not Modified is served from the cache.
+        Set use_cache to False to always fetch the whole page.
+        :return: A Counter in the form {word: count}.
         """
-        http = urllib3.PoolManager()
-        response = http.request('GET', self.url)
-        self.text = response.data.decode('utf-8')
-        ret = []
-        for line in self.text:
-            ret += self.__process_line(line)
-        return ret
+        if not self.use_cache:
+            return super(URLParser, self).parse_counts()
+        cache = ExtractionCache.get_ExtractionCache()
+        key = hashlib.sha1(repr(('URLParser', self.url, self.get_pattern().pattern)).encode('utf-8')).hexdigest()
+        entry = cache.get(key)
+        request_headers = self.request_headers
+        # The validators are only sent with this request, so later calls fetch the whole page again.
+        self.request_headers = dict(request_headers)
+        if entry is not None:
+            if entry['etag']:
+                self.request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                self.request_headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            counts = super(URLParser, self).parse_counts()
+        finally:
+            self.request_headers = request_headers
+        if self.status == 304 and entry is not None:
+            return entry['counts']
+        etag = self.response_headers.get('ETag')
+        last_modified = self.response_headers.get('Last-Modified')
+        if self.status == 200 and (etag or last_modified):
+            cache.put(key, {'etag': etag, 'last_modified': last_modified, 'counts': counts})
+        return counts
 
-    def __process_line(self, line):
+    def iter_text(self):
         """
-        Process the contents of the line to strip out non-word characters and return a list of words.
-        :param line: A string containing the characters from the line of the text file.
-        :return: A list of words.
+        Stream the response body in chunks, decoding it incrementally.  HTML is reduced to its visible text.
+        Each segment returned ends on whitespace so no word is split between two segments.
+        :return: An iterator over segments of the text data.
         """
-        regexp = self.regexp if self.regexp is not None else r"\w[\w']+"
-        words = re.findall(regexp, line, 0)
-        return words
+        response = HTTP.request('GET', self.url, headers=self.request_headers, preload_content=False)
+        try:
+            self.status = response.status
+            self.response_headers = response.headers
+            if response.status == 304:
+                return
+            if response.status >= 400:
+                raise IOError('{:s} returned HTTP status {:d}.'.format(self.url, response.status))
+            content_type = response.headers.get('Content-Type', '')
+            match = CHARSET.search(content_type)
+            try:
+                decoder = codecs.getincrementaldecoder(match.group(1) if match else 'utf-8')('replace')
+            except LookupError:
+                decoder = codecs.getincrementaldecoder('utf-8')('replace')
+            html = VisibleTextParser() if 'html' in content_type.lower() else None
+            tail = ''
+            for chunk in response.stream(self.chunk_size):
+                text = decoder.decode(chunk)
+                if html is not None:
+                    html.feed(text)
+                    text = html.take_text()
+                text = tail + text
+                cut = len(text)
+                while cut and not text[cut - 1].isspace():
+                    cut -= 1
+                tail = text[cut:]
+                if cut:
+                    yield text[:cut]
+            text = decoder.decode(b'', final=True)
+            if html is not None:
+                html.feed(text)
+                html.close()
+                text = html.take_text()
+            if tail or text:
+                yield tail + text
+        finally:
+            response.release_conn()
@@ -0,0 +1,36 @@
+"""
+@package wordcloudtool.qt5
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Dispatcher running the notifications of the models on the GUI thread.
+"""
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class GuiDispatcher(QObject):
+    """
+    Callable handing a function over to the thread the dispatcher was created on.  Create it on the GUI thread:
+    a call from another thread (e.g. the debounce timer of CloudWords) emits a signal whose connection is queued
+    back to the GUI thread, where the function is run by the event loop.
+    """
+    dispatch = pyqtSignal(object)
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        super(GuiDispatcher, self).__init__()
+        self.dispatch.connect(self.__run)
+
+    def __call__(self, function):
+        """
+        Run a function on the GUI thread.
+        :param function: A callable taking no argument.
+        :return:
+        """
+        self.dispatch.emit(function)
+
+    def __run(self, function):
+        function()
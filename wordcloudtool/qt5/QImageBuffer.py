@@ -0,0 +1,27 @@
+"""
+@package wordcloudtool.qt5
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Utility for displaying the RGB image arrays of the WordCloudWrapper in Qt5 without copying them.
+"""
+from PyQt5.QtGui import QImage
+import numpy as np
+
+
+def to_qimage(image):
+    """
+    Wrap an RGB image array in a QImage that shares the memory of the array.
+    QImage does not own the memory it wraps, so the array is kept as an attribute of the QImage for as long as
+    the QImage lives.
+    :param image: A numpy array of shape (height, width, 3) and dtype uint8 holding the RGB pixels.
+    :return: A QImage in the QImage.Format_RGB888 format.
+    """
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width, depth = image.shape
+    if depth != 3:
+        raise ValueError('image is not an RGB image.')
+    qimage = QImage(image.data, width, height, image.strides[0], QImage.Format_RGB888)
+    qimage.ndarray = image
+    return qimage
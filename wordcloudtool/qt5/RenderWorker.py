@@ -0,0 +1,68 @@
+"""
+@package wordcloudtool.qt5
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Worker rendering the word cloud on a QThreadPool thread so the GUI thread stays responsive.
+"""
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class RenderSignals(QObject):
+    """
+    Signals of a RenderWorker.  QRunnable is not a QObject, so the signals live on a QObject created on the
+    GUI thread, and connections to slots of GUI objects are queued back to the GUI thread.
+    """
+    preview = pyqtSignal(object)
+    finished = pyqtSignal(object)
+
+
+class RenderWorker(QRunnable):
+    """
+    Runnable rendering the images of a RenderJob taken with WordCloudWrapper.snapshot( ) on the GUI thread, so the
+    settings changed while the worker runs do not leak into the render.  In the progressive mode of the snapshot,
+    a preview is rendered with RenderJob.render_preview( ) and delivered first.
+    The worker does not install the images: the preview and finished signals hand the worker back to the GUI
+    thread, which checks generation against the latest request, so the results of superseded requests are dropped.
+    """
+    def __init__(self, job, generation):
+        """
+        Constructor
+        :param job: The RenderJob to render.
+        :param generation: An integer identifying the request.
+        """
+        super(RenderWorker, self).__init__()
+        # The view keeps the worker until it is finished, so the pool must not delete it.
+        self.setAutoDelete(False)
+        self.job = job
+        self.generation = generation
+        self.cancelled = False
+        self.preview_image = None
+        self.images = None
+        self.error = None
+        self.signals = RenderSignals()
+
+    def cancel(self):
+        """
+        Cancel the render.  A worker that has not started yet skips the render, a running one finishes the stage
+        it is rendering, but its images are not delivered and the final stage is skipped after the preview.
+        :return:
+        """
+        self.cancelled = True
+
+    def run(self):
+        """
+        Render the preview and the images and emit the finished signal, also when the render was cancelled or
+        failed.
+        :return:
+        """
+        try:
+            if not self.cancelled and self.job.progressive and not self.job.is_rendered():
+                self.preview_image = self.job.render_preview()
+                self.signals.preview.emit(self)
+            if not self.cancelled:
+                self.images = self.job.render()
+        except Exception as e:
+            self.error = e
+        self.signals.finished.emit(self)
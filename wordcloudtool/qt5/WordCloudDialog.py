@@ -14,7 +14,8 @@ from PyQt5.QtCore import Qt, QRectF
 from PyQt5.QtGui import QStandardItem, QStandardItemModel, QImage, QPixmap, QBrush, QColor
 
 from wordcloudtool.qt5.GraphicsDisplay import Ui_DialogGraphicsDisplay
-from wordcloudtool.model.WordCloudWrapper import WordCloudWrapper
+from wordcloudtool.qt5.QImageBuffer import to_qimage
+from wordcloudtool.model.WordCloudWrapper import WordCloudWrapper, PREVIEW_STAGE
 
 import os
 
@@ -29,6 +30,7 @@ class WordCloudDialog(QDialog):
         self.__setupGraphicsViews()
         self.setWindowTitle("Word Cloud In a Separate Window")
         self.pmap = None
+        self.skip_preview = True  # only show the final image of a progressive render
 
     def __setupConnections(self):
         self.__setupButtonConnections()
@@ -61,11 +63,12 @@ class WordCloudDialog(QDialog):
 
     def __ImageObserver(self, wrapper):
         print("In __ImageObserver")
+        if self.skip_preview and wrapper.get_stage() == PREVIEW_STAGE:
+            return
         image = wrapper.get_cloud_image()
-        height, width, byteValue = image.shape
-        byteValue = byteValue * width
-        qimage = QImage(image, width, height, byteValue, QImage.Format_RGB888)
-        pmap = QPixmap.fromImage(qimage)
+        pmap = QPixmap.fromImage(to_qimage(image))
+        self.pmap = pmap
+        self.scene.clear()
         self.scene.addPixmap(pmap)
         self.scene.setBackgroundBrush(QBrush(QColor(0, 0, 0)))
         rect = pmap.rect()
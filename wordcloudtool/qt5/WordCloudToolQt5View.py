@@ -9,10 +9,10 @@ GUI class for Qt5 based front end.
 
 from PyQt5 import QtWidgets
 from PyQt5.QtWidgets import QDesktopWidget, QApplication, qApp, QDialog, QFileDialog, QAbstractItemView
-from PyQt5.QtWidgets import QGraphicsScene
+from PyQt5.QtWidgets import QGraphicsScene, QProgressBar, QMessageBox
 from PyQt5.QtCore import pyqtSlot, pyqtSignal, QObject, QModelIndex
 from PyQt5.QtGui import QStandardItem, QStandardItemModel, QImage, QPixmap, QBrush, QColor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThreadPool
 
 from PIL import Image
 from PIL.ImageQt import ImageQt
@@ -20,6 +20,9 @@ from PIL.ImageQt import ImageQt
 from wordcloudtool.qt5.wordcloudtool_main import Ui_MainWindow  # importing our generated file
 from wordcloudtool.qt5.wordcloudtool_about import Ui_DialogAbout
 from wordcloudtool.qt5.GraphicsDisplay import Ui_DialogGraphicsDisplay
+from wordcloudtool.qt5.QImageBuffer import to_qimage
+from wordcloudtool.qt5.RenderWorker import RenderWorker
+from wordcloudtool.qt5.GuiDispatcher import GuiDispatcher
 
 from wordcloudtool.control.StopWordsControl import StopWordsControl
 from wordcloudtool.parser.TextFileParser import TextFileParser
@@ -47,12 +50,14 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         self.__center()
         self.version = VERSION
         self.builddate = BUILDDATE
-        self.word_list = []
+        self.cloud_words = CloudWords(dispatcher=GuiDispatcher())
+        self.snapshot_file = None
         self.__setupConnections()
         self.__setupStopWords()
         self.__setupImageObservers()
         self.__setupGraphicsViews()
         self.__setupDialogs()
+        self.__setupRenderWorkers()
 
     def __setupConnections(self):
         self.__setupMenuConnections()
@@ -66,6 +71,9 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         self.ui.actionExit.triggered.connect(qApp.quit)
         self.ui.actionAbout.triggered.connect(self.__aboutEvent)
         self.ui.actionStart_Over.triggered.connect(self.__startOverEvent)
+        self.ui.actionOpen.triggered.connect(self.__openEvent)
+        self.ui.actionSave.triggered.connect(self.__saveEvent)
+        self.ui.actionSave_As.triggered.connect(self.__saveAsEvent)
 
     def __setupButtonConnections(self):
         self.ui.pushButton_BrowseStopWordsFile.clicked.connect(self.__BrowseStopWordsFile)
@@ -88,12 +96,12 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         stopwords_control.register_observer(self.__observeStopWordsModelChanges)
 
     def __setupLineEditsConnections(self):
-        self.ui.lineEdit_StopWordsFile.textChanged.connect(self.__StopFileChanged)
+        self.ui.lineEdit_StopWordsFile.editingFinished.connect(self.__StopFileChanged)
         self.ui.lineEdit_StopWordsEditorWord.textChanged.connect(self.__StopWordsEditorChanged)
         # From Text File Tab
         self.ui.lineEditTextFile.textChanged.connect(self.__processTextFile)
         # From URL Tab
-        self.ui.lineEdit_WebPageURL.textChanged.connect(self.__processURL)
+        self.ui.lineEdit_WebPageURL.editingFinished.connect(self.__processURL)
         # From PDF Text File Tab
         self.ui.lineEditPDFFile.textChanged.connect(self.__processPDFFile) # TODO - add __processPDFFile
         # From Image File Tab
@@ -113,6 +121,7 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         wrapper = WordCloudWrapper.get_WordCloudWrapper() # obtain Singleton of the wrapper
         wrapper.register_frequency_observer(self.__freqImageObserver)
         wrapper.register_image_observer(self.__cloudImageObserver)
+        wrapper.set_progressive(True)
 
     def __setupGraphicsViews(self):
         self.histogram_scene = QGraphicsScene()
@@ -124,6 +133,18 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         self.wordcloud_dialog = WordCloudDialog()
         self.wordhistogram_dialog = WordHistogramDialog()
 
+    def __setupRenderWorkers(self):
+        # Renders run one at a time, so a queued render superseded by a newer one can be taken back unstarted.
+        self.render_pool = QThreadPool()
+        self.render_pool.setMaxThreadCount(1)
+        self.render_workers = set()
+        self.render_generation = 0
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setMaximumWidth(120)
+        self.busy_indicator.hide()
+        self.statusBar().addPermanentWidget(self.busy_indicator)
+
     def __updateStopWordsModel(self):
         stopwords_control = StopWordsControl.get_StopWordsControl()
         wlist = []
@@ -160,10 +181,8 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         print("In __freqImageObserver")
         self.ui.tabWidget_WordCloud.setCurrentIndex(1)
         image = wrapper.get_frequency_image()
-        height, width, byteValue = image.shape
-        byteValue = byteValue * width
-        qimage = QImage(image, width, height, byteValue, QImage.Format_RGB888)
-        pmap = QPixmap.fromImage(qimage)
+        pmap = QPixmap.fromImage(to_qimage(image))
+        self.histogram_scene.clear()
         self.histogram_scene.addPixmap(pmap)
         self.histogram_scene.setBackgroundBrush(QBrush(QColor(0, 0, 0)))
         self.ui.graphicsView_WordHistogram.fitInView(0, 0, pmap.width(), pmap.height(), Qt.KeepAspectRatio)
@@ -172,10 +191,8 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         print("In __CloudImageObserver")
         self.ui.tabWidget_WordCloud.setCurrentIndex(0)
         image = wrapper.get_cloud_image()
-        height, width, byteValue = image.shape
-        byteValue = byteValue * width
-        qimage = QImage(image, width, height, byteValue, QImage.Format_RGB888)
-        pmap = QPixmap.fromImage(qimage)
+        pmap = QPixmap.fromImage(to_qimage(image))
+        self.cloud_scene.clear()
         self.cloud_scene.addPixmap(pmap)
         self.cloud_scene.setBackgroundBrush(QBrush(QColor(0, 0, 0)))
         self.ui.graphicsViewWordCloud.fitInView(0, 0, pmap.width(), pmap.height(), Qt.KeepAspectRatio)
@@ -190,15 +207,52 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         DialogAbout.show()
         rsp = DialogAbout.exec_()
 
+    @pyqtSlot()
+    def __openEvent(self):
+        filepath = self.__getFileDialog("Select Word Counts File", "Word Counts (*.wcc);;All files (*.*)")
+        if filepath == "":
+            return
+        try:
+            snapshot = CloudWords.load(filepath, use_array=False)
+        except IOError as e:
+            self.statusBar().showMessage('Cannot open {:s}'.format(filepath))
+            QMessageBox.warning(self, "Open Word Counts File", str(e))
+            return
+        self.cloud_words.add_source(filepath, snapshot.get_word_count())
+        self.snapshot_file = filepath
+        self.statusBar().showMessage('Opened {:s}'.format(filepath))
+
+    @pyqtSlot()
+    def __saveEvent(self):
+        if self.snapshot_file is None:
+            self.__saveAsEvent()
+            return
+        self.cloud_words.save(self.snapshot_file)
+        self.statusBar().showMessage('Saved {:s}'.format(self.snapshot_file))
+
+    @pyqtSlot()
+    def __saveAsEvent(self):
+        fname = QFileDialog.getSaveFileName(self, "Save Word Counts File", os.path.curdir,
+                                            "Word Counts (*.wcc);;All files (*.*)")
+        if fname[0] == "":
+            return
+        self.snapshot_file = os.path.abspath(fname[0])
+        self.cloud_words.save(self.snapshot_file)
+        self.statusBar().showMessage('Saved {:s}'.format(self.snapshot_file))
+
     @pyqtSlot()
     def __startOverEvent(self):
         self.statusBar().showMessage('Starting over...')
+        with self.cloud_words.batch():
+            for name in self.cloud_words.get_sources():
+                self.cloud_words.remove_source(name)
 
     @pyqtSlot()
     def __BrowseStopWordsFile(self):
         print("BrowseStopWordsFile button clicked!")
         filepath = self.__getFileDialog("Select StopWords File")
         self.ui.lineEdit_StopWordsFile.setText(filepath)
+        self.__StopFileChanged()
 
     @pyqtSlot()
     def __StopWordsEditorAdd(self):
@@ -252,10 +306,38 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         stopfile_control = StopWordsControl.get_StopWordsControl()
         wrapper = WordCloudWrapper.get_WordCloudWrapper()
         wrapper.set_stopwords(stopfile_control.get_stopwords())
-        cloud_words = CloudWords()
-        cloud_words.add_words(self.word_list)
-        word_count = cloud_words.get_word_count()
-        wrapper.generate_from_count(word_count)
+        sorted_x = wrapper.select_from_cloud_words(self.cloud_words)
+        # Supersede the pending renders: unstarted ones are taken back, the running one is not delivered.
+        for worker in list(self.render_workers):
+            worker.cancel()
+            if self.render_pool.tryTake(worker):
+                self.render_workers.discard(worker)
+        self.render_generation += 1
+        worker = RenderWorker(wrapper.snapshot(sorted_x), self.render_generation)
+        worker.signals.preview.connect(self.__renderPreview, Qt.QueuedConnection)
+        worker.signals.finished.connect(self.__renderFinished, Qt.QueuedConnection)
+        self.render_workers.add(worker)
+        self.busy_indicator.show()
+        self.statusBar().showMessage('Rendering...')
+        self.render_pool.start(worker)
+
+    @pyqtSlot(object)
+    def __renderPreview(self, worker):
+        if worker.cancelled or worker.generation != self.render_generation:
+            return
+        WordCloudWrapper.get_WordCloudWrapper().set_preview_image(worker.preview_image)
+
+    @pyqtSlot(object)
+    def __renderFinished(self, worker):
+        self.render_workers.discard(worker)
+        if worker.cancelled or worker.generation != self.render_generation:
+            return
+        self.busy_indicator.hide()
+        if worker.error is not None:
+            self.statusBar().showMessage(str(worker.error))
+            return
+        self.statusBar().clearMessage()
+        WordCloudWrapper.get_WordCloudWrapper().set_images(worker.images)
 
     @pyqtSlot()
     def __BrowseTextFile(self):
@@ -289,9 +371,13 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         self.__updateStopWordsModel()
 
     @pyqtSlot()
-    def __StopFileChanged(self, text):
+    def __StopFileChanged(self):
+        text = self.ui.lineEdit_StopWordsFile.text()
         stopfile_control = StopWordsControl.get_StopWordsControl()
-        stopfile_control.set_stopfile(text)
+        try:
+            stopfile_control.set_stopfile(text)
+        except ValueError as e:
+            self.statusBar().showMessage(str(e))
 
     # @pyqtSlot()
     # def __StopWordsEditorChanged(self, text):
@@ -316,21 +402,21 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         if filename == "":
             return
         parser = TextFileParser(filename)
-        self.word_list = parser.parse()
+        self.cloud_words.add_source('Text File', parser.parse_counts())
 
     @pyqtSlot()
     def __processURL(self):
         print("Calling __processURL")
         url = self.ui.lineEdit_WebPageURL.text()
         parser = URLParser(url)
-        self.word_list = parser.parse()
+        self.cloud_words.add_source('Web Page', parser.parse_counts())
 
     @pyqtSlot()
     def __processTextEdit(self):
         print("Calling __processTextEdit")
         text = self.ui.textEditPasteText.document().toPlainText()
         parser = TextWidgetParser(text)
-        self.word_list = parser.parse()
+        self.cloud_words.add_source('Pasted Text', parser.parse_counts())
 
     @pyqtSlot()
     def __processPDFFile(self):
@@ -341,13 +427,14 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         type = self.ui.comboBoxPDFFile.currentText()
         if type == "Text":
             parser = PDFTextParser(filename)
-            self.word_list = parser.parse()
-            if len(self.word_list) == 0:
+            word_counts = parser.parse_counts()
+            if len(word_counts) == 0:
                 parser = PDFImageParser(filename)
-                self.word_list = parser.parse()
+                word_counts = parser.parse_counts()
         else:
             parser = PDFImageParser(filename)
-            self.word_list = parser.parse()
+            word_counts = parser.parse_counts()
+        self.cloud_words.add_source('PDF File', word_counts)
 
     @pyqtSlot()
     def __processImageFile(self):
@@ -356,7 +443,7 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         if filename == "":
             return
         # parser = TextFileParser(filename)
-        # self.word_list = parser.parse()
+        # self.word_counts = parser.parse_counts()
 
     @pyqtSlot()
     def __processWordDoc(self):
@@ -365,7 +452,7 @@ class WordCloudToolQt5View(QtWidgets.QMainWindow):
         if filename == "":
             return
         # parser = TextFileParser(filename)
-        # self.word_list = parser.parse()
+        # self.word_counts = parser.parse_counts()
 
 
 if __name__ == '__main__':
@@ -14,7 +14,8 @@ from PyQt5.QtCore import Qt, QRectF
 from PyQt5.QtGui import QStandardItem, QStandardItemModel, QImage, QPixmap, QBrush, QColor
 
 from wordcloudtool.qt5.GraphicsDisplay import Ui_DialogGraphicsDisplay
-from wordcloudtool.model.WordCloudWrapper import WordCloudWrapper
+from wordcloudtool.qt5.QImageBuffer import to_qimage
+from wordcloudtool.model.WordCloudWrapper import WordCloudWrapper, PREVIEW_STAGE
 
 import os
 
@@ -61,11 +62,13 @@ class WordHistogramDialog(QDialog):
 
     def __ImageObserver(self, wrapper):
         print("In __ImageObserver")
+        # A preview only changes the cloud image.
+        if wrapper.get_stage() == PREVIEW_STAGE:
+            return
         image = wrapper.get_frequency_image()
-        height, width, byteValue = image.shape
-        byteValue = byteValue * width
-        qimage = QImage(image, width, height, byteValue, QImage.Format_RGB888)
-        pmap = QPixmap.fromImage(qimage)
+        pmap = QPixmap.fromImage(to_qimage(image))
+        self.pmap = pmap
+        self.scene.clear()
         self.scene.addPixmap(pmap)
         self.scene.setBackgroundBrush(QBrush(QColor(0, 0, 0)))
         rect = pmap.rect()
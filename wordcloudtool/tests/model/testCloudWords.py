@@ -0,0 +1,375 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Specialized test class for CloudWords class.
+"""
+import unittest
+import multiprocessing
+import numpy as np
+import os
+import pickle
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from wordcloudtool.model.ApproximateWordCounts import ApproximateWordCounts
+from wordcloudtool.model.ArrayWordCounts import ArrayWordCounts
+from wordcloudtool.model.CloudWords import CloudWords
+
+
+def _lookup_words(store, words):
+    """
+    Add a word to a store sent to a worker process and look up words in it.
+    :param store: An ArrayWordCounts instance.
+    :param words: A list of words.
+    :return: The list of the counts of the words, None for the words that are not found.
+    """
+    store['added'] = 1
+    return [store.get(word) for word in words]
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Create the model and record the notifications it sends.
+        :return: Nothing...
+        """
+        self.notifications = []
+        self.cloud_words = CloudWords()
+        self.cloud_words.register_observer(self.__observer)
+
+    def __observer(self, cloud_words):
+        self.notifications.append(cloud_words.get_changes())
+
+    def test_AddWords001(self):
+        """
+        Test that add_words counts lowercased words and sends a single notification.
+        """
+        self.cloud_words.add_words(['SQL', 'Python', 'sql'])
+        self.assertEqual(self.cloud_words.get_word_count(), {'sql': 2, 'python': 1}, 'Data mis-compare!')
+        self.assertEqual(len(self.notifications), 1, 'Wrong number of notifications.')
+        self.assertEqual(self.notifications[0].added, {'sql', 'python'}, 'Wrong added words.')
+
+    def test_RemoveWords001(self):
+        """
+        Test that remove_words leaves the model unchanged when a word is missing.
+        """
+        self.cloud_words.add_words(['sql', 'python'])
+        try:
+            self.cloud_words.remove_words(['sql', 'oracle'])
+            self.assertFalse(True, 'Missing word did not trigger ValueError.')
+        except ValueError as e:
+            self.assertEqual(str(e), 'oracle is not in the list.', 'Incorrect error message was detected.')
+        self.assertEqual(self.cloud_words.get_word_count(), {'sql': 1, 'python': 1}, 'Model was changed.')
+        self.assertEqual(len(self.notifications), 1, 'Wrong number of notifications.')
+
+    def test_Batch001(self):
+        """
+        Test that the changes made in a batch are coalesced into one notification with a compact change set.
+        """
+        self.cloud_words.add_words(['sql', 'python', 'oracle'])
+        with self.cloud_words.batch():
+            self.cloud_words.add_word('sql')
+            self.cloud_words.add_words(['tableau', 'hadoop'])
+            self.cloud_words.remove_words(['python', 'hadoop'])
+            self.cloud_words.remove_word('oracle')
+            self.cloud_words.add_word('oracle')
+            self.assertEqual(len(self.notifications), 1, 'Observers were notified inside the batch.')
+        self.assertEqual(len(self.notifications), 2, 'Wrong number of notifications.')
+        changes = self.notifications[1]
+        self.assertEqual(changes.added, {'tableau'}, 'Wrong added words.')
+        self.assertEqual(changes.updated, {'sql', 'oracle'}, 'Wrong updated words.')
+        self.assertEqual(changes.removed, {'python'}, 'Wrong removed words.')
+
+    def test_ArrayWordCounts001(self):
+        """
+        Test that the array backed storage engine keeps the dictionary API of the model.
+        """
+        cloud_words = CloudWords(words=ArrayWordCounts(capacity=2))
+        cloud_words.register_observer(self.__observer)
+        cloud_words.add_words(['SQL', 'Python', 'sql', 'Oracle'])
+        cloud_words.add_counts({'SQL': 2, 'sql': 1, 'Tableau': 5})
+        cloud_words.add_word('python')
+        cloud_words.remove_word('oracle')
+        cloud_words.add_word('hadoop')
+        golden = {'sql': 5, 'python': 2, 'tableau': 5, 'hadoop': 1}
+        self.assertEqual(dict(cloud_words.get_word_count()), golden, 'Data mis-compare!')
+        self.assertEqual(dict(cloud_words.get_word_count().items()), golden, 'Data mis-compare!')
+        self.assertEqual(self.notifications[1].added, {'tableau'}, 'Wrong added words.')
+        self.assertEqual(self.notifications[1].updated, {'sql'}, 'Wrong updated words.')
+
+    def test_ArrayWordCounts002(self):
+        """
+        Test that the array backed storage engine matches a dictionary through large and small batches, removals,
+        reused ids and the compaction of its buffer of words.
+        """
+        rng = random.Random(2)
+        array = ArrayWordCounts(capacity=2)
+        golden = {}
+        for i in range(2000):
+            choice = rng.random()
+            if choice < 0.5:
+                words = ['wörd{:d}'.format(int(rng.paretovariate(0.7))) for _ in range(rng.randrange(200))]
+                array.increment(words)
+                for word in words:
+                    golden[word] = golden.get(word, 0) + 1
+            elif choice < 0.7:
+                pairs = [('wörd{:d}'.format(rng.randrange(3000)), rng.randrange(1, 5)) for _ in range(5)]
+                array.increment_counts(pairs)
+                for word, count in pairs:
+                    golden[word] = golden.get(word, 0) + count
+            elif choice < 0.9 and golden:
+                word = rng.choice(list(golden))
+                del array[word]
+                del golden[word]
+            else:
+                word = 'other{:d}'.format(rng.randrange(100))
+                array[word] = 7
+                golden[word] = 7
+            self.assertEqual(len(array), len(golden), 'Wrong number of words.')
+        self.assertEqual(dict(array.items()), golden, 'Data mis-compare!')
+        self.assertEqual({word: array[word] for word in golden}, golden, 'Data mis-compare!')
+        self.assertNotIn('missing', array, 'Missing word was found.')
+        terms, counts = array.to_arrays()
+        blob = '\n'.join(terms).encode('utf-8')
+        for copy in (ArrayWordCounts.from_arrays(terms, counts.copy()), ArrayWordCounts.from_blob(blob, counts.copy())):
+            self.assertEqual(dict(copy.items()), golden, 'Data mis-compare!')
+            copy.increment(terms[:100] + ['new'])
+            self.assertEqual((copy['new'], copy[terms[0]]), (1, golden[terms[0]] + 1), 'Data mis-compare!')
+
+    def test_ArrayWordCounts003(self):
+        """
+        Test that bulk increments larger than a chunk are merged one chunk at a time, and that a pickled instance
+        finds its words in another interpreter, whose string hashes differ.
+        """
+        words = ['w{:d}'.format(i % 7) for i in range(100)] + ['x{:d}'.format(i) for i in range(50)]
+        golden = {}
+        for word in words:
+            golden[word] = golden.get(word, 0) + 1
+        with mock.patch('wordcloudtool.model.ArrayWordCounts.CHUNK_SIZE', 16):
+            array = ArrayWordCounts()
+            ids, added = array.increment(words)
+            self.assertEqual(sorted(added), sorted(golden), 'Wrong added words.')
+            self.assertEqual(sorted(array.get_terms(ids)), sorted(golden), 'Wrong incremented ids.')
+            ids, added = array.increment_counts([(word, 2) for word in words] + [('new', 1)])
+            self.assertEqual((len(ids), added), (len(golden) + 1, ['new']), 'Wrong incremented ids.')
+        golden = {word: count * 3 for word, count in golden.items()}
+        golden['new'] = 1
+        self.assertEqual(dict(array.items()), golden, 'Data mis-compare!')
+        self.assertNotIn('hashes', array.__getstate__(), 'Hashes were pickled.')
+        copy = pickle.loads(pickle.dumps(array))
+        self.assertEqual({word: copy[word] for word in golden}, golden, 'Data mis-compare!')
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            self.assertEqual(executor.submit(_lookup_words, array, sorted(golden)).result(),
+                             [golden[word] for word in sorted(golden)], 'Data mis-compare!')
+
+    def test_Top001(self):
+        """
+        Test that the incrementally maintained top words match a full sort of the vocabulary.
+        """
+        rng = random.Random(1)
+        for words in (None, ArrayWordCounts()):
+            cloud_words = CloudWords(words=words, top_capacity=8)
+            for i in range(200):
+                choice = rng.random()
+                if choice < 0.5:
+                    cloud_words.add_words(['w{:d}'.format(int(rng.paretovariate(1.0))) for _ in range(20)])
+                elif choice < 0.8:
+                    cloud_words.add_counts({'w{:d}'.format(rng.randrange(50)): rng.randrange(1, 10)})
+                elif choice < 0.95:
+                    cloud_words.add_word('w{:d}'.format(rng.randrange(100)))
+                elif cloud_words.get_word_count():
+                    cloud_words.remove_word(rng.choice(list(cloud_words.get_word_list())))
+                counts = cloud_words.get_word_count()
+                golden = sorted(counts.values(), reverse=True)
+                for k in (1, 5, 8, 12):
+                    top = cloud_words.top(k)
+                    self.assertEqual([count for _, count in top], golden[:k], 'Top counts mis-compare!')
+                    for word, count in top:
+                        self.assertEqual(counts[word], count, 'Top words mis-compare!')
+
+    def test_Sources001(self):
+        """
+        Test that sources can be removed and re-weighted without re-parsing and keep the top words correct.
+        """
+        for words in (None, ArrayWordCounts(dtype=np.float64)):
+            cloud_words = CloudWords(words=words, top_capacity=2)
+            cloud_words.add_source('Text File', {'SQL': 4, 'Python': 2, 'Oracle': 1})
+            cloud_words.add_source('Web Page', {'python': 3, 'Tableau': 1})
+            self.assertEqual(dict(cloud_words.get_word_count()), {'sql': 4, 'python': 5, 'oracle': 1, 'tableau': 1},
+                             'Data mis-compare!')
+            self.assertEqual(cloud_words.top(1), [('python', 5)], 'Top words mis-compare!')
+            cloud_words.set_source_weight('Web Page', 0.5)
+            self.assertEqual(dict(cloud_words.get_word_count()), {'sql': 4, 'python': 3.5, 'oracle': 1, 'tableau': 0.5},
+                             'Data mis-compare!')
+            self.assertEqual(cloud_words.top(1), [('sql', 4)], 'Top words mis-compare!')
+            cloud_words.add_source('Web Page', {'hadoop': 2})
+            cloud_words.remove_source('Text File')
+            self.assertEqual(dict(cloud_words.get_word_count()), {'hadoop': 2}, 'Data mis-compare!')
+            self.assertEqual(cloud_words.get_sources(), ['Web Page'], 'Wrong sources.')
+            try:
+                cloud_words.remove_source('Text File')
+                self.assertFalse(True, 'Missing source did not trigger ValueError.')
+            except ValueError as e:
+                self.assertEqual(str(e), 'Text File is not a source.', 'Incorrect error message was detected.')
+
+    def test_Sources002(self):
+        """
+        Test that fractional weights are not truncated by an integer store and that re-weighting and removing a
+        source leave the counts of the other sources intact.
+        """
+        for words in (None, ArrayWordCounts()):
+            cloud_words = CloudWords(words=words)
+            cloud_words.add_source('a', {'x': 3, 'y': 1})
+            cloud_words.add_source('b', {'x': 1})
+            cloud_words.set_source_weight('a', 0.5)
+            self.assertEqual(dict(cloud_words.get_word_count()), {'x': 2.5, 'y': 0.5}, 'Data mis-compare!')
+            cloud_words.set_source_weight('a', 0)
+            self.assertEqual(dict(cloud_words.get_word_count()), {'x': 1}, 'Data mis-compare!')
+            cloud_words.set_source_weight('a', 1)
+            self.assertEqual(dict(cloud_words.get_word_count()), {'x': 4, 'y': 1}, 'Data mis-compare!')
+            cloud_words.remove_source('a')
+            self.assertEqual(dict(cloud_words.get_word_count()), {'x': 1}, 'Data mis-compare!')
+            cloud_words.add_source('b', {'y': 2}, weight=1.5)
+            self.assertEqual(dict(cloud_words.get_word_count()), {'y': 3}, 'Data mis-compare!')
+
+    def test_ApproximateWordCounts001(self):
+        """
+        Test that the approximate storage engine finds the frequent words of a long stream within its error bounds.
+        """
+        rng = random.Random(1)
+        sketch = ApproximateWordCounts(epsilon=0.001, capacity=20)
+        cloud_words = CloudWords(words=sketch)
+        cloud_words.register_observer(self.__observer)
+        golden = {}
+        for i in range(50):
+            words = ['w{:d}'.format(int(rng.paretovariate(0.8))) for _ in range(1000)]
+            for word in words:
+                golden[word] = golden.get(word, 0) + 1
+            cloud_words.add_words(words)
+        cloud_words.add_word('W1')
+        golden['w1'] += 1
+        total = sum(golden.values())
+        self.assertEqual(sketch.total, total, 'Data mis-compare!')
+        self.assertLessEqual(len(cloud_words.get_word_count()), 20, 'Too many words are tracked.')
+        self.assertEqual(sketch.table.shape, (5, 4096), 'Sketch does not have a fixed size.')
+        for word, count in golden.items():
+            self.assertGreaterEqual(sketch.estimate(word), count, 'Estimate is below the true count.')
+            self.assertLessEqual(sketch.estimate(word), count + sketch.epsilon * total, 'Estimate is out of bounds.')
+            if count > total / sketch.capacity:
+                self.assertIn(word, cloud_words.get_word_count(), 'Frequent word is not tracked.')
+        for word, count in cloud_words.get_word_count().items():
+            self.assertLessEqual(count - golden[word], sketch.error(word), 'Count is out of bounds.')
+        top = [word for word, _ in sorted(golden.items(), key=lambda x: -x[1])[:5]]
+        self.assertEqual([word for word, _ in cloud_words.top(5)], top, 'Top words mis-compare!')
+        self.assertEqual(len(self.notifications), 51, 'Wrong number of notifications.')
+
+    def test_ApproximateWordCounts002(self):
+        """
+        Test that increments larger than a chunk update the sketch as a single chunk would, that the changes are
+        folded across the chunks, and that invalid settings raise ValueError.
+        """
+        rng = random.Random(3)
+        words = ['w{:d}'.format(int(rng.paretovariate(0.8))) for _ in range(5000)]
+        golden = ApproximateWordCounts(capacity=10)
+        golden.increment(words[:100])
+        golden.increment(words)
+        with mock.patch('wordcloudtool.model.ApproximateWordCounts.CHUNK_SIZE', 64):
+            sketch = ApproximateWordCounts(capacity=10)
+            sketch.increment(words[:100])
+            before = set(sketch.tracked)
+            updated, added, evicted = sketch.increment(words)
+        self.assertTrue((sketch.table == golden.table).all(), 'Data mis-compare!')
+        self.assertEqual(sketch.total, golden.total, 'Data mis-compare!')
+        self.assertEqual(set(added), set(sketch.tracked) - before, 'Wrong added words.')
+        self.assertEqual(set(evicted), before - set(sketch.tracked), 'Wrong evicted words.')
+        self.assertTrue(set(updated) <= before & set(sketch.tracked), 'Wrong updated words.')
+        for kwargs, message in (({'epsilon': 0}, 'epsilon must be between 0 and 1.'),
+                                ({'delta': 1}, 'delta must be between 0 and 1.'),
+                                ({'capacity': 0}, 'capacity must be positive.')):
+            try:
+                ApproximateWordCounts(**kwargs)
+                self.assertFalse(True, 'Invalid setting did not trigger ValueError.')
+            except ValueError as e:
+                self.assertEqual(str(e), message, 'Incorrect error message was detected.')
+
+    def test_Snapshot001(self):
+        """
+        Test that a snapshot saved from either storage engine loads back into either storage engine.
+        """
+        snapshot = 'cloud_words.snapshot'
+        array = ArrayWordCounts(dtype=np.float64)
+        array.increment_counts([('sql', 4.5), ('python', 2.0), ('oracle', 1.0), ('héllo', 3.0)])
+        del array['oracle']
+        try:
+            for words in ({'sql': 4, 'python': 2, 'héllo': 3}, array, {}):
+                golden = dict(words)
+                CloudWords(words=words).save(snapshot)
+                for use_array in (True, False):
+                    cloud_words = CloudWords.load(snapshot, use_array=use_array)
+                    self.assertEqual(dict(cloud_words.get_word_count()), golden, 'Data mis-compare!')
+                    self.assertEqual(cloud_words.top(2), sorted(golden.items(), key=lambda x: -x[1])[:2],
+                                     'Top words mis-compare!')
+                cloud_words.add_word('hadoop')
+                self.assertEqual(cloud_words.get_word_count()['hadoop'], 1, 'Loaded model cannot be updated.')
+            with open(snapshot, 'wb') as fd:
+                fd.write(b'sql 4\n')
+            try:
+                CloudWords.load(snapshot)
+                self.assertFalse(True, 'Invalid snapshot did not trigger IOError.')
+            except IOError as e:
+                self.assertEqual(str(e), 'cloud_words.snapshot is not a word counts snapshot.',
+                                 'Incorrect error message was detected.')
+        finally:
+            os.remove(snapshot)
+
+    def test_Debounce001(self):
+        """
+        Test that changes made within the debounce delay are coalesced into one notification.
+        """
+        self.cloud_words.debounce = 0.05
+        for word in ['sql', 'python', 'sql']:
+            self.cloud_words.add_word(word)
+        self.assertEqual(len(self.notifications), 0, 'Observers were notified before the debounce delay.')
+        time.sleep(0.2)
+        self.assertEqual(len(self.notifications), 1, 'Wrong number of notifications.')
+        self.assertEqual(self.notifications[0].added, {'sql', 'python'}, 'Wrong added words.')
+        self.cloud_words.add_word('oracle')
+        self.cloud_words.flush()
+        self.assertEqual(len(self.notifications), 2, 'flush did not notify the observers.')
+
+    def test_Debounce002(self):
+        """
+        Test that debounced notifications are handed to the dispatcher and run on the thread it delivers to.
+        """
+        pending = queue.Queue()
+        threads = []
+        cloud_words = CloudWords(debounce=0.05, dispatcher=pending.put)
+        cloud_words.register_observer(lambda cloud_words: threads.append(threading.current_thread()))
+        cloud_words.add_words(['sql', 'python'])
+        pending.get(timeout=1)()
+        self.assertEqual(threads, [threading.current_thread()], 'Observer was not called on the dispatcher thread.')
+
+    def test_Observers001(self):
+        """
+        Test that no change set is recorded while no observer is registered.
+        """
+        cloud_words = CloudWords()
+        cloud_words.add_words(['sql', 'python'])
+        cloud_words.remove_word('python')
+        observer = []
+        cloud_words.register_observer(lambda cloud_words: observer.append(cloud_words.get_changes()))
+        cloud_words.add_words(['sql', 'oracle'])
+        self.assertEqual(cloud_words.get_word_count(), {'sql': 2, 'oracle': 1}, 'Data mis-compare!')
+        self.assertEqual(observer[0].added, {'oracle'}, 'Wrong added words.')
+        self.assertEqual(observer[0].updated, {'sql'}, 'Wrong updated words.')
+        self.assertEqual(observer[0].removed, set(), 'Changes made without observers were recorded.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Specialized test class for RenderCache class.
+"""
+import unittest
+import numpy as np
+from wordcloudtool.model.RenderCache import RenderCache
+
+
+class MyTestCase(unittest.TestCase):
+    def test_Key001(self):
+        """
+        Test that the key only depends on the frequency table and the settings.
+        """
+        frequencies = [('sql', 4), ('tableau', 3)]
+        key = RenderCache.key(frequencies, (800, 800, 'white'))
+        self.assertEqual(RenderCache.key([('sql', 4.0), ('tableau', np.int64(3))], (800, 800, 'white')), key,
+                         'Equal tables have different keys.')
+        self.assertNotEqual(RenderCache.key(frequencies, (800, 600, 'white')), key, 'Settings were ignored.')
+        self.assertNotEqual(RenderCache.key([('sql', 4), ('tableau', 2)], (800, 800, 'white')), key,
+                            'Counts were ignored.')
+        self.assertNotEqual(RenderCache.key([('sq', 4), ('ltableau', 3)], (800, 800, 'white')), key,
+                            'Words were ignored.')
+
+    def test_Evict001(self):
+        """
+        Test that the least recently used entries are evicted once the images exceed max_bytes.
+        """
+        cache = RenderCache(max_bytes=3000)
+        for key in 'abc':
+            cache.put(key, (np.zeros((10, 10, 3), np.uint8), np.zeros((10, 10, 3), np.uint8)))
+        self.assertEqual(cache.nbytes, 1800, 'Wrong size of cache.')
+        self.assertIsNotNone(cache.get('a'), 'Entry was evicted too early.')
+        self.assertFalse(cache.get('a')[0].flags.writeable, 'Cached image is writeable.')
+        cache.put('d', (np.zeros((10, 50, 3), np.uint8),))
+        self.assertIsNone(cache.get('b'), 'Least recently used entry was not evicted.')
+        self.assertIsNotNone(cache.get('a'), 'Recently used entry was evicted.')
+        self.assertEqual(cache.nbytes, 2700, 'Wrong size of cache.')
+        cache.put('e', (np.zeros((40, 40, 3), np.uint8),))
+        self.assertIsNone(cache.get('e'), 'Image larger than the cache was stored.')
+        self.assertEqual(len(cache), 3, 'Wrong number of entries.')
+        self.assertEqual((cache.hits, cache.misses), (3, 2), 'Wrong hit and miss counters.')
+        cache.clear()
+        self.assertEqual((len(cache), cache.nbytes), (0, 0), 'Cache was not cleared.')
+
+
+if __name__ == '__main__':
+    unittest.main()
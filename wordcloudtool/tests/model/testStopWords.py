@@ -0,0 +1,133 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Specialized test class for StopWords class.
+"""
+import unittest
+import os
+from wordcloudtool.model.StopWords import StopWords, read_stopfile
+from wordcloudtool.model.StopWords import BUILTIN_LAYER, FILE_LAYER, PACKAGE_LAYER, PACKAGE_STOPFILE
+from wordcloudtool.model.StopWords import MAX_STOPFILES, STOPFILES
+from wordcloudtool.parser.ParserBase import get_default_stopwords
+from wordcloudtool.parser.TextWidgetParser import TextWidgetParser
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Create the model and record the notifications it sends.
+        :return: Nothing...
+        """
+        self.notifications = []
+        self.stopwords = StopWords()
+        self.stopwords.register_observer(self.__observer)
+
+    def __observer(self, stopwords):
+        self.notifications.append(stopwords.get_version())
+
+    def test_Update001(self):
+        """
+        Test that bulk updates are normalized, notify once and bump the version only when the words change.
+        """
+        version = self.stopwords.get_version()
+        self.stopwords.update([' SQL', 'Tableau\n', 'the'])
+        self.assertIn('sql', self.stopwords.get_stopwords(), 'Stop word was not normalized.')
+        self.assertIn('tableau', self.stopwords.get_stopwords(), 'Stop word was not normalized.')
+        self.assertIsInstance(self.stopwords.get_stopwords(), frozenset, 'Stop words are not a snapshot.')
+        self.assertEqual(len(self.notifications), 1, 'Wrong number of notifications.')
+        self.assertGreater(self.stopwords.get_version(), version, 'Version was not bumped.')
+        self.stopwords.update(['sql'])
+        self.stopwords.difference_update(['oracle'])
+        self.assertEqual(len(self.notifications), 1, 'Observers were notified without a change.')
+        self.stopwords.difference_update(['SQL', 'tableau'])
+        self.assertNotIn('sql', self.stopwords.get_stopwords(), 'Stop word was not removed.')
+        self.assertEqual(self.notifications, sorted(set(self.notifications)), 'Versions are not increasing.')
+
+    def test_DelStopwords001(self):
+        """
+        Test that del_stopwords removes exactly the words given and leaves the model unchanged on a missing word.
+        """
+        before = self.stopwords.get_stopwords()
+        self.stopwords.del_stopwords(['The', 'and'])
+        self.assertEqual(before - self.stopwords.get_stopwords(), {'the', 'and'}, 'Wrong words were removed.')
+        try:
+            self.stopwords.del_stopwords(['of', 'oracle'])
+            self.assertFalse(True, 'Missing word did not trigger ValueError.')
+        except ValueError as e:
+            self.assertEqual(str(e), 'oracle is not in the list.', 'Incorrect error message was detected.')
+        self.assertIn('of', self.stopwords.get_stopwords(), 'Model was changed.')
+        self.assertEqual(len(self.notifications), 1, 'Wrong number of notifications.')
+
+    def test_Layers001(self):
+        """
+        Test that stop files are layered on top of the built-in and packaged stop words and that edits apply on top
+        of the layers.
+        """
+        stop_file = 'stop_file.txt'
+        with open(stop_file, 'w') as fd:
+            fd.write('SQL\nTableau\n\nthe\n')
+        try:
+            defaults = self.stopwords.get_stopwords()
+            self.assertTrue(get_default_stopwords() <= defaults, 'Packaged stop words were not installed.')
+            self.stopwords.set_stopfile(stop_file)
+            self.assertEqual(self.stopwords.get_layers(), [BUILTIN_LAYER, PACKAGE_LAYER, FILE_LAYER], 'Wrong layers.')
+            self.assertEqual(self.stopwords.get_stopwords(), defaults | {'sql', 'tableau'}, 'Data mis-compare!')
+            self.stopwords.del_stopword('the')
+            self.stopwords.add_stopword('Oracle')
+            self.stopwords.reload_stopfiles()
+            self.assertNotIn('the', self.stopwords.get_stopwords(), 'Edits were not applied on top of the layers.')
+            self.assertIn('oracle', self.stopwords.get_stopwords(), 'Edits were not applied on top of the layers.')
+            self.stopwords.remove_layer(BUILTIN_LAYER)
+            self.assertIn('i', self.stopwords.get_stopwords(), 'Words of the remaining layers were removed.')
+            self.stopwords.remove_layer(PACKAGE_LAYER)
+            self.assertNotIn('i', self.stopwords.get_stopwords(), 'Words of the removed layers were kept.')
+            self.assertEqual(self.stopwords.get_stopwords(), {'sql', 'tableau', 'oracle'}, 'Data mis-compare!')
+            self.stopwords.set_layer(BUILTIN_LAYER, defaults)
+            words = read_stopfile(stop_file)
+            self.assertIs(read_stopfile(stop_file), words, 'Unchanged stop file was read again.')
+            version = self.stopwords.get_version()
+            self.stopwords.set_stopfile(stop_file)
+            self.assertEqual(self.stopwords.get_version(), version, 'Unchanged stop file bumped the version.')
+            self.stopwords.set_stopfile('')
+            self.assertEqual(self.stopwords.get_layers(), [BUILTIN_LAYER], 'Wrong layers.')
+            self.assertEqual(self.stopwords.get_stopwords(), (defaults | {'oracle'}) - {'the'}, 'Data mis-compare!')
+        finally:
+            os.remove(stop_file)
+
+    def test_ReadStopfile001(self):
+        """
+        Test that the parsers share the packaged stop words read for the model and that the cache of stop files
+        keeps only the most recently read files.
+        """
+        self.assertIs(get_default_stopwords(), self.stopwords.layers[PACKAGE_LAYER],
+                      'Packaged stop words were read again.')
+        stop_files = ['stop_file{:d}.txt'.format(i) for i in range(MAX_STOPFILES + 1)]
+        try:
+            for stop_file in stop_files:
+                with open(stop_file, 'w') as fd:
+                    fd.write('SQL\n')
+                read_stopfile(stop_file)
+            self.assertEqual(len(STOPFILES), MAX_STOPFILES, 'Cache of stop files is not bounded.')
+            self.assertNotIn(os.path.abspath(PACKAGE_STOPFILE), STOPFILES, 'Least recently used file was kept.')
+            self.assertIn(os.path.abspath(stop_files[-1]), STOPFILES, 'Most recently used file was evicted.')
+        finally:
+            for stop_file in stop_files:
+                os.remove(stop_file)
+
+    def test_Prune001(self):
+        """
+        Test that a parser using the model picks up changes by comparing versions.
+        """
+        parser = TextWidgetParser('Research and develop BI models')
+        parser.stopwords = self.stopwords
+        self.assertEqual(parser.prune(parser.parse()), ['Research', 'develop', 'BI', 'models'], 'Data mis-compare!')
+        self.assertIs(parser.get_normalized_stopwords(), self.stopwords.get_stopwords(), 'Stop words were copied.')
+        self.stopwords.add_stopwords(['BI', 'Models'])
+        self.assertEqual(parser.prune(parser.parse()), ['Research', 'develop'], 'New stop words were not applied.')
+
+
+if __name__ == '__main__':
+    unittest.main()
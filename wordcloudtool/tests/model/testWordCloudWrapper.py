@@ -0,0 +1,188 @@
+"""
+@package wordcloudtool.model
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Specialized test class for WordCloudWrapper class.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from wordcloudtool.model.HistogramRenderer import AGG_BACKEND, PIL_BACKEND, PYPLOT_BACKEND, render_histogram
+from wordcloudtool.model.WordCloudWrapper import WordCloudWrapper, FINAL_STAGE, PREVIEW_STAGE, PREVIEW_MAX_SIZE
+
+
+class MyTestCase(unittest.TestCase):
+    count = {'SQL': 4, 'Tableau': 3, 'Experience': 4, 'Python': 2, 'Oracle': 2, 'and': 9, 'BI': 3}
+
+    def setUp(self):
+        """
+        Run the test from an empty directory so any file written by the wrapper is detected.
+        :return: Nothing...
+        """
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.chdir(self.directory)
+        self.wrapper = WordCloudWrapper()
+        self.wrapper.set_width(200)
+        self.wrapper.set_heigth(100)
+
+    def tearDown(self):
+        """
+        Destroy the directory created for the test.
+        :return: Nothing...
+        """
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def test_Generate001(self):
+        """
+        Test that the cloud and frequency images are generated as RGB arrays without writing any file.
+        """
+        notifications = []
+        self.wrapper.register_image_observer(lambda wrapper: notifications.append('image'))
+        self.wrapper.register_frequency_observer(lambda wrapper: notifications.append('frequency'))
+        self.wrapper.generate_from_count(self.count)
+        self.assertEqual(os.listdir(self.directory), [], 'Files were written.')
+        self.assertEqual(notifications, ['image', 'frequency'], 'Observers were not notified.')
+        cloud = self.wrapper.get_cloud_image()
+        self.assertEqual(cloud.shape, (100, 200, 3), 'Wrong shape of cloud image.')
+        self.assertEqual(cloud.dtype, np.uint8, 'Wrong type of cloud image.')
+        self.assertTrue(cloud.flags['C_CONTIGUOUS'], 'Cloud image is not contiguous.')
+        self.assertTrue((cloud[0, 0] == 255).all(), 'Background is not white.')
+        freq = self.wrapper.get_frequency_image()
+        self.assertEqual(freq.ndim, 3, 'Wrong shape of frequency image.')
+        self.assertEqual(freq.shape[2], 3, 'Frequency image is not RGB.')
+        self.assertTrue(freq.flags['C_CONTIGUOUS'], 'Frequency image is not contiguous.')
+
+    def test_Export001(self):
+        """
+        Test that the images are only written to disk when exported.
+        """
+        try:
+            self.wrapper.export_cloud_image('cloud.png')
+            self.assertFalse(True, 'Missing image did not trigger ValueError.')
+        except ValueError as e:
+            self.assertEqual(str(e), 'No image has been generated.', 'Incorrect error message was detected.')
+        self.wrapper.generate_from_count(self.count)
+        self.wrapper.export_cloud_image('cloud.png')
+        self.wrapper.export_frequency_image('histogram.png')
+        self.assertEqual(sorted(os.listdir(self.directory)), ['cloud.png', 'histogram.png'], 'Wrong files written.')
+        with Image.open('cloud.png') as image:
+            self.assertTrue((np.asarray(image.convert('RGB')) == self.wrapper.get_cloud_image()).all(),
+                            'Data mis-compare!')
+
+    def test_Cache001(self):
+        """
+        Test that rendering the same frequency table with the same settings returns the cached images.
+        """
+        cache = self.wrapper.get_render_cache()
+        self.wrapper.generate_from_count(self.count)
+        cloud = self.wrapper.get_cloud_image()
+        self.wrapper.generate_from_count(dict(self.count))
+        self.assertIs(self.wrapper.get_cloud_image(), cloud, 'Cloud was rendered again.')
+        self.assertEqual((cache.hits, cache.misses), (1, 1), 'Wrong hit and miss counters.')
+        self.wrapper.set_width(150)
+        self.wrapper.generate_from_count(self.count)
+        self.assertEqual(self.wrapper.get_cloud_image().shape, (100, 150, 3), 'Stale cloud was returned.')
+        self.wrapper.get_stopwords().add_stopword('foo')
+        self.wrapper.generate_from_count(self.count)
+        self.wrapper.generate_from_count(dict(self.count, SQL=5))
+        self.assertEqual((cache.hits, cache.misses), (1, 4), 'Wrong hit and miss counters.')
+        self.assertEqual(len(cache), 4, 'Wrong number of entries.')
+
+    def test_Render001(self):
+        """
+        Test that render leaves the wrapper unchanged, can run on several threads at once and that set_images
+        installs the images and notifies the observers.
+        """
+        notifications = []
+        self.wrapper.register_image_observer(lambda wrapper: notifications.append('image'))
+        self.wrapper.get_render_cache().enabled = False
+        sorted_x = self.wrapper.select_from_count(self.count)
+        self.assertEqual(sorted_x[:2], [('SQL', 4), ('Experience', 4)], 'Data mis-compare!')
+        self.assertNotIn('and', dict(sorted_x), 'Stop words were not removed.')
+        with ThreadPoolExecutor(3) as executor:
+            results = list(executor.map(self.wrapper.render, [sorted_x] * 3))
+        self.assertIsNone(self.wrapper.get_cloud_image(), 'Render changed the wrapper.')
+        self.assertEqual(notifications, [], 'Render notified the observers.')
+        for cloud, freq in results:
+            self.assertEqual(cloud.shape, (100, 200, 3), 'Wrong shape of cloud image.')
+        self.wrapper.set_images(results[0])
+        self.assertIs(self.wrapper.get_cloud_image(), results[0][0], 'Images were not installed.')
+        self.assertEqual(notifications, ['image'], 'Observers were not notified.')
+
+    def test_Snapshot001(self):
+        """
+        Test that settings changed after a snapshot change neither the images of the job nor their cache key.
+        """
+        sorted_x = self.wrapper.select_from_count(self.count)
+        job = self.wrapper.snapshot(sorted_x)
+        self.wrapper.set_width(150)
+        self.wrapper.set_freq_size(2)
+        cloud, freq = job.render()
+        self.assertEqual(cloud.shape, (100, 200, 3), 'Settings leaked into the job.')
+        self.wrapper.set_width(200)
+        self.wrapper.set_freq_size(job.freq_size)
+        self.assertTrue(self.wrapper.is_rendered(sorted_x), 'Images were cached under the wrong key.')
+        self.assertIs(self.wrapper.render(sorted_x)[0], cloud, 'Data mis-compare!')
+
+    def test_Progressive001(self):
+        """
+        Test that the progressive mode sends a reduced preview to the image observers before the final image, and
+        that cached images are sent without a preview.
+        """
+        notifications = []
+        self.wrapper.register_image_observer(
+            lambda wrapper: notifications.append((wrapper.get_stage(), wrapper.get_cloud_image().shape)))
+        self.wrapper.register_frequency_observer(lambda wrapper: notifications.append(wrapper.get_stage()))
+        self.wrapper.set_progressive(True)
+        self.wrapper.preview_words = 3
+        self.wrapper.generate_from_count(self.count)
+        self.assertEqual(notifications, [(PREVIEW_STAGE, (25, 50, 3)), (FINAL_STAGE, (100, 200, 3)), FINAL_STAGE],
+                         'Wrong notifications.')
+        preview = self.wrapper.render_preview(self.wrapper.select_from_count(self.count))
+        self.assertEqual(preview.shape, (25, 50, 3), 'Wrong shape of preview.')
+        self.wrapper.set_width(8000)
+        self.wrapper.set_heigth(4000)
+        preview = self.wrapper.render_preview(self.wrapper.select_from_count(self.count))
+        self.assertEqual(preview.shape, (PREVIEW_MAX_SIZE // 2, PREVIEW_MAX_SIZE, 3), 'Preview of large canvas was not capped.')
+        self.wrapper.set_width(200)
+        self.wrapper.set_heigth(100)
+        del notifications[:]
+        self.wrapper.generate_from_count(self.count)
+        self.assertEqual(notifications, [(FINAL_STAGE, (100, 200, 3)), FINAL_STAGE], 'Cached images were previewed.')
+
+    def test_Histogram001(self):
+        """
+        Test that every histogram backend renders an RGB image and that the backends are safe to call from threads.
+        """
+        words = ['sql', 'experience', 'tableau', 'bi', 'python']
+        counts = [4, 4, 3, 3, 2]
+        for backend in (AGG_BACKEND, PIL_BACKEND, PYPLOT_BACKEND):
+            self.wrapper.set_histogram_backend(backend)
+            self.wrapper.generate_from_count(self.count)
+            freq = self.wrapper.get_frequency_image()
+            self.assertEqual(freq.shape, (480, 640, 3), 'Wrong shape of frequency image.')
+            self.assertTrue((freq != 255).any(), 'Nothing was drawn.')
+            golden = render_histogram(words, counts, backend)
+            with ThreadPoolExecutor(4) as executor:
+                images = list(executor.map(lambda i: render_histogram(words, counts, backend), range(8)))
+            for image in images:
+                self.assertTrue((image == golden).all(), 'Data mis-compare!')
+        try:
+            self.wrapper.set_histogram_backend('svg')
+            self.assertFalse(True, 'Unknown backend did not trigger ValueError.')
+        except ValueError as e:
+            self.assertEqual(str(e), 'svg is not a histogram backend.', 'Incorrect error message was detected.')
+        self.assertEqual(self.wrapper.get_histogram_backend(), PYPLOT_BACKEND, 'Backend was changed.')
+        self.assertEqual(os.listdir(self.directory), [], 'Files were written.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+@package wordcloudtool.tests.parser
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Fixtures shared by the parser test modules.  A test module runs its tests against an empty, temporary
+ExtractionCache with:
+    from wordcloudtool.tests.parser import setUpModule, tearDownModule
+"""
+import shutil
+import tempfile
+from wordcloudtool.parser.ExtractionCache import ExtractionCache
+
+# ExtractionCache replaced for the tests of a module.
+CACHE = {}
+
+
+def setUpModule():
+    """
+    Point the ExtractionCache at a temporary directory so the tests neither read nor fill the user cache.
+    :return: Nothing...
+    """
+    CACHE['inst'] = ExtractionCache.inst
+    ExtractionCache.inst = ExtractionCache(tempfile.mkdtemp())
+
+
+def tearDownModule():
+    """
+    Destroy the temporary cache directory and restore the ExtractionCache.
+    :return: Nothing...
+    """
+    shutil.rmtree(ExtractionCache.inst.directory)
+    ExtractionCache.inst = CACHE.pop('inst')
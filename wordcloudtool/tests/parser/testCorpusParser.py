@@ -0,0 +1,95 @@
+"""
+@package wordcloudtool.parser
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Specialized test class for CorpusParser class.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+from collections import Counter
+from wordcloudtool.model.CloudWords import CloudWords
+from wordcloudtool.parser.CorpusParser import CorpusParser, _count_files, _merge_counts
+from wordcloudtool.parser.ExtractionCache import ExtractionCache
+from wordcloudtool.parser.TextFileParser import TextFileParser
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a directory tree of text files and an empty extraction cache.
+        :return: Nothing...
+        """
+        self.directory = tempfile.mkdtemp()
+        self.saved_inst = ExtractionCache.inst
+        ExtractionCache.inst = ExtractionCache(os.path.join(self.directory, 'cache'))
+        self.corpus = os.path.join(self.directory, 'corpus')
+        self.filenames = []
+        for i in range(11):
+            path = os.path.join(self.corpus, 'part{:d}'.format(i % 3))
+            os.makedirs(path, exist_ok=True)
+            filename = os.path.join(path, 'doc{:d}.txt'.format(i))
+            with open(filename, 'w') as fd:
+                fd.write('Research and develop BI models\n' * (i + 1) + 'word{:d} Tableau\n'.format(i))
+            self.filenames.append(filename)
+        with open(os.path.join(self.corpus, 'notes.xyz'), 'w') as fd:
+            fd.write('Ignored because of its extension\n')
+        self.bin_file = os.path.join(self.corpus, 'binary.txt')
+        with open(self.bin_file, 'wb') as fd:
+            fd.write(bytes(range(256)) * 16)
+
+    def tearDown(self):
+        """
+        Destroy the files created for the test.
+        :return: Nothing...
+        """
+        ExtractionCache.inst = self.saved_inst
+        shutil.rmtree(self.directory)
+
+    def test_CountFiles001(self):
+        """
+        Test that the counts of a directory tree merged across the process pool match the counts of each file.
+        """
+        golden = Counter()
+        for filename in self.filenames:
+            golden.update(TextFileParser(filename).parse_counts())
+        for processes in (1, 3):
+            corpus = CorpusParser(self.corpus, processes=processes, files_per_task=2)
+            self.assertEqual(len(corpus.get_filenames()), 12, 'Wrong files were found.')
+            self.assertEqual(corpus.count_files(), golden, 'Data mis-compare!')
+            self.assertEqual(list(corpus.errors.keys()), [self.bin_file], 'Failing file was not recorded.')
+        cloud_words = CloudWords()
+        CorpusParser([self.filenames[0], self.filenames[1]], processes=2).add_to(cloud_words, 'Corpus')
+        self.assertEqual(cloud_words.get_word_count()['research'], 3, 'Data mis-compare!')
+        self.assertEqual(cloud_words.get_sources(), ['Corpus'], 'Wrong sources.')
+
+    def test_CountFiles002(self):
+        """
+        Test that a task sends back a single Counter for its files and that partial Counters merge exactly.
+        """
+        counts, errors = _count_files(self.filenames[:3] + [self.bin_file])
+        golden = Counter()
+        for filename in self.filenames[:3]:
+            golden.update(TextFileParser(filename).parse_counts())
+        self.assertEqual(counts, golden, 'Data mis-compare!')
+        self.assertEqual(list(errors.keys()), [self.bin_file], 'Failing file was not recorded.')
+        other, _ = _count_files(self.filenames[3:])
+        merged, errors = _merge_counts(Counter(other), Counter(counts))
+        self.assertEqual((merged, errors), (golden + other, {}), 'Data mis-compare!')
+
+    def test_Constructor001(self):
+        """
+        Test that a path that does not exist raises IOError.
+        """
+        try:
+            CorpusParser(['foo'])
+            self.assertFalse(True, 'Non-existent path did not trigger IOError.')
+        except IOError as e:
+            self.assertEqual(str(e), 'foo does not exist!', 'IOException not raised properly.')
+
+
+if __name__ == '__main__':
+    unittest.main()
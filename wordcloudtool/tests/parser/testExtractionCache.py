@@ -0,0 +1,104 @@
+"""
+@package wordcloudtool.parser
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Specialized test class for ExtractionCache class.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+from wordcloudtool.parser.ExtractionCache import ExtractionCache
+from wordcloudtool.parser.TextFileParser import TextFileParser
+
+
+class MyTestCase(unittest.TestCase):
+    text_file = 'cache_file.txt'  # Text file name to use as test input file
+
+    def setUp(self):
+        """
+        Create the input file and an empty cache directory for each test.
+        :return: Nothing...
+        """
+        with open(self.text_file, 'w') as fd:
+            fd.write('The quick brown fox jumps over the lazy dog\n')
+        self.directory = tempfile.mkdtemp()
+        self.saved_inst = ExtractionCache.inst
+        ExtractionCache.inst = ExtractionCache(self.directory)
+
+    def tearDown(self):
+        """
+        Destroy the input file and the cache directory created for each test.
+        :return: Nothing...
+        """
+        ExtractionCache.inst = self.saved_inst
+        shutil.rmtree(self.directory)
+        os.remove(self.text_file)
+
+    def test_Parse001(self):
+        """
+        Test that a second parse of an unchanged file is served from the cache.
+        """
+        golden = ['The', 'quick', 'brown', 'fox', 'jumps', 'over', 'the', 'lazy', 'dog']
+        self.assertEqual(TextFileParser(self.text_file).parse(), golden, 'Data mis-compare!')
+        self.assertEqual(len(os.listdir(self.directory)), 1, 'Words were not cached.')
+        tfp = TextFileParser(self.text_file)
+        key = ExtractionCache.get_ExtractionCache().key(tfp, 'words')
+        ExtractionCache.get_ExtractionCache().put(key, ['cached'])
+        self.assertEqual(tfp.parse(), ['cached'], 'Words were not served from the cache.')
+        tfp.use_cache = False
+        self.assertEqual(tfp.parse(), golden, 'use_cache did not bypass the cache.')
+
+    def test_Parse002(self):
+        """
+        Test that changing the tokenizer settings misses the cache.
+        """
+        tfp = TextFileParser(self.text_file)
+        tfp.parse()
+        tfp.regexp = r"[a-z]{4,}"
+        self.assertEqual(tfp.parse(), ['quick', 'brown', 'jumps', 'over', 'lazy'], 'Data mis-compare!')
+
+    def test_Parse003(self):
+        """
+        Test that changing the settings of a derived parser misses the cache.
+        """
+        cache = ExtractionCache.get_ExtractionCache()
+        tfp = TextFileParser(self.text_file)
+        cache.put(cache.key(tfp, 'words'), ['cached'])
+        self.assertEqual(tfp.parse(), ['cached'], 'Words were not served from the cache.')
+        tfp = TextFileParser(self.text_file, use_mmap=True)
+        self.assertEqual(tfp.parse()[:2], ['The', 'quick'], 'Cached words of the line mode were served.')
+        tfp.min_word_length = 4
+        self.assertNotEqual(cache.key(tfp, 'words'), cache.key(TextFileParser(self.text_file, use_mmap=True), 'words'),
+                            'Settings were ignored.')
+
+    def test_Parse004(self):
+        """
+        Test that the words of a file larger than MAX_CACHED_WORDS_SIZE are not cached, but its counts are.
+        """
+        with mock.patch('wordcloudtool.parser.FileParser.MAX_CACHED_WORDS_SIZE', 16):
+            tfp = TextFileParser(self.text_file)
+            self.assertEqual(len(tfp.parse()), 9, 'Data mis-compare!')
+            self.assertEqual(os.listdir(self.directory), [], 'Words of a large file were cached.')
+            self.assertEqual(tfp.parse_counts()['the'], 2, 'Data mis-compare!')
+            self.assertEqual(len(os.listdir(self.directory)), 1, 'Counts were not cached.')
+
+    def test_Evict001(self):
+        """
+        Test that the least recently used entries are evicted beyond max_bytes.
+        """
+        cache = ExtractionCache(self.directory, max_bytes=2500)
+        cache.put('a', 'x' * 1000)
+        cache.put('b', 'x' * 1000)
+        os.utime(os.path.join(self.directory, 'a'), (1, 1))
+        os.utime(os.path.join(self.directory, 'b'), (2, 2))
+        cache.put('c', 'x' * 1000)
+        self.assertIsNone(cache.get('a'), 'Least recently used entry was not evicted.')
+        self.assertEqual(cache.get('c'), 'x' * 1000, 'Most recently used entry was evicted.')
+
+
+if __name__ == '__main__':
+    unittest.main()
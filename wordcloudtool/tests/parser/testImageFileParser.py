@@ -9,6 +9,7 @@ Specialized test class for ImageFileParser class.
 import unittest
 import os
 from wordcloudtool.parser.ImageFileParser import ImageFileParser
+from wordcloudtool.tests.parser import setUpModule, tearDownModule
 
 
 class MyTestCase(unittest.TestCase):
@@ -8,7 +8,13 @@ Specialized test class for PDFImageParser class.
 """
 import unittest
 import os
+import subprocess
+import time
+from unittest import mock
+import PyPDF2
 from wordcloudtool.parser.PDFImageParser import PDFImageParser
+from wordcloudtool.parser.ExtractionCache import ExtractionCache
+from wordcloudtool.tests.parser import setUpModule, tearDownModule
 
 
 class MyTestCase(unittest.TestCase):
@@ -397,5 +403,63 @@ Desired Skills:
         os.remove(os.path.abspath(filename))
 
 
+class PoolTestCase(unittest.TestCase):
+    """
+    Tests of the page pool with pdftoppm and tesseract replaced by a fake subprocess.run( ).
+    """
+    pdf_file = 'blank_file.pdf'  # PDF file name of blank pages to use as test input file
+    num_pages = 6
+
+    def setUp(self):
+        """
+        Create a PDF file of blank pages.
+        :return: Nothing...
+        """
+        writer = PyPDF2.PdfFileWriter()
+        for i in range(self.num_pages):
+            writer.addBlankPage(72, 72)
+        with open(self.pdf_file, 'wb') as fd:
+            writer.write(fd)
+        self.envs = []
+
+    def tearDown(self):
+        os.remove(self.pdf_file)
+
+    def __run(self, args, check=True, timeout=None, stdout=None, stderr=None, env=None):
+        """
+        Fake subprocess.run( ): pdftoppm writes an empty image, tesseract returns the page number after a delay
+        that makes the later pages complete first, and times out on page 2.
+        """
+        if args[0] == 'pdftoppm':
+            open(args[-1] + '.png', 'w').close()
+            return subprocess.CompletedProcess(args, 0)
+        page = int(os.path.basename(args[1])[4:-4])
+        self.envs.append(env)
+        if page == 2:
+            raise subprocess.TimeoutExpired(args, timeout)
+        time.sleep((self.num_pages - page) * 0.02)
+        return subprocess.CompletedProcess(args, 0, stdout='page{:d}'.format(page).encode('ascii'))
+
+    def test_Pages001(self):
+        """
+        Test that the pages are returned in page order and that a timed out page is reported.
+        """
+        with mock.patch('subprocess.run', self.__run):
+            tfp = PDFImageParser(self.pdf_file, workers=3, page_timeout=5)
+            tfp.use_cache = False
+            completed = [page for page, text in tfp.iter_pages()]
+            self.assertNotEqual(completed, sorted(completed), 'Pages did not run concurrently.')
+            self.assertEqual(list(tfp.iter_text()), ['page0', 'page1', '', 'page3', 'page4', 'page5'],
+                             'Data mis-compare!')
+        self.assertEqual(tfp.timed_out_pages, [2], 'Timed out page was not reported.')
+        with mock.patch('subprocess.run', self.__run), mock.patch.dict(os.environ, TESSDATA_PREFIX='/tessdata'):
+            tfp.use_cache = True
+            self.assertEqual(tfp.parse(), ['page0', 'page1', 'page3', 'page4', 'page5'], 'Data mis-compare!')
+        self.assertEqual(os.listdir(ExtractionCache.get_ExtractionCache().directory), [],
+                         'Words missing a timed out page were cached.')
+        self.assertTrue(all(env['OMP_THREAD_LIMIT'] == '1' for env in self.envs), 'tesseract was not limited.')
+        self.assertEqual(self.envs[-1].get('TESSDATA_PREFIX'), '/tessdata', 'Environment was not refreshed.')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,9 @@ Specialized test class for PDFTextParser class.
 """
 import unittest
 import os
+from unittest import mock
 from wordcloudtool.parser.PDFTextParser import PDFTextParser
+from wordcloudtool.tests.parser import setUpModule, tearDownModule
 
 
 class MyTestCase(unittest.TestCase):
@@ -388,5 +390,76 @@ Desired Skills:
         os.remove(os.path.abspath(filename))
 
 
+class PoolTestCase(unittest.TestCase):
+    """
+    Tests of the process pool extracting the pages, on a PDF file written by the test.
+    """
+    pdf_file = 'pages_file.pdf'  # PDF file name of text pages to use as test input file
+    num_pages = 5
+
+    def setUp(self):
+        """
+        Create a PDF file with a few lines of text on each page.
+        :return: Nothing...
+        """
+        pages = [['page{:d} Python SQL'.format(i), 'Tableau Python' if i % 2 else 'Oracle']
+                 for i in range(self.num_pages)]
+        self.__writePDFFile(self.pdf_file, pages)
+
+    def tearDown(self):
+        os.remove(self.pdf_file)
+
+    @classmethod
+    def __writePDFFile(cls, filename, pages):
+        """
+        Write a PDF file drawing lines of text in Helvetica, one list of lines per page.
+        :param filename: Filename of the PDF file to create.
+        :param pages: A list holding the list of lines of each page.
+        :return:
+        """
+        kids = ' '.join('{:d} 0 R'.format(4 + 2 * i) for i in range(len(pages)))
+        objects = [b'<< /Type /Catalog /Pages 2 0 R >>',
+                   '<< /Type /Pages /Kids [{:s}] /Count {:d} >>'.format(kids, len(pages)).encode('ascii'),
+                   b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+        for i, lines in enumerate(pages):
+            text = ' T* '.join('({:s}) Tj'.format(line) for line in lines)
+            stream = 'BT /F1 12 Tf 14 TL 72 720 Td {:s} ET'.format(text).encode('ascii')
+            objects.append('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {:d} 0 R '
+                           '/Resources << /Font << /F1 3 0 R >> >> >>'.format(5 + 2 * i).encode('ascii'))
+            objects.append(b'<< /Length ' + str(len(stream)).encode('ascii') + b' >>\nstream\n' + stream +
+                           b'\nendstream')
+        data = b'%PDF-1.4\n'
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(data))
+            data += str(number).encode('ascii') + b' 0 obj\n' + body + b'\nendobj\n'
+        xref = len(data)
+        data += 'xref\n0 {:d}\n0000000000 65535 f \n'.format(len(objects) + 1).encode('ascii')
+        data += b''.join('{:010d} 00000 n \n'.format(offset).encode('ascii') for offset in offsets)
+        data += 'trailer\n<< /Size {:d} /Root 1 0 R >>\nstartxref\n{:d}\n%%EOF\n'.format(
+            len(objects) + 1, xref).encode('ascii')
+        with open(filename, 'wb') as fd:
+            fd.write(data)
+
+    def test_Parse001(self):
+        """
+        Test that extracting the pages in a process pool returns the words and counts of the serial extraction,
+        in page order, when the pages are split across several tasks.
+        """
+        serial = PDFTextParser(self.pdf_file)
+        serial.use_cache = False
+        golden = serial.parse()
+        self.assertEqual(golden[:5], ['page0', 'Python', 'SQL', 'Oracle', 'page1'], 'Data mis-compare!')
+        with mock.patch('wordcloudtool.parser.PDFTextParser.PAGES_PER_TASK', 2):
+            tfp = PDFTextParser(self.pdf_file, processes=2)
+            tfp.use_cache = False
+            self.assertEqual(tfp.parse(), golden, 'Data mis-compare!')
+            counts = tfp.count_pages()
+            self.assertEqual(len(counts), self.num_pages, 'Wrong number of pages.')
+            self.assertEqual(sum(sum(c.values()) for c in counts), len(golden), 'Page counts mis-compare!')
+            self.assertEqual(tfp.parse_counts(), serial.parse_counts(), 'Data mis-compare!')
+        self.assertEqual(serial.parse_counts()['python'], self.num_pages + self.num_pages // 2, 'Data mis-compare!')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,10 @@ Specialized test class for TextFileParser class.
 """
 import unittest
 import os
+from wordcloudtool.parser.ParserBase import get_default_stopwords, STOPFILE
+from wordcloudtool.model.StopWords import STOPFILES
 from wordcloudtool.parser.TextFileParser import TextFileParser
+from wordcloudtool.tests.parser import setUpModule, tearDownModule
 
 
 class MyTestCase(unittest.TestCase):
@@ -68,6 +71,22 @@ class MyTestCase(unittest.TestCase):
         except IOError as e:
             self.assertEqual(str(e), 'foo.txt does not exist!', 'IOException not raised properly.')
 
+    def test_Constructor004(self):
+        """
+        Test that a binary file is detected from a bounded sample and raises IOError.
+        :return:
+        """
+        bin_file = 'bin_file.bin'
+        with open(bin_file, 'wb') as fd:
+            fd.write(bytes(range(256)) * 1024)
+        try:
+            TextFileParser(bin_file, sample_size=1024)
+            self.assertFalse(True, 'Binary file did not trigger IOError.')
+        except IOError as e:
+            self.assertEqual(str(e), 'bin_file.bin is not a text file.', 'IOException not raised properly.')
+        finally:
+            os.remove(bin_file)
+
     def test_Parse001(self):
         """
         Test that the parse method successfully parses the contents of the file.
@@ -206,6 +225,81 @@ platform
         for i in range(0, len(golden)):
             self.assertEqual(golden[i], ret[i], 'Data mis-compare!')
 
+    def test_IterWords001(self):
+        """
+        Test that the iter_words method streams the same words the parse method returns.
+        """
+        tfp = TextFileParser(self.text_file)
+        gen = tfp.iter_words()
+        self.assertFalse(isinstance(gen, list), 'iter_words did not return an iterator.')
+        self.assertEqual(list(gen), tfp.parse(), 'Data mis-compare!')
+
+    def test_IterWords002(self):
+        """
+        Test that changing the regexp recompiles the tokenizer pattern.
+        """
+        tfp = TextFileParser(self.text_file)
+        pattern = tfp.get_pattern()
+        self.assertIs(pattern, tfp.get_pattern(), 'Pattern was recompiled without a configuration change.')
+        tfp.regexp = r"[A-Z]\w+"
+        ret = list(tfp.iter_words())
+        self.assertEqual(ret[:3], ['Responsibilities', 'Research', 'BI'], 'Data mis-compare!')
+
+    def test_IterWords003(self):
+        """
+        Test that the memory mapped mode returns the same words even when words straddle window boundaries.
+        """
+        golden = TextFileParser(self.text_file).parse()
+        for chunk_size in (7, 16, 4096):
+            tfp = TextFileParser(self.text_file, use_mmap=True, chunk_size=chunk_size)
+            self.assertEqual(list(tfp.iter_words()), golden, 'Data mis-compare!')
+            self.assertEqual(tfp.parse(), golden, 'Data mis-compare!')
+
+    def test_IterWords004(self):
+        """
+        Test that the memory mapped mode splits non-ASCII punctuation and spaces like the line by line mode.
+        """
+        utf8_file = 'utf8_file.txt'
+        with open(utf8_file, 'w', encoding='utf-8') as fd:
+            fd.write('\u201cquoted\u201d don\u2019t na\u00efve\u2014dash\u00a0nbsp caf\u00e9 served with plain ASCII text\n' * 20)
+        try:
+            golden = list(TextFileParser(utf8_file, encoding='utf-8').iter_words())
+            self.assertEqual(golden[:6], ['quoted', 'don', 'na\u00efve', 'dash', 'nbsp', 'caf\u00e9'], 'Data mis-compare!')
+            for chunk_size in (5, 16, 4096):
+                tfp = TextFileParser(utf8_file, use_mmap=True, chunk_size=chunk_size, encoding='utf-8')
+                self.assertEqual(list(tfp.iter_words()), golden, 'Data mis-compare!')
+        finally:
+            os.remove(utf8_file)
+
+    def test_IterWords005(self):
+        """
+        Test that the memory mapped mode falls back to reading line by line for encodings that are not ASCII
+        compatible, whose characters may contain whitespace bytes.
+        """
+        utf16_file = 'utf16_file.txt'
+        with open(utf16_file, 'w', encoding='utf-16-le') as fd:
+            fd.write('\u4e2d\u5b57 \u6f22\u5b57\u4e2d \u5b57\u6f22\n' * 20)
+        try:
+            golden = list(TextFileParser(utf16_file, encoding='utf-16-le').iter_words())
+            self.assertEqual(golden[:3], ['\u4e2d\u5b57', '\u6f22\u5b57\u4e2d', '\u5b57\u6f22'], 'Data mis-compare!')
+            for chunk_size in (5, 16, 4096):
+                tfp = TextFileParser(utf16_file, use_mmap=True, chunk_size=chunk_size, encoding='utf-16-le')
+                self.assertEqual(list(tfp.iter_words()), golden, 'Data mis-compare!')
+        finally:
+            os.remove(utf16_file)
+
+    def test_ParseCounts001(self):
+        """
+        Test that the parse_counts method counts the lowercased words returned by the parse method.
+        """
+        tfp = TextFileParser(self.text_file)
+        golden = {}
+        for word in tfp.parse():
+            golden[word.lower()] = golden.get(word.lower(), 0) + 1
+        counts = tfp.parse_counts()
+        self.assertEqual(dict(counts), golden, 'Data mis-compare!')
+        self.assertEqual(counts['sql'], 4, 'Data mis-compare!')
+
     def test_Prune001(self):
         """
         Test that the prune method successfully prunes down the contents of words.
@@ -317,6 +411,48 @@ platform
         for i in range(0, len(golden)):
             self.assertEqual(golden[i], words[i], 'Data mis-compare!')
 
+    def test_Prune002(self):
+        """
+        Test that the iter_prune method streams the same words the prune method returns and that the
+        normalized stop words are only rebuilt when the stop words change.
+        """
+        tfp = TextFileParser(self.text_file)
+        golden = tfp.prune(tfp.parse())
+        self.assertEqual(list(tfp.iter_prune(tfp.iter_words())), golden, 'Data mis-compare!')
+        normalized = tfp.get_normalized_stopwords()
+        self.assertIs(tfp.get_normalized_stopwords(), normalized, 'Stop words were normalized again.')
+        words = tfp.prune(tfp.parse(), stopwords={'SQL', 'Tableau'})
+        self.assertNotIn('SQL', words, 'New stop words were not applied.')
+        self.assertIn('and', words, 'Old stop words were still applied.')
+        tfp.stopwords.add('Zebra')
+        self.assertEqual(tfp.prune(['hello', 'zebra', 'SQL']), ['hello'], 'Stop word added in place was not applied.')
+        tfp.stopwords.discard('SQL')
+        self.assertEqual(tfp.prune(['hello', 'zebra', 'SQL']), ['hello', 'SQL'], 'Stop word removed in place was applied.')
+        stopwords = tfp.stopwords
+        stopwords.discard('Zebra')
+        stopwords.add('Hello')
+        normalized = tfp.get_normalized_stopwords()
+        self.assertIs(tfp.get_normalized_stopwords(), normalized, 'Stop words were normalized again.')
+        tfp.stopwords = set(stopwords)
+        self.assertEqual(tfp.prune(['hello', 'zebra', 'SQL']), ['zebra', 'SQL'],
+                         'Reassigned stop words were not applied.')
+
+    def test_Prune003(self):
+        """
+        Test that the packaged stop words are only loaded when a parser using them prunes words, and only once.
+        """
+        STOPFILES.pop(os.path.abspath(STOPFILE), None)
+        tfp = TextFileParser(self.text_file)
+        tfp.stopwords = {'SQL'}
+        self.assertNotIn('SQL', tfp.prune(tfp.parse()), 'Stop words were not applied.')
+        self.assertNotIn(os.path.abspath(STOPFILE), STOPFILES, 'Packaged stop words were loaded.')
+        tfp = TextFileParser(self.text_file)
+        self.assertNotIn(os.path.abspath(STOPFILE), STOPFILES, 'Packaged stop words were loaded.')
+        self.assertNotIn('and', tfp.prune(tfp.parse()), 'Packaged stop words were not applied.')
+        words = get_default_stopwords()
+        TextFileParser(self.text_file).prune(['and'])
+        self.assertIs(get_default_stopwords(), words, 'Packaged stop words were loaded again.')
+
     @classmethod
     def __createTextFile(cls, filename):
         """
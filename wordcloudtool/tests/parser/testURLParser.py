@@ -0,0 +1,169 @@
+"""
+@package wordcloudtool.parser
+@author Bradford G. Van Treuren
+@copyright: Copyright (c) Bradford G. Van Treuren 2019. All rights reserved.
+@version: 0.1
+@change: Oct 18, 2026 - Initial release
+Specialized test class for URLParser class.
+"""
+import unittest
+import shutil
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from wordcloudtool.parser.ExtractionCache import ExtractionCache
+from wordcloudtool.parser.URLBatchParser import URLBatchParser
+from wordcloudtool.model.CloudWords import CloudWords
+from wordcloudtool.parser.URLParser import URLParser
+
+PAGES = {
+    '/page.html': ('text/html; charset=utf-8',
+                   '<html><head><title>Job Posting</title><style>p { color: red; }</style>'
+                   '<script>var hidden = "secret";</script></head>'
+                   '<body><h1>Responsibilities</h1><p>Research and develop BI models</p>'
+                   '<p>Caf&eacute; &amp; data</p></body></html>'),
+    '/page.txt': ('text/plain; charset=latin-1', 'Research and develop BI models caf\xe9 data'),
+}
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """
+    Serves the static test pages with an ETag and records the status of each response.
+    """
+    statuses = []
+
+    def do_GET(self):
+        if self.path not in PAGES:
+            self.statuses.append(404)
+            self.send_error(404)
+            return
+        content_type, body = PAGES[self.path]
+        etag = '"{:s}"'.format(self.path)
+        if self.headers.get('If-None-Match') == etag:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = body.encode(content_type.split('charset=')[1])
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MyTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Start a local HTTP server serving the test pages.
+        :return: Nothing...
+        """
+        cls.server = HTTPServer(('127.0.0.1', 0), PageHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.base_url = 'http://127.0.0.1:{:d}'.format(cls.server.server_address[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Stop the local HTTP server.
+        :return: Nothing...
+        """
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_Parse001(self):
+        """
+        Test that HTML is reduced to its visible text before it is tokenized.
+        """
+        golden = ['Job', 'Posting', 'Responsibilities', 'Research', 'and', 'develop', 'BI', 'models', 'Café', 'data']
+        self.assertEqual(URLParser(self.base_url + '/page.html').parse(), golden, 'Data mis-compare!')
+
+    def test_Parse002(self):
+        """
+        Test that words straddling chunk boundaries and multi-byte characters are decoded correctly.
+        """
+        golden = ['Job', 'Posting', 'Responsibilities', 'Research', 'and', 'develop', 'BI', 'models', 'Café', 'data']
+        for chunk_size in (1, 3, 7):
+            ufp = URLParser(self.base_url + '/page.html', chunk_size=chunk_size)
+            self.assertEqual(ufp.parse(), golden, 'Data mis-compare!')
+
+    def test_Parse003(self):
+        """
+        Test that plain text is decoded with the charset of the response.
+        """
+        golden = ['Research', 'and', 'develop', 'BI', 'models', 'café', 'data']
+        ufp = URLParser(self.base_url + '/page.txt', chunk_size=5)
+        self.assertEqual(ufp.parse(), golden, 'Data mis-compare!')
+
+    def test_ParseCounts001(self):
+        """
+        Test that an unchanged page is served from the cache after a 304 Not Modified response.
+        """
+        directory = tempfile.mkdtemp()
+        saved_inst = ExtractionCache.inst
+        ExtractionCache.inst = ExtractionCache(directory)
+        try:
+            del PageHandler.statuses[:]
+            golden = URLParser(self.base_url + '/page.txt').parse_counts()
+            counts = URLParser(self.base_url + '/page.txt').parse_counts()
+            self.assertEqual(counts, golden, 'Data mis-compare!')
+            self.assertEqual(counts['café'], 1, 'Data mis-compare!')
+            self.assertEqual(PageHandler.statuses, [200, 304], 'Conditional GET was not used.')
+        finally:
+            ExtractionCache.inst = saved_inst
+            shutil.rmtree(directory)
+
+    def test_ParseCounts002(self):
+        """
+        Test that the validators of a conditional GET are not sent by the later requests of the same parser.
+        """
+        directory = tempfile.mkdtemp()
+        saved_inst = ExtractionCache.inst
+        ExtractionCache.inst = ExtractionCache(directory)
+        try:
+            URLParser(self.base_url + '/page.txt').parse_counts()
+            del PageHandler.statuses[:]
+            ufp = URLParser(self.base_url + '/page.txt')
+            self.assertEqual(ufp.parse_counts()['café'], 1, 'Data mis-compare!')
+            self.assertEqual(ufp.request_headers, {}, 'Validators were kept.')
+            self.assertEqual(ufp.parse(), ['Research', 'and', 'develop', 'BI', 'models', 'café', 'data'],
+                             'Data mis-compare!')
+            self.assertEqual(PageHandler.statuses, [304, 200], 'Validators were sent by parse( ).')
+        finally:
+            ExtractionCache.inst = saved_inst
+            shutil.rmtree(directory)
+
+    def test_Batch001(self):
+        """
+        Test that a batch of URLs is counted concurrently and failing URLs are recorded as errors.
+        """
+        directory = tempfile.mkdtemp()
+        saved_inst = ExtractionCache.inst
+        ExtractionCache.inst = ExtractionCache(directory)
+        try:
+            urls = [self.base_url + path for path in ('/page.html', '/page.txt', '/missing.html')]
+            batch = URLBatchParser(urls, max_workers=2)
+            counts = batch.count_urls()
+            self.assertEqual(sorted(counts.keys()), sorted(urls[:2]), 'Data mis-compare!')
+            self.assertEqual(counts[urls[0]]['research'], 1, 'Data mis-compare!')
+            self.assertEqual(list(batch.errors.keys()), [urls[2]], 'Failing URL was not recorded.')
+            cloud_words = CloudWords()
+            batch.add_to(cloud_words)
+            self.assertEqual(sorted(cloud_words.get_sources()), sorted(urls[:2]), 'Wrong sources.')
+            cloud_words.remove_source(urls[1])
+            self.assertEqual(dict(cloud_words.get_word_count()), dict(counts[urls[0]]), 'Data mis-compare!')
+        finally:
+            ExtractionCache.inst = saved_inst
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ Specialized test class for WordDocParser class.
 """
 import unittest
 from wordcloudtool.parser.WordDocParser import WordDocParser
+from wordcloudtool.tests.parser import setUpModule, tearDownModule
 
 
 class MyTestCase(unittest.TestCase):
@@ -3,8 +3,10 @@ Tk version of the GUI
 """
 
 from tkinter import *
-from tkinter.filedialog import askopenfilename
+from tkinter.filedialog import askopenfilename, asksaveasfilename
+from tkinter.messagebox import showerror
 from tkinter import ttk
+from PIL import Image, ImageTk
 
 from wordcloudtool.control.StopWordsControl import StopWordsControl
 from wordcloudtool.parser.TextFileParser import TextFileParser
@@ -51,8 +53,13 @@ class WordCloudToolTkView(Frame):
         self.stop_word_file_variable = None
         self.stop_word_editor_variable = None
         self.stop_word_list_variable = None
+        self.cloud_words = CloudWords()
+        self.snapshot_file = None
+        self.cloud_photo = None
+        self.histogram_photo = None
         self.init_window()
         self.__setupStopWords()
+        self.__setupImageObservers()
 
     def init_window(self):
         # changing the title of our master widget
@@ -114,6 +121,11 @@ class WordCloudToolTkView(Frame):
         stopwords_control = StopWordsControl.get_StopWordsControl()
         stopwords_control.register_observer(self.__observeStopWordsModelChanges)
 
+    def __setupImageObservers(self):
+        wrapper = WordCloudWrapper.get_WordCloudWrapper() # obtain Singleton of the wrapper
+        wrapper.register_frequency_observer(self.__freqImageObserver)
+        wrapper.register_image_observer(self.__cloudImageObserver)
+
     def __create_plain_text_tab(self, tab_control):
         tab = ttk.Frame(tab_control)
         tab_control.add(tab, text='Plain Text')
@@ -307,12 +319,36 @@ class WordCloudToolTkView(Frame):
 
     def __open_event(self):
         print('Open menu called')
+        filepath = askopenfilename(filetypes=(("Word Counts File", "*.wcc"),),
+                                   title="Select Word Counts File to open"
+                                   )
+        if not filepath:
+            return
+        try:
+            snapshot = CloudWords.load(filepath, use_array=False)
+        except IOError as e:
+            showerror("Open Word Counts File", str(e))
+            return
+        self.cloud_words.add_source(filepath, snapshot.get_word_count())
+        self.snapshot_file = filepath
 
     def __save_event(self):
         print('Save menu called')
+        if self.snapshot_file is None:
+            self.__save_as_event()
+            return
+        self.cloud_words.save(self.snapshot_file)
 
     def __save_as_event(self):
         print('Save As menu called')
+        filepath = asksaveasfilename(filetypes=(("Word Counts File", "*.wcc"),),
+                                     defaultextension=".wcc",
+                                     title="Save Word Counts File as"
+                                     )
+        if not filepath:
+            return
+        self.snapshot_file = filepath
+        self.cloud_words.save(filepath)
 
     def __exit_event(self):
         print('Exit menu called')
@@ -425,6 +461,10 @@ class WordCloudToolTkView(Frame):
 
     def __button_visualize_clicked(self):
         print("Visualize! button clicked!")
+        stopfile_control = StopWordsControl.get_StopWordsControl()
+        wrapper = WordCloudWrapper.get_WordCloudWrapper()
+        wrapper.set_stopwords(stopfile_control.get_stopwords())
+        wrapper.generate_from_cloud_words(self.cloud_words)
 
     def __word_source_tab_changed(self, event):
         current_tab = self.word_source_tab_control.tab("current")
@@ -441,57 +481,62 @@ class WordCloudToolTkView(Frame):
         value = current_tab["text"]
         print("Cloud tab changed to {:s}!".format(value))
 
-    def __processTextFile(self, event):
+    def __processTextFile(self, *args):
         print("Calling __processTextFile")
-        filename = self.text_file_variable
+        filename = self.text_file_variable.get()
         if filename == "":
             return
         parser = TextFileParser(filename)
-        self.word_list = parser.parse()
+        self.cloud_words.add_source('Text File', parser.parse_counts())
 
-    def __processURL(self, event):
+    def __processURL(self, *args):
         print("Calling __processURL")
-        url = self.web_page_url_variable
+        url = self.web_page_url_variable.get()
+        if url == "":
+            return
         parser = URLParser(url)
-        self.word_list = parser.parse()
+        self.cloud_words.add_source('Web Page', parser.parse_counts())
 
     def __processTextEdit(self, event):
         print("Calling __processTextEdit")
+        # Clear the modified flag so the next edit raises <<Modified>> again.
+        self.text_plain_text.edit_modified(False)
         text = self.text_plain_text.get(1.0, END)
         parser = TextWidgetParser(text)
-        self.word_list = parser.parse()
+        self.cloud_words.add_source('Pasted Text', parser.parse_counts())
 
-    def __processPDFFile(self):
+    def __processPDFFile(self, *args):
         print("Calling __processPDFFile")
-        filename = self.pdf_file_variable
+        filename = self.pdf_file_variable.get()
         if filename == "":
             return
         type = self.combobox_pdf_type.get()
-        if type == "Text":
+        if type == "PDF":
             parser = PDFTextParser(filename)
-            self.word_list = parser.parse()
-            if len(self.word_list) == 0:
+            word_counts = parser.parse_counts()
+            if len(word_counts) == 0:
                 parser = PDFImageParser(filename)
-                self.word_list = parser.parse()
+                word_counts = parser.parse_counts()
         else:
             parser = PDFImageParser(filename)
-            self.word_list = parser.parse()
+            word_counts = parser.parse_counts()
+        self.cloud_words.add_source('PDF File', word_counts)
 
-    def __processImageFile(self):
+    def __processImageFile(self, *args):
         print("Calling __processImageFile")
-        filename = self.image_file_variable
+        filename = self.image_file_variable.get()
         if filename == "":
             return
         # parser = TextFileParser(filename)
-        # self.word_list = parser.parse()
+        # self.word_counts = parser.parse_counts()
 
-    def __processWordDoc(self):
+    def __processWordDoc(self, *args):
         print("Calling __processWordDocFile")
-        filename = self.word_doc_variable
+        filename = self.word_doc_variable.get()
         if filename == "":
             return
         # parser = TextFileParser(filename)
-        # self.word_list = parser.parse()
+        # self.word_counts = parser.parse_counts()
 
     def __StopFileChanged(self, event):
         stopfile_control = StopWordsControl.get_StopWordsControl()
@@ -506,27 +551,25 @@ class WordCloudToolTkView(Frame):
 
     def __freqImageObserver(self, wrapper):
         print("In __freqImageObserver")
-        self.ui.tabWidget_WordCloud.setCurrentIndex(1)
-        image = wrapper.get_frequency_image()
-        height, width, byteValue = image.shape
-        byteValue = byteValue * width
-        qimage = QImage(image, width, height, byteValue, QImage.Format_RGB888)
-        pmap = QPixmap.fromImage(qimage)
-        self.histogram_scene.addPixmap(pmap)
-        self.histogram_scene.setBackgroundBrush(QBrush(QColor(0, 0, 0)))
-        self.ui.graphicsView_WordHistogram.fitInView(0, 0, pmap.width(), pmap.height(), Qt.KeepAspectRatio)
+        self.cloud_tab_control.select(1)
+        self.histogram_photo = self.__show_image(self.word_histogram_canvas, wrapper.get_frequency_image())
 
     def __cloudImageObserver(self, wrapper):
         print("In __CloudImageObserver")
-        self.ui.tabWidget_WordCloud.setCurrentIndex(0)
-        image = wrapper.get_cloud_image()
-        height, width, byteValue = image.shape
-        byteValue = byteValue * width
-        qimage = QImage(image, width, height, byteValue, QImage.Format_RGB888)
-        pmap = QPixmap.fromImage(qimage)
-        self.cloud_scene.addPixmap(pmap)
-        self.cloud_scene.setBackgroundBrush(QBrush(QColor(0, 0, 0)))
-        self.ui.graphicsViewWordCloud.fitInView(0, 0, pmap.width(), pmap.height(), Qt.KeepAspectRatio)
+        self.cloud_tab_control.select(0)
+        self.cloud_photo = self.__show_image(self.word_cloud_canvas, wrapper.get_cloud_image())
+
+    def __show_image(self, canvas, image):
+        # Fit the RGB image array in the canvas keeping its aspect ratio.
+        # Tk does not keep a reference to the PhotoImage, so the caller must keep the one returned.
+        width = int(canvas['width'])
+        height = int(canvas['height'])
+        picture = Image.fromarray(image)
+        picture.thumbnail((width, height))
+        photo = ImageTk.PhotoImage(picture)
+        canvas.delete('all')
+        canvas.create_image(width // 2, height // 2, image=photo)
+        return photo
 
 
 if __name__ == '__main__':